@@ -1,6 +1,6 @@
 from .core import settings, setup_logging, keep_alive_service
-from .routers import info_router, noticias_router, cache_router, rss_router
-from .services import rss_service
+from .routers import info_router, noticias_router, cache_router, rss_router, metrics_router, websub_router
+from .services import rss_service, websub_hub, event_service
 from .filters import news_filter
 
 __all__ = [
@@ -11,6 +11,10 @@ __all__ = [
     "noticias_router", 
     "cache_router", 
     "rss_router",
+    "metrics_router",
+    "websub_router",
     "rss_service",
+    "websub_hub",
+    "event_service",
     "news_filter"
 ]
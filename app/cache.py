@@ -1,23 +1,171 @@
 import json
 import hashlib
+import sys
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
-from cachetools import TTLCache
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 import logging
 
+from .core.config import settings
+from .core.logging import AMOSTRADO
+from .core.metrics import cache_requests
+
 logger = logging.getLogger(__name__)
 
+
+def tamanho_aproximado(valor: Any) -> int:
+    if hasattr(valor, "tamanho_bytes"):
+        return valor.tamanho_bytes()
+    if isinstance(valor, dict):
+        # As chaves são literais internados, compartilhados entre as entradas
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(item) for item in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_aproximado(item) for item in valor)
+    return sys.getsizeof(valor)
+
+
+class _Entrada:
+    
+    __slots__ = ('valor', 'custo', 'tamanho', 'expira_em', 'prioridade')
+    
+    def __init__(self, valor: Any, custo: float, tamanho: int, expira_em: float, prioridade: float):
+        self.valor = valor
+        self.custo = custo
+        self.tamanho = tamanho
+        self.expira_em = expira_em
+        self.prioridade = prioridade
+
+
+class GreedyDualCache:
+    
+    # GreedyDual-Size: a prioridade de cada entrada é L + custo/tamanho, renovada a
+    # cada acesso. A remoção escolhe a menor prioridade e L sobe até ela, de modo
+    # que entradas não acessadas "envelhecem" frente às novas. Entradas caras de
+    # reconstruir e pequenas sobrevivem; baratas e grandes saem primeiro.
+    
+    def __init__(self, max_entradas: int, ttl_seconds: float, max_bytes: Optional[int] = None):
+        self.max_entradas = max_entradas
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.inflacao = 0.0
+        self.total_bytes = 0
+        self.stats = {"evictions": 0, "expirations": 0}
+        self._entradas: Dict[str, _Entrada] = {}
+        self._lock = threading.RLock()
+    
+    def _prioridade(self, custo: float, tamanho: int) -> float:
+        return self.inflacao + custo / max(tamanho, 1)
+    
+    def _remover(self, chave: str) -> None:
+        entrada = self._entradas.pop(chave)
+        self.total_bytes -= entrada.tamanho
+    
+    def _expirar(self, agora: float) -> None:
+        expiradas = [chave for chave, entrada in self._entradas.items() if entrada.expira_em <= agora]
+        for chave in expiradas:
+            self._remover(chave)
+        self.stats["expirations"] += len(expiradas)
+    
+    def _excede_limites(self) -> bool:
+        if len(self._entradas) > self.max_entradas:
+            return True
+        return bool(self.max_bytes) and self.total_bytes > self.max_bytes
+    
+    def get(self, chave: str) -> Optional[Any]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            if entrada.expira_em <= time.monotonic():
+                self._remover(chave)
+                self.stats["expirations"] += 1
+                return None
+            entrada.prioridade = self._prioridade(entrada.custo, entrada.tamanho)
+            return entrada.valor
+    
+    def set(self, chave: str, valor: Any, custo: float, tamanho: int, ttl_seconds: Optional[float] = None) -> None:
+        if self.max_bytes and tamanho > self.max_bytes:
+            raise ValueError(f"Entrada de {tamanho} bytes excede o orçamento de {self.max_bytes} bytes")
+        
+        with self._lock:
+            agora = time.monotonic()
+            if chave in self._entradas:
+                self._remover(chave)
+            
+            self._entradas[chave] = _Entrada(
+                valor, custo, tamanho, agora + (ttl_seconds or self.ttl_seconds), self._prioridade(custo, tamanho)
+            )
+            self.total_bytes += tamanho
+            
+            if not self._excede_limites():
+                return
+            
+            # Expiradas saem antes de qualquer remoção por prioridade
+            self._expirar(agora)
+            while self._excede_limites():
+                vitima = min(
+                    (item for item in self._entradas.items() if item[0] != chave),
+                    key=lambda item: item[1].prioridade
+                )
+                self.inflacao = vitima[1].prioridade
+                self._remover(vitima[0])
+                self.stats["evictions"] += 1
+    
+    def remover(self, chave: str) -> bool:
+        with self._lock:
+            if chave not in self._entradas:
+                return False
+            self._remover(chave)
+            return True
+    
+    def custo(self, chave: str) -> Optional[float]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            return entrada.custo if entrada is not None else None
+    
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            self._expirar(time.monotonic())
+            itens = [(chave, entrada.valor) for chave, entrada in self._entradas.items()]
+        return iter(itens)
+    
+    def values(self) -> Iterator[Any]:
+        return (valor for _, valor in self.items())
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self.total_bytes = 0
+            self.inflacao = 0.0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._expirar(time.monotonic())
+            return len(self._entradas)
+
+
 class NewsCache:
     
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 900):
-        self.cache = TTLCache(maxsize=max_size, ttl=ttl_seconds)
+    # Custo atribuído a entradas gravadas sem o tempo de scraping medido
+    CUSTO_PADRAO_SEGUNDOS = 1.0
+    
+    def __init__(self, max_size: int = 100, ttl_seconds: int = 900, max_bytes: Optional[int] = None):
+        self.cache = GreedyDualCache(max_entradas=max_size, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        self.max_size = max_size
         self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
         self.stats = {
             "hits": 0,
             "misses": 0,
             "total_requests": 0
         }
-        logger.info(f"Cache inicializado: max_size={max_size}, ttl={ttl_seconds}s")
+        self._observadores: List[Callable[[int, Optional[Dict], Dict[str, Any]], None]] = []
+        logger.info(f"Cache inicializado: max_size={max_size}, max_bytes={max_bytes}, ttl={ttl_seconds}s")
+    
+    def observar(self, observador: Callable[[int, Optional[Dict], Dict[str, Any]], None]) -> None:
+        # Chamado a cada gravação com dados novos (max_noticias, filtros, dados)
+        self._observadores.append(observador)
     
     def _generate_cache_key(self, max_noticias: int, filters: Dict = None) -> str:
         key_data = f"noticias:{max_noticias}"
@@ -36,43 +184,88 @@ class NewsCache:
             cached_data = self.cache.get(cache_key)
             if cached_data is not None:
                 self.stats["hits"] += 1
-                filter_info = " com filtros" if filters else ""
-                logger.info(f"Cache HIT para {max_noticias} notícias{filter_info}")
+                cache_requests.inc(outcome="hit")
+                logger.info("Cache HIT para %d notícias%s", max_noticias, " com filtros" if filters else "", extra=AMOSTRADO)
                 return cached_data
             else:
                 self.stats["misses"] += 1
-                filter_info = " com filtros" if filters else ""
-                logger.info(f"Cache MISS para {max_noticias} notícias{filter_info}")
+                cache_requests.inc(outcome="miss")
+                logger.info("Cache MISS para %d notícias%s", max_noticias, " com filtros" if filters else "", extra=AMOSTRADO)
                 return None
         except Exception as e:
-            logger.error(f"Erro ao acessar cache: {e}")
+            logger.error("Erro ao acessar cache: %s", e)
             self.stats["misses"] += 1
+            cache_requests.inc(outcome="error")
             return None
     
-    def set(self, max_noticias: int, data: Dict[str, Any], filters: Dict = None) -> None:
+    def set(self, max_noticias: int, data: Dict[str, Any], filters: Dict = None,
+            custo_segundos: Optional[float] = None, ttl_seconds: Optional[float] = None) -> None:
         cache_key = self._generate_cache_key(max_noticias, filters)
+        ttl = ttl_seconds or self.ttl_seconds
         
         try:
             data_with_cache_info = {
                 **data,
                 "cache_info": {
                     "cached_at": datetime.now().isoformat(),
-                    "expires_at": (datetime.now() + timedelta(seconds=self.ttl_seconds)).isoformat(),
-                    "from_cache": True
+                    "expires_at": (datetime.now() + timedelta(seconds=ttl)).isoformat(),
+                    "ttl_seconds": round(ttl),
+                    "max_noticias": max_noticias,
+                    "filters": filters,
+                    "from_cache": True,
+                    "tamanho_bytes": 0
                 }
             }
+            tamanho = tamanho_aproximado(data_with_cache_info)
+            data_with_cache_info["cache_info"]["tamanho_bytes"] = tamanho
+            custo = custo_segundos if custo_segundos is not None else self.CUSTO_PADRAO_SEGUNDOS
+            data_with_cache_info["cache_info"]["custo_segundos"] = round(custo, 3)
             
-            self.cache[cache_key] = data_with_cache_info
-            filter_info = " com filtros" if filters else ""
-            logger.info(f"Dados armazenados no cache para {max_noticias} notícias{filter_info}")
+            self.cache.set(cache_key, data_with_cache_info, custo, tamanho, ttl_seconds=ttl)
+            logger.info(
+                "Dados armazenados no cache para %d notícias%s (%d bytes, custo %.2fs, ttl %.0fs)",
+                max_noticias, " com filtros" if filters else "", tamanho, custo, ttl
+            )
             
         except Exception as e:
-            logger.error(f"Erro ao armazenar no cache: {e}")
+            logger.error("Erro ao armazenar no cache: %s", e)
+            return
+        
+        for observador in self._observadores:
+            try:
+                observador(max_noticias, filters, data)
+            except Exception as e:
+                logger.error("Erro ao notificar observador do cache: %s", e)
     
     def clear(self) -> None:
         self.cache.clear()
         logger.info("Cache limpo manualmente")
     
+    def entradas(self) -> List[Tuple[int, Optional[Dict]]]:
+        return [
+            (valor["cache_info"]["max_noticias"], valor["cache_info"]["filters"])
+            for _, valor in self.cache.items()
+        ]
+    
+    def noticias(self, max_noticias: int, filters: Dict = None) -> Optional[List]:
+        # Leitura interna (refresh): não conta como requisição nas estatísticas
+        valor = self.cache.get(self._generate_cache_key(max_noticias, filters))
+        return valor.get("noticias") if valor is not None else None
+    
+    def invalidar(self, site: Optional[str] = None, link: Optional[str] = None) -> int:
+        # Remove as entradas que contêm notícias do site ou a notícia do link.
+        # As entradas são por consulta e quase todas misturam os dois sites: na
+        # prática, invalidar um site esvazia o cache (o refresh por site não)
+        removidas = 0
+        for chave, valor in self.cache.items():
+            noticias = valor.get("noticias", [])
+            if any((site and noticia.get("site") == site) or (link and noticia.get("link") == link)
+                   for noticia in noticias):
+                removidas += self.cache.remover(chave)
+        
+        logger.info("Cache invalidado (site=%s, link=%s): %d entradas removidas", site, link, removidas)
+        return removidas
+    
     def get_stats(self) -> Dict[str, Any]:
         total_requests = self.stats["total_requests"]
         hit_rate = (self.stats["hits"] / total_requests * 100) if total_requests > 0 else 0
@@ -83,7 +276,11 @@ class NewsCache:
             "total_requests": total_requests,
             "hit_rate_percentage": round(hit_rate, 2),
             "cache_size": len(self.cache),
-            "max_cache_size": self.cache.maxsize,
+            "max_cache_size": self.max_size,
+            "total_bytes": self.cache.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.cache.stats["evictions"],
+            "expirations": self.cache.stats["expirations"],
             "ttl_seconds": self.ttl_seconds,
             "current_time": datetime.now().isoformat()
         }
@@ -103,7 +300,10 @@ class NewsCache:
                     "cached_at": cache_info["cached_at"],
                     "expires_at": cache_info["expires_at"],
                     "time_remaining_seconds": round(time_remaining, 2),
-                    "total_noticias": value.get("total_noticias", "unknown")
+                    "ttl_seconds": cache_info.get("ttl_seconds"),
+                    "total_noticias": value.get("total_noticias", "unknown"),
+                    "tamanho_bytes": cache_info.get("tamanho_bytes"),
+                    "custo_segundos": cache_info.get("custo_segundos")
                 })
         
         return {
@@ -123,4 +323,4 @@ class NewsCache:
             "cleared_at": datetime.now().isoformat()
         }
 
-news_cache = NewsCache(max_size=50, ttl_seconds=900)
+news_cache = NewsCache(max_size=50, ttl_seconds=900, max_bytes=settings.CACHE_MAX_BYTES)
@@ -1,5 +1,5 @@
 from .config import settings
-from .logging import setup_logging, get_logger
+from .logging import setup_logging, get_logger, get_logging_stats, AMOSTRADO
 from .keep_alive import keep_alive_service
 
-__all__ = ["settings", "setup_logging", "get_logger", "keep_alive_service"]
+__all__ = ["settings", "setup_logging", "get_logger", "get_logging_stats", "AMOSTRADO", "keep_alive_service"]
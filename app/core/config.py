@@ -1,4 +1,5 @@
-from typing import List
+import os
+from typing import Dict, List, Optional
 
 
 class Settings:
@@ -12,6 +13,18 @@ class Settings:
     
     CACHE_TTL_SECONDS: int = 900
     CACHE_MAX_SIZE: int = 50
+    # Orçamento opcional em bytes (aproximados) para o cache; quando definido,
+    # governa a remoção de entradas no lugar do limite de entradas
+    CACHE_MAX_BYTES: Optional[int] = None
+    
+    # TTL adaptativo: cada site tem uma janela de frescor aprendida da cadência
+    # de publicação (intervalo médio e horários das novas notícias); a entrada
+    # do cache expira quando se espera CACHE_CADENCE_EXPECTED_ITEMS novas notícias
+    CACHE_TTL_MIN_SECONDS: int = 300
+    CACHE_TTL_MAX_SECONDS: int = 4 * 3600
+    CACHE_CADENCE_EXPECTED_ITEMS: float = 0.15
+    CACHE_CADENCE_MIN_ITEMS: int = 5
+    CACHE_CADENCE_DECAY: float = 0.99
     
     ALLOWED_ORIGINS: List[str] = ["*"]
     
@@ -19,6 +32,152 @@ class Settings:
     DEFAULT_NOTICIAS: int = 20
     DEFAULT_RSS_NOTICIAS: int = 10
     
+    # Politeness por host: taxa sustentada (requisições/s) e rajada máxima
+    SCRAPER_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "andes.org.br": {"rate": 2.0, "burst": 4},
+        "cspconlutas.org.br": {"rate": 2.0, "burst": 4},
+    }
+    SCRAPER_DEFAULT_RATE_LIMIT: Dict[str, float] = {"rate": 1.0, "burst": 2}
+    SCRAPER_MAX_RETRY_AFTER_SECONDS: int = 120
+    
+    # Notícias já enriquecidas lembradas por site (crawl incremental). A listagem
+    # para no território conhecido só depois desta sequência de links conhecidos:
+    # um destaque fixado no topo é conhecido e vem antes das notícias novas
+    CRAWL_STATE_MAX_NOTICIAS: int = 100
+    CRAWL_PARADA_CONHECIDOS_SEGUIDOS: int = 3
+    
+    # Prefetch concorrente das páginas de listagem e enriquecimento em paralelo
+    LISTING_PREFETCH_CONCURRENCY: int = 3
+    LISTING_PREFETCH_MAX_DEPTH: int = 4
+    LISTING_LINKS_POR_PAGINA_INICIAL: int = 10
+    SCRAPER_ARTICLE_WORKERS: int = 4
+    # Coletas simultâneas dos demais sites (o primeiro roda na thread de quem
+    # pediu): cache misses, refresh e aquecimento do delta não esperam uns pelos outros
+    SCRAPER_SITE_WORKERS: int = 8
+    
+    # Gravação/reprodução das respostas das origens: "live", "record" ou "replay"
+    SCRAPER_HTTP_MODE: str = os.environ.get("SCRAPER_HTTP_MODE", "live")
+    SCRAPER_CASSETTE_DIR: str = os.environ.get("SCRAPER_CASSETTE_DIR", "cassettes")
+    SCRAPER_REPLAY_LATENCY_MS: float = float(os.environ.get("SCRAPER_REPLAY_LATENCY_MS", "0"))
+    
+    # Circuit breaker por origem: falhas (ou respostas lentas) consecutivas até abrir
+    SCRAPER_CIRCUIT_FAILURE_THRESHOLD: int = 3
+    SCRAPER_CIRCUIT_SLOW_CALL_SECONDS: float = 8.0
+    SCRAPER_CIRCUIT_OPEN_SECONDS: float = 30.0
+    SCRAPER_CIRCUIT_MAX_OPEN_SECONDS: float = 300.0
+    
+    # Latência por host: janela de amostras usada nos percentis e timeouts
+    # adaptativos (p99 x multiplicador, limitado pelo timeout de cada chamada)
+    SCRAPER_LATENCY_WINDOW: int = 200
+    SCRAPER_LATENCY_MIN_SAMPLES: int = 20
+    SCRAPER_TIMEOUT_P99_MULTIPLIER: float = 3.0
+    SCRAPER_TIMEOUT_MIN_SECONDS: float = 2.0
+    
+    # Retentativas de GET/HEAD com backoff exponencial e jitter; retentativas e
+    # hedges gastam um orçamento por host reabastecido a cada requisição original
+    SCRAPER_RETRY_MAX_ATTEMPTS: int = 2
+    SCRAPER_RETRY_BACKOFF_BASE_SECONDS: float = 0.5
+    SCRAPER_RETRY_BACKOFF_MAX_SECONDS: float = 4.0
+    SCRAPER_RETRY_BUDGET_RATIO: float = 0.1
+    SCRAPER_RETRY_BUDGET_MAX_TOKENS: float = 5.0
+    
+    # Hedging: requisição duplicada quando a primeira passa do p95 do host.
+    # Com hedging, todo GET passa pelo pool do hedge; None dimensiona o pool pelos
+    # pools que fazem GETs (listagem, artigos, sites, detalhes e refresh), com
+    # lugar para o primário e o hedge de cada um
+    SCRAPER_HEDGE_ENABLED: bool = False
+    SCRAPER_HEDGE_PERCENTILE: float = 95.0
+    SCRAPER_HEDGE_WORKERS: Optional[int] = None
+    
+    # Prazo total de uma requisição que dispara scraping; os timeouts de cada
+    # chamada HTTP encolhem até o que resta dele (None desativa)
+    REQUEST_DEADLINE_SECONDS: Optional[float] = 8.0
+    
+    # Hub WebSub do feed /rss: leases das assinaturas e pool de entrega
+    WEBSUB_LEASE_DEFAULT_SECONDS: int = 5 * 86400
+    WEBSUB_LEASE_MIN_SECONDS: int = 300
+    WEBSUB_LEASE_MAX_SECONDS: int = 30 * 86400
+    WEBSUB_DELIVERY_WORKERS: int = 4
+    WEBSUB_QUEUE_SIZE: int = 1000
+    WEBSUB_DELIVERY_TIMEOUT_SECONDS: float = 10.0
+    WEBSUB_DELIVERY_MAX_ATTEMPTS: int = 5
+    WEBSUB_RETRY_BASE_SECONDS: float = 5.0
+    WEBSUB_MAINTENANCE_INTERVAL_SECONDS: float = 30.0
+    
+    # Stream de novas notícias (/noticias/eventos): eventos guardados para
+    # retomada com Last-Event-ID, heartbeat do SSE e espera do long-poll
+    EVENTOS_BUFFER_SIZE: int = 500
+    EVENTOS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTOS_LONGPOLL_TIMEOUT_SECONDS: float = 25.0
+    EVENTOS_MAX_ASSINANTES: int = 10000
+    
+    # Marcas do /noticias/delta (primeira vez em que cada link apareceu),
+    # persistidas para sobreviver a reinícios (None desativa)
+    DELTA_INDEX_PATH: Optional[str] = os.environ.get("DELTA_INDEX_PATH", "delta.json")
+    
+    # Enriquecimento em lote (POST /noticias/detalhes): URLs por pedido, busca
+    # concorrente (ainda sujeita à politeness por host) e cache por URL. Cada
+    # URL buscada custa um GET e um HEAD da imagem: com rajada de 4 e 2 req/s
+    # por host, cabem cerca de 10 no prazo de 8s; 8 por site deixa folga para a
+    # latência das origens
+    DETALHES_MAX_URLS: int = 16
+    DETALHES_MAX_URLS_POR_SITE: int = 8
+    DETALHES_WORKERS: int = 16
+    DETALHES_CACHE_MAX_SIZE: int = 1000
+    DETALHES_CACHE_TTL_SECONDS: int = 24 * 3600
+    
+    # Texto completo das notícias, extraído no enriquecimento e guardado em
+    # disco comprimido (zlib); servido sob demanda em /noticias/{id}/conteudo.
+    # Desligado por padrão: só com CONTEUDO_COMPLETO_ENABLED=true no ambiente
+    CONTEUDO_COMPLETO_ENABLED: bool = os.environ.get("CONTEUDO_COMPLETO_ENABLED", "false").lower() in ("1", "true")
+    CONTEUDO_DIR: str = os.environ.get("CONTEUDO_DIR", "conteudos")
+    CONTEUDO_NIVEL_COMPRESSAO: int = 6
+    # Limite de arquivos em disco; passando dele, os gravados há mais tempo saem
+    CONTEUDO_MAX_ARQUIVOS: int = 2000
+    
+    # Metadados (tipo, tamanho, ETag) das imagens vistos nos HEADs de validação,
+    # usados no enclosure do RSS
+    IMAGEM_METADATA_MAX_SIZE: int = 2000
+    
+    # Notícias quase duplicadas entre sites: SimHash dos títulos das listagens,
+    # comparado antes do enriquecimento; o índice persiste entre reinícios.
+    # Nomes dos sites e das entidades saem do título antes da comparação. A
+    # distância só seleciona candidatas: reescritas reais ficam entre 0 e 13 bits.
+    # Quem decide é a sobreposição das palavras, porque títulos sindicais seguem
+    # moldes ("Docentes da X entram em greve") e diferem numa palavra só
+    DUPLICATAS_ENABLED: bool = True
+    DUPLICATAS_INDEX_PATH: Optional[str] = os.environ.get("DUPLICATAS_INDEX_PATH", "duplicatas.json")
+    DUPLICATAS_MAX_DISTANCIA: int = 13
+    DUPLICATAS_MIN_SOBREPOSICAO: float = 0.85
+    DUPLICATAS_JANELA_DIAS: int = 3
+    DUPLICATAS_MAX_ENTRADAS: int = 5000
+    
+    # Sondas sintéticas do keep-alive: cada uma requisita um caminho da própria
+    # API no seu intervalo (segundos), numa sessão HTTP reaproveitada; latência
+    # e taxa de sucesso das últimas KEEP_ALIVE_JANELA execuções saem em /health.
+    # Sondas "apenas_cache" pedem Cache-Control: only-if-cached: num cache miss
+    # a rota responde 504 sem buscar nas origens, e a sonda só conta o miss
+    KEEP_ALIVE_BASE_URL: str = os.environ.get("KEEP_ALIVE_BASE_URL", API_BASE_URL)
+    KEEP_ALIVE_SONDAS: Dict[str, Dict] = {
+        "health": {"caminho": "/health", "intervalo": 600},
+        "noticias": {"caminho": "/noticias", "intervalo": 600, "apenas_cache": True},
+        "rss": {"caminho": "/rss", "intervalo": 600, "apenas_cache": True},
+    }
+    KEEP_ALIVE_TIMEOUT_SECONDS: float = 30.0
+    KEEP_ALIVE_JANELA: int = 100
+    
+    # Instrumentação por requisição (Server-Timing e ?debug=timing)
+    SERVER_TIMING_ENABLED: bool = False
+    SLOW_REQUEST_LOG_THRESHOLD_MS: Optional[int] = None
+    
+    # Logs saem por uma fila e são escritos numa thread própria; "json" gera uma
+    # linha JSON por registro. Logs do caminho quente de cada requisição (HIT/MISS
+    # do cache, resumo da filtragem) são amostrados na fração LOG_AMOSTRAGEM
+    LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.environ.get("LOG_FORMAT", "texto")
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_AMOSTRAGEM: float = float(os.environ.get("LOG_AMOSTRAGEM", "0.1"))
+    
     # Configurações de filtragem por palavras-chave
     ENABLE_KEYWORD_FILTER: bool = True
     DEFAULT_KEYWORDS_INCLUDE: List[str] = [
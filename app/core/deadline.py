@@ -0,0 +1,60 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+
+    def __init__(self, segundos: float):
+        self.segundos = segundos
+        self.expira_em = time.monotonic() + segundos
+        self.esgotado = False
+
+    def restante(self) -> float:
+        return self.expira_em - time.monotonic()
+
+    def verificar(self) -> float:
+        restante = self.restante()
+        if restante <= 0:
+            self.esgotado = True
+            raise DeadlineExceeded(f"Prazo de {self.segundos:.1f}s da requisição esgotado")
+        return restante
+
+
+_deadline_atual: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline_atual", default=None)
+
+
+@contextmanager
+def prazo(segundos: Optional[float]):
+    if not segundos:
+        yield None
+        return
+
+    deadline = Deadline(segundos)
+    token = _deadline_atual.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline_atual.reset(token)
+
+
+def deadline_atual() -> Optional[Deadline]:
+    return _deadline_atual.get()
+
+
+def timeout_restante(timeout: float) -> float:
+    deadline = _deadline_atual.get()
+    if deadline is None:
+        return timeout
+    return min(timeout, deadline.verificar())
+
+
+def marcar_esgotado() -> None:
+    deadline = _deadline_atual.get()
+    if deadline is not None:
+        deadline.esgotado = True
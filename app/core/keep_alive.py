@@ -1,43 +1,147 @@
 import asyncio
 import aiohttp
-from typing import Optional
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Optional
 from datetime import datetime
 from .config import settings
 from .logging import get_logger
+from .metrics import Histogram, metrics
 
 logger = get_logger(__name__)
 
+probe_duration = metrics.histogram(
+    "andes_news_probe_duration_seconds",
+    "Duração das sondas sintéticas do keep-alive",
+    ["probe", "outcome"]
+)
+
+
+class Sonda:
+
+    # Uma requisição sintética periódica e a janela das últimas execuções
+
+    def __init__(self, nome: str, url: str, intervalo: float, janela: int, apenas_cache: bool = False):
+        self.nome = nome
+        self.url = url
+        self.intervalo = intervalo
+        self.headers = {'Cache-Control': 'only-if-cached'} if apenas_cache else {}
+        self.execucoes = 0
+        self.cache_misses = 0
+        self.proxima_execucao = 0.0
+        # (duração em segundos, sucesso) das últimas execuções
+        self.amostras: deque = deque(maxlen=janela)
+        self.ultima: Optional[Dict] = None
+
+    def registrar(self, duracao: float, status: Optional[int], erro: Optional[str] = None,
+                  cache: Optional[str] = None) -> bool:
+        sucesso = status == 200
+        self.execucoes += 1
+        self.ultima = {
+            "quando": datetime.now().isoformat(),
+            "status": status,
+            "cache": cache,
+            "duracao_ms": round(duracao * 1000, 1),
+            "erro": erro
+        }
+        if self.headers and status == 504 and cache == "MISS":
+            # Cache frio: nada foi medido além do próprio miss, que não entra na janela
+            self.cache_misses += 1
+            probe_duration.observe(duracao, probe=self.nome, outcome="cache_miss")
+            return False
+        self.amostras.append((duracao, sucesso))
+        probe_duration.observe(duracao, probe=self.nome, outcome="ok" if sucesso else "erro")
+        return sucesso
+
+    def get_stats(self) -> Dict:
+        duracoes = sorted(duracao for duracao, _ in self.amostras)
+        sucessos = sum(1 for _, sucesso in self.amostras if sucesso)
+
+        def percentil(p: float) -> Optional[float]:
+            if not duracoes:
+                return None
+            return round(duracoes[min(int(p * len(duracoes)), len(duracoes) - 1)] * 1000, 1)
+
+        # Histograma da janela, com os mesmos limites (em segundos) de /metrics
+        limites = Histogram.BUCKETS_PADRAO
+        contagens = [0] * (len(limites) + 1)
+        for duracao in duracoes:
+            contagens[bisect_left(limites, duracao)] += 1
+
+        return {
+            "url": self.url,
+            "intervalo_segundos": self.intervalo,
+            "execucoes": self.execucoes,
+            "cache_misses": self.cache_misses,
+            "janela": len(self.amostras),
+            "taxa_sucesso": round(sucessos / len(self.amostras), 3) if self.amostras else None,
+            "latencia_ms": {
+                "p50": percentil(0.5),
+                "p90": percentil(0.9),
+                "p99": percentil(0.99),
+                "max": round(duracoes[-1] * 1000, 1) if duracoes else None
+            },
+            "histograma": {
+                f"le_{limite}": contagem for limite, contagem in zip(limites + ("inf",), contagens) if contagem
+            },
+            "ultima": self.ultima
+        }
+
+
 class KeepAliveService:
     def __init__(self):
         self.is_running = False
         self.task: Optional[asyncio.Task] = None
-        self.health_url = f"{settings.API_BASE_URL}/health"
-        self.ping_interval = 600 # 10 minutos
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.sondas = {
+            nome: Sonda(
+                nome,
+                f"{settings.KEEP_ALIVE_BASE_URL}{config['caminho']}",
+                config['intervalo'],
+                settings.KEEP_ALIVE_JANELA,
+                config.get('apenas_cache', False)
+            )
+            for nome, config in settings.KEEP_ALIVE_SONDAS.items()
+        }
         self.ping_count = 0
-        
+
     async def start(self):
         if self.is_running:
             logger.warning("Keep-alive já está rodando, ignorando nova inicialização")
             return
-            
+
         self.is_running = True
         self.ping_count = 0
-        
+
         try:
+            # Uma sessão para todas as sondas: a conexão é reaproveitada entre
+            # execuções, como faria um cliente real
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.KEEP_ALIVE_TIMEOUT_SECONDS),
+                connector=aiohttp.TCPConnector(limit=1),
+                headers={'User-Agent': 'KeepAlive-Service/1.0'}
+            )
+            # A primeira sonda (o /health) roda já; as demais esperam o próprio intervalo
+            agora = time.monotonic()
+            for indice, sonda in enumerate(self.sondas.values()):
+                sonda.proxima_execucao = agora if indice == 0 else agora + sonda.intervalo
+
             self.task = asyncio.create_task(self._keep_alive_loop())
-            logger.info(f"Keep-alive iniciado - URL: {self.health_url} - Intervalo: {self.ping_interval}s")
-            
-            await self._ping_health()
-            
+            logger.info(
+                "Keep-alive iniciado - sondas: "
+                + ", ".join(f"{sonda.url} a cada {sonda.intervalo}s" for sonda in self.sondas.values())
+            )
+
         except Exception as e:
             logger.error(f"Erro ao iniciar keep-alive: {str(e)}")
             self.is_running = False
             raise
-        
+
     async def stop(self):
         logger.info("Parando keep-alive...")
         self.is_running = False
-        
+
         if self.task and not self.task.done():
             self.task.cancel()
             try:
@@ -48,61 +152,75 @@ class KeepAliveService:
                 logger.warning("Timeout ao parar keep-alive")
             except Exception as e:
                 logger.error(f"Erro ao parar keep-alive: {str(e)}")
-                
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
         logger.info(f"Keep-alive finalizado - Total de pings: {self.ping_count}")
-        
+
     async def _keep_alive_loop(self):
         logger.info("Loop de keep-alive iniciado")
-        
+
         while self.is_running:
             try:
-                await asyncio.sleep(self.ping_interval)
-                
+                proxima = min(self.sondas.values(), key=lambda sonda: sonda.proxima_execucao)
+                espera = proxima.proxima_execucao - time.monotonic()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+
                 if not self.is_running:
                     break
-                    
-                await self._ping_health()
-                
+
+                # Uma sonda por vez: a medição não disputa a instância consigo mesma
+                proxima.proxima_execucao = time.monotonic() + proxima.intervalo
+                await self._executar_sonda(proxima)
+
             except asyncio.CancelledError:
                 logger.info("Loop de keep-alive cancelado")
                 break
             except Exception as e:
                 logger.error(f"Erro no loop de keep-alive: {str(e)}")
                 await asyncio.sleep(60)
-                
+
         logger.info("Loop de keep-alive finalizado")
-                
-    async def _ping_health(self):
-        start_time = datetime.now()
+
+    async def _executar_sonda(self, sonda: Sonda) -> None:
         self.ping_count += 1
-        
+        inicio = time.perf_counter()
+
         try:
-            logger.info(f"Keep-alive ping #{self.ping_count} para {self.health_url}")
-            
-            timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(limit=1, limit_per_host=1)
-            
-            async with aiohttp.ClientSession(
-                timeout=timeout, 
-                connector=connector,
-                headers={'User-Agent': 'KeepAlive-Service/1.0'}
-            ) as session:
-                async with session.get(self.health_url) as response:
-                    duration = (datetime.now() - start_time).total_seconds()
-                    
-                    if response.status == 200:
-                        logger.info(f"Keep-alive ping #{self.ping_count} ✅ SUCESSO - {duration:.2f}s")
-                    else:
-                        logger.warning(f"Keep-alive ping #{self.ping_count} ⚠️ Status {response.status} - {duration:.2f}s")
-                        
+            async with self.session.get(sonda.url, headers=sonda.headers) as response:
+                # O corpo inteiro entra na medição, como para um cliente
+                await response.read()
+                duracao = time.perf_counter() - inicio
+            cache = response.headers.get('X-Cache')
+
+            if sonda.registrar(duracao, response.status, cache=cache):
+                logger.info(f"Sonda {sonda.nome} #{sonda.execucoes} ✅ SUCESSO - {duracao:.2f}s")
+            elif sonda.headers and cache == "MISS":
+                logger.info(f"Sonda {sonda.nome} #{sonda.execucoes} cache frio, não medida")
+            else:
+                logger.warning(f"Sonda {sonda.nome} #{sonda.execucoes} ⚠️ Status {response.status} - {duracao:.2f}s")
+
         except aiohttp.ClientError as e:
-            duration = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Keep-alive ping #{self.ping_count} ❌ ERRO HTTP: {str(e)} - {duration:.2f}s")
+            duracao = time.perf_counter() - inicio
+            sonda.registrar(duracao, None, f"ERRO HTTP: {str(e)}")
+            logger.error(f"Sonda {sonda.nome} #{sonda.execucoes} ❌ ERRO HTTP: {str(e)} - {duracao:.2f}s")
         except asyncio.TimeoutError:
-            duration = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Keep-alive ping #{self.ping_count} ⏰ TIMEOUT após {duration:.2f}s")
+            duracao = time.perf_counter() - inicio
+            sonda.registrar(duracao, None, "TIMEOUT")
+            logger.error(f"Sonda {sonda.nome} #{sonda.execucoes} ⏰ TIMEOUT após {duracao:.2f}s")
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Keep-alive ping #{self.ping_count} 💥 ERRO: {str(e)} - {duration:.2f}s")
+            duracao = time.perf_counter() - inicio
+            sonda.registrar(duracao, None, f"ERRO: {str(e)}")
+            logger.error(f"Sonda {sonda.nome} #{sonda.execucoes} 💥 ERRO: {str(e)} - {duracao:.2f}s")
+
+    def get_stats(self) -> Dict:
+        return {
+            "ativo": self.is_running,
+            "total_execucoes": self.ping_count,
+            "sondas": {nome: sonda.get_stats() for nome, sonda in self.sondas.items()}
+        }
 
 keep_alive_service = KeepAliveService()
@@ -1,23 +1,140 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from .config import settings
+
+# extra= dos logs do caminho quente de cada requisição: passam pela amostragem
+AMOSTRADO = {"amostrado": True}
+
+_CAMPOS_PADRAO = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "amostrado"}
+
+_listener: Optional[QueueListener] = None
+_handler: Optional["QueueHandlerNaoBloqueante"] = None
+
+
+class QueueHandlerNaoBloqueante(QueueHandler):
+
+    # Quem loga só enfileira o registro; formatação e escrita acontecem na
+    # thread do QueueListener. Fila cheia descarta em vez de bloquear.
+
+    def __init__(self, fila: queue.Queue, amostragem: float):
+        super().__init__(fila)
+        self.amostragem = amostragem
+        self._lock_stats = threading.Lock()
+        self.stats = {"enfileirados": 0, "descartados_fila_cheia": 0, "descartados_amostragem": 0}
+
+    def _contar(self, campo: str) -> None:
+        with self._lock_stats:
+            self.stats[campo] += 1
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "amostrado", False) and random.random() >= self.amostragem:
+            self._contar("descartados_amostragem")
+            return False
+        return super().filter(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # O listener está no mesmo processo: o registro segue com msg e args,
+        # e a mensagem só é montada na thread do listener
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self._contar("enfileirados")
+        except queue.Full:
+            self._contar("descartados_fila_cheia")
+
+
+class FormatadorJSON(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+            "thread": record.threadName
+        }
+        # Campos passados em extra= viram chaves do JSON
+        for campo, valor in vars(record).items():
+            if campo not in _CAMPOS_PADRAO:
+                dados[campo] = valor
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+def _formatador() -> logging.Formatter:
+    if settings.LOG_FORMAT.lower() == "json":
+        return FormatadorJSON()
+    return logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
 
 def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
-    uvicorn_logger = logging.getLogger("uvicorn")
-    uvicorn_logger.setLevel(logging.INFO)
-    
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    raiz = logging.getLogger()
+    # Quem embute a aplicação (benchmarks, scripts) pode já ter configurado saída
+    # e nível: os handlers dele passam para trás da fila e o nível é mantido
+    destinos = list(raiz.handlers)
+    if not destinos:
+        saida = logging.StreamHandler(sys.stdout)
+        saida.setFormatter(_formatador())
+        destinos = [saida]
+        raiz.setLevel(settings.LOG_LEVEL.upper())
+
+    fila: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _handler = QueueHandlerNaoBloqueante(fila, settings.LOG_AMOSTRAGEM)
+    _listener = QueueListener(fila, *destinos, respect_handler_level=True)
+    _listener.start()
+    atexit.register(parar_logging)
+
+    raiz.handlers = [_handler]
+
+    # Os loggers do uvicorn (inclusive o de acesso, uma linha por requisição)
+    # passam pela mesma fila em vez de escrever direto no stdout
+    for nome in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(nome)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+    logging.getLogger("uvicorn").setLevel(logging.INFO)
+
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
 
+def parar_logging() -> None:
+    # Esvazia a fila antes de sair
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> Dict:
+    if _handler is None:
+        return {}
+    with _handler._lock_stats:
+        stats = dict(_handler.stats)
+    return {
+        "formato": settings.LOG_FORMAT,
+        "amostragem": _handler.amostragem,
+        "fila_pendente": _handler.queue.qsize(),
+        **stats
+    }
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
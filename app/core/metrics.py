@@ -0,0 +1,157 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from .timing import span
+
+
+def _formatar_labels(nomes: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class Counter:
+
+    def __init__(self, nome: str, descricao: str, labels: Sequence[str]):
+        self.nome = nome
+        self.descricao = descricao
+        self.labels = tuple(labels)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor: float = 1, **labels) -> None:
+        chave = tuple(str(labels.get(nome, "")) for nome in self.labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def render(self) -> List[str]:
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} counter"]
+        with self._lock:
+            for chave, valor in sorted(self._valores.items()):
+                linhas.append(f"{self.nome}{_formatar_labels(self.labels, chave)} {_formatar_numero(valor)}")
+        return linhas
+
+
+class Histogram:
+
+    BUCKETS_PADRAO = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, nome: str, descricao: str, labels: Sequence[str], buckets: Sequence[float] = BUCKETS_PADRAO):
+        self.nome = nome
+        self.descricao = descricao
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Por série: contagens por bucket (não cumulativas), soma e total
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, valor: float, **labels) -> None:
+        chave = tuple(str(labels.get(nome, "")) for nome in self.labels)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[chave] = serie
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - inicio, **labels)
+
+    def render(self) -> List[str]:
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} histogram"]
+        with self._lock:
+            for chave, (contagens, soma, total) in sorted(self._series.items()):
+                acumulado = 0
+                for limite, contagem in zip(self.buckets + (float("inf"),), contagens):
+                    acumulado += contagem
+                    labels = _formatar_labels(self.labels, chave, f'le="{_formatar_numero(limite)}"')
+                    linhas.append(f"{self.nome}_bucket{labels} {acumulado}")
+                labels = _formatar_labels(self.labels, chave)
+                linhas.append(f"{self.nome}_sum{labels} {_formatar_numero(soma)}")
+                linhas.append(f"{self.nome}_count{labels} {total}")
+        return linhas
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metricas = []
+
+    def counter(self, nome: str, descricao: str, labels: Sequence[str] = ()) -> Counter:
+        metrica = Counter(nome, descricao, labels)
+        self._metricas.append(metrica)
+        return metrica
+
+    def histogram(self, nome: str, descricao: str, labels: Sequence[str] = (), **kwargs) -> Histogram:
+        metrica = Histogram(nome, descricao, labels, **kwargs)
+        self._metricas.append(metrica)
+        return metrica
+
+    def render(self) -> str:
+        linhas = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.render())
+        return "\n".join(linhas) + "\n"
+
+
+metrics = MetricsRegistry()
+
+stage_duration = metrics.histogram(
+    "andes_news_stage_duration_seconds",
+    "Duração de cada etapa de scraping e renderização",
+    ["stage", "site"]
+)
+origin_bytes = metrics.counter(
+    "andes_news_origin_bytes_total",
+    "Bytes baixados das origens",
+    ["site"]
+)
+origin_responses = metrics.counter(
+    "andes_news_origin_responses_total",
+    "Respostas das origens por status HTTP",
+    ["site", "status"]
+)
+origin_retries = metrics.counter(
+    "andes_news_origin_retries_total",
+    "Retentativas e hedges enviados às origens",
+    ["host", "kind"]
+)
+cache_requests = metrics.counter(
+    "andes_news_cache_requests_total",
+    "Consultas ao cache por resultado",
+    ["outcome"]
+)
+
+
+@contextmanager
+def medir(etapa: str, site: str = "all"):
+    inicio = time.perf_counter()
+    with span(etapa, site if site != "all" else None):
+        try:
+            yield
+        finally:
+            stage_duration.observe(time.perf_counter() - inicio, stage=etapa, site=site)
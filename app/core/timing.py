@@ -0,0 +1,109 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class Span:
+
+    __slots__ = ("nome", "site", "inicio", "fim", "filhos")
+
+    def __init__(self, nome: str, site: Optional[str] = None):
+        self.nome = nome
+        self.site = site
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self.filhos: List["Span"] = []
+
+    @property
+    def duracao_ms(self) -> float:
+        fim = self.fim if self.fim is not None else time.perf_counter()
+        return (fim - self.inicio) * 1000
+
+    def to_dict(self, inicio_trace: float) -> Dict:
+        dados = {
+            "nome": self.nome,
+            "inicio_ms": round((self.inicio - inicio_trace) * 1000, 2),
+            "duracao_ms": round(self.duracao_ms, 2)
+        }
+        if self.site:
+            dados["site"] = self.site
+        if self.filhos:
+            dados["filhos"] = [filho.to_dict(inicio_trace) for filho in self.filhos]
+        return dados
+
+
+_span_atual: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("span_atual", default=None)
+
+
+@contextmanager
+def span(nome: str, site: Optional[str] = None):
+    pai = _span_atual.get()
+    if pai is None:
+        yield None
+        return
+
+    novo = Span(nome, site)
+    # list.append é atômico: spans podem ser criados em threads do executor
+    pai.filhos.append(novo)
+    token = _span_atual.set(novo)
+    try:
+        yield novo
+    finally:
+        novo.fim = time.perf_counter()
+        _span_atual.reset(token)
+
+
+@contextmanager
+def trace(nome: str):
+    raiz = Span(nome)
+    token = _span_atual.set(raiz)
+    try:
+        yield raiz
+    finally:
+        raiz.fim = time.perf_counter()
+        _span_atual.reset(token)
+
+
+def trace_ativo() -> bool:
+    return _span_atual.get() is not None
+
+
+def _agregar(raiz: Span) -> Dict[Tuple[str, Optional[str]], List[float]]:
+    agregados: Dict[Tuple[str, Optional[str]], List[float]] = {}
+    pendentes = list(raiz.filhos)
+    while pendentes:
+        atual = pendentes.pop()
+        chave = (atual.nome, atual.site)
+        total = agregados.setdefault(chave, [0.0, 0])
+        total[0] += atual.duracao_ms
+        total[1] += 1
+        pendentes.extend(atual.filhos)
+    return agregados
+
+
+def server_timing_header(raiz: Span) -> str:
+    entradas = []
+    for (nome, site), (duracao, quantidade) in sorted(_agregar(raiz).items(), key=lambda item: -item[1][0]):
+        descricao = f"{site} x{quantidade}" if site else f"x{quantidade}"
+        entradas.append(f'{nome};desc="{descricao}";dur={duracao:.1f}')
+    entradas.append(f"total;dur={raiz.duracao_ms:.1f}")
+    return ", ".join(entradas)
+
+
+def formatar_arvore(raiz: Span) -> str:
+    linhas = []
+
+    def visitar(atual: Span, nivel: int):
+        site = f" [{atual.site}]" if atual.site else ""
+        linhas.append(f"{'  ' * nivel}{atual.nome}{site}: {atual.duracao_ms:.1f}ms")
+        for filho in atual.filhos:
+            visitar(filho, nivel + 1)
+
+    visitar(raiz, 0)
+    return "\n".join(linhas)
+
+
+def submit_com_contexto(executor, fn, *args, **kwargs):
+    contexto = contextvars.copy_context()
+    return executor.submit(contexto.run, fn, *args, **kwargs)
@@ -1,6 +1,8 @@
 import re
 from typing import List, Dict, Optional, Union
 
+from .core.logging import AMOSTRADO
+
 def get_logger(name):
     import logging
     return logging.getLogger(name)
@@ -31,7 +33,7 @@ class NewsFilter:
         if not self.settings.ALLOW_EXTERNAL_KEYWORDS:
             include_keywords = self.default_include
             exclude_keywords = self.default_exclude
-            logger.info("Aplicando APENAS filtros do config.py - parâmetros externos ignorados")
+            logger.info("Aplicando APENAS filtros do config.py - parâmetros externos ignorados", extra=AMOSTRADO)
         else:
             if use_defaults is None:
                 use_defaults = self.settings.APPLY_FILTER_BY_DEFAULT and self.settings.ENABLE_KEYWORD_FILTER
@@ -45,7 +47,7 @@ class NewsFilter:
                 exclude_keywords = self.default_exclude
         
         if not include_keywords and not exclude_keywords:
-            logger.info("Nenhum filtro aplicado - retornando todas as notícias")
+            logger.info("Nenhum filtro aplicado - retornando todas as notícias", extra=AMOSTRADO)
             return noticias
         
         filtered_news = []
@@ -61,10 +63,11 @@ class NewsFilter:
                 filtered_news.append(noticia)
         
         logger.info(
-            f"Filtragem aplicada: {len(filtered_news)}/{len(noticias)} notícias mantidas. "
-            f"Incluir: {include_keywords if include_keywords else 'Nenhuma'}, "
-            f"Excluir: {exclude_keywords if exclude_keywords else 'Nenhuma'}"
+            "Filtragem aplicada: %d/%d notícias mantidas (%d palavras incluídas, %d excluídas)",
+            len(filtered_news), len(noticias), len(include_keywords), len(exclude_keywords), extra=AMOSTRADO
         )
+        # As listas completas só em DEBUG: são as mesmas em toda requisição
+        logger.debug("Incluir: %s, Excluir: %s", include_keywords or 'Nenhuma', exclude_keywords or 'Nenhuma')
         
         return filtered_news
     
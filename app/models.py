@@ -1,9 +1,14 @@
 from typing import List, Dict, Optional
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from datetime import datetime
 
+from .core.config import settings
+
 
 class NoticiaModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: Optional[str] = None
     numero: int
     titulo: str
     resumo: str
@@ -11,6 +16,7 @@ class NoticiaModel(BaseModel):
     link: HttpUrl
     categoria: str
     data: str
+    data_publicacao: Optional[datetime] = None
 
 
 class NoticiaResponse(BaseModel):
@@ -19,6 +25,36 @@ class NoticiaResponse(BaseModel):
     noticias: List[NoticiaModel]
     timestamp: str
     filtros_aplicados: Optional[Dict] = None
+    parcial: bool = False
+
+
+class DeltaResponse(BaseModel):
+    total_novas: int
+    noticias: List[NoticiaModel]
+    marca: Optional[str] = None
+    completo: bool = False
+    aquecendo: bool = False
+    timestamp: str
+
+
+class DetalhesRequest(BaseModel):
+    urls: List[HttpUrl] = Field(min_length=1, max_length=settings.DETALHES_MAX_URLS)
+
+
+class DetalheModel(BaseModel):
+    url: str
+    site: Optional[str] = None
+    resumo: Optional[str] = None
+    imagem: Optional[str] = None
+    from_cache: bool = False
+    erro: Optional[str] = None
+
+
+class DetalhesResponse(BaseModel):
+    total: int
+    detalhes: List[DetalheModel]
+    parcial: bool = False
+    timestamp: str
 
 
 class KeywordFilter(BaseModel):
@@ -2,5 +2,7 @@ from .info import router as info_router
 from .noticias import router as noticias_router
 from .cache import router as cache_router
 from .rss import router as rss_router
+from .metrics import router as metrics_router
+from .websub import router as websub_router
 
-__all__ = ["info_router", "noticias_router", "cache_router", "rss_router"]
+__all__ = ["info_router", "noticias_router", "cache_router", "rss_router", "metrics_router", "websub_router"]
@@ -1,8 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from datetime import datetime
+from typing import Optional
 
 from ..core import get_logger
 from ..cache import news_cache
+from ..scrapers.politeness import politeness_scheduler
+from ..scrapers.http_client import http_client
+from ..scrapers.circuit_breaker import circuit_breakers
+from ..scrapers.host_stats import host_stats
+from ..scrapers.multi_site_scraper import multi_site_scraper
+from ..scrapers.conteudo_store import conteudo_store
+from ..scrapers.image_metadata import image_metadata_cache
+from ..services import refresh_service, detalhes_service
 
 logger = get_logger(__name__)
 
@@ -11,7 +20,18 @@ router = APIRouter(tags=["Cache"])
 
 @router.get("/cache/stats")
 async def cache_stats():
-    return news_cache.get_stats()
+    return {
+        **news_cache.get_stats(),
+        "politeness": politeness_scheduler.get_stats(),
+        "cassette": http_client.cassette.get_stats(),
+        "circuit_breakers": circuit_breakers.get_stats(),
+        "origens": host_stats.get_stats(),
+        "cadencia": multi_site_scraper.get_cadencia_stats(),
+        "detalhes": detalhes_service.get_stats(),
+        "conteudo": conteudo_store.get_stats(),
+        "imagens": image_metadata_cache.get_stats(),
+        "duplicatas": multi_site_scraper.duplicatas.get_stats()
+    }
 
 
 @router.get("/cache/info")
@@ -27,3 +47,32 @@ async def clear_cache():
         "message": "Cache limpo com sucesso",
         "timestamp": datetime.now().isoformat()
     }
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(
+    site: Optional[str] = Query(default=None, description="Site cujas entradas devem ser invalidadas (andes, csp-conlutas). Quase toda entrada mistura os dois sites, então na prática o cache inteiro sai; para renovar só um site, use /cache/refresh?site="),
+    url: Optional[str] = Query(default=None, description="Link de uma notícia cujas entradas devem ser invalidadas")
+):
+    try:
+        return refresh_service.invalidar(site=site, link=url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/cache/refresh", status_code=202)
+async def refresh_cache(
+    site: Optional[str] = Query(default=None, description="Refaz o scraping apenas deste site do zero (andes, csp-conlutas), mantendo as notícias em cache dos demais")
+):
+    try:
+        return refresh_service.iniciar(site=site)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cache/refresh/{job_id}")
+async def refresh_status(job_id: str):
+    job = refresh_service.obter(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Refresh '{job_id}' não encontrado")
+    return job
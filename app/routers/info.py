@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 from datetime import datetime
 
-from ..core import settings, get_logger
+from ..core import settings, get_logger, get_logging_stats, keep_alive_service
 from ..cache import news_cache
+from ..scrapers.circuit_breaker import circuit_breakers
 
 logger = get_logger(__name__)
 
@@ -21,11 +22,18 @@ async def root():
         "cache_hit_rate": f"{cache_stats['hit_rate_percentage']}%",
         "endpoints": {
             "noticias": "/noticias - Obtém as últimas notícias (com cache)",
+            "delta": "/noticias/delta - Somente as notícias novas desde a última consulta (do cache)",
+            "detalhes": "/noticias/detalhes - Resumo e imagem de uma lista de URLs (POST)",
+            "conteudo": "/noticias/{id}/conteudo - Texto completo de uma notícia já enriquecida",
+            "eventos": "/noticias/eventos - Stream SSE (ou long-poll) das notícias recém-descobertas",
             "rss": "/rss - Feed RSS das notícias (compatível com leitores RSS)",
             "health": "/health - Status da API",
             "docs": "/docs - Documentação interativa",
             "cache_stats": "/cache/stats - Estatísticas do cache",
-            "cache_info": "/cache/info - Informações detalhadas do cache"
+            "cache_info": "/cache/info - Informações detalhadas do cache",
+            "cache_refresh": "/cache/refresh - Atualização do cache em segundo plano (POST)",
+            "metrics": "/metrics - Métricas no formato Prometheus",
+            "websub": "/websub/hub - Hub WebSub para receber o feed RSS por push"
         }
     }
 
@@ -37,7 +45,10 @@ async def health_check():
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "service": settings.APP_NAME,
-            "version": settings.VERSION
+            "version": settings.VERSION,
+            "origens": circuit_breakers.get_stats(),
+            "logging": get_logging_stats(),
+            "sondas": keep_alive_service.get_stats()
         }
     except Exception:
         return {"status": "ok"}
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from ..core.metrics import metrics
+
+router = APIRouter(tags=["Métricas"])
+
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    return Response(
+        content=metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
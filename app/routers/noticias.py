@@ -1,12 +1,22 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+import time
 from typing import Optional, List
 
-from ..core import settings, get_logger
-from ..models import NoticiaResponse, ErrorResponse
+from ..core import settings, get_logger, AMOSTRADO
+from ..models import NoticiaResponse, DeltaResponse, DetalhesRequest, DetalhesResponse, ErrorResponse
 from ..scraper import AndesScraper
+from ..scrapers import multi_site_scraper
 from ..cache import news_cache
+from ..services.event_service import event_service
+from ..services.delta_service import delta_service
+from ..services.detalhes_service import detalhes_service
+from ..scrapers.conteudo_store import conteudo_store
 from ..filters import news_filter
+from ..core.metrics import medir
+from ..core.deadline import prazo
+from ..core.timing import span
 
 logger = get_logger(__name__)
 
@@ -15,11 +25,15 @@ router = APIRouter(tags=["Notícias"])
 scraper = AndesScraper()
 
 
+# Rota síncrona: num cache miss o scraping bloqueia, e no threadpool ele não
+# congela os streams de /noticias/eventos que dividem o event loop
 @router.get("/noticias", 
            response_model=NoticiaResponse,
            summary="Obter últimas notícias com filtros automáticos",
            description="Retorna as últimas notícias do site da ANDES. Os filtros de palavras-chave definidos no arquivo de configuração são aplicados automaticamente - não é necessário chamar rotas específicas para filtragem.")
-async def obter_noticias(
+def obter_noticias(
+    request: Request,
+    response: Response,
     max_noticias: Optional[int] = Query(
         default=settings.DEFAULT_NOTICIAS, 
         ge=1, 
@@ -36,7 +50,7 @@ async def obter_noticias(
     )
 ):
     try:
-        logger.info(f"Requisição recebida para {max_noticias} notícias com filtros automáticos")
+        logger.info("Requisição recebida para %d notícias com filtros automáticos", max_noticias, extra=AMOSTRADO)
         
         keywords_include = None
         keywords_exclude = None
@@ -50,38 +64,62 @@ async def obter_noticias(
         )
         
         cache_filters = filter_summary
-        cached_response = news_cache.get(max_noticias, cache_filters)
+        with span('cache_lookup'):
+            cached_response = news_cache.get(max_noticias, cache_filters)
         
         if cached_response is not None:
-            logger.info(f"Retornando {cached_response['total_noticias']} notícias do cache (filtradas)")
-            return NoticiaResponse(**cached_response)
+            logger.info("Retornando %d notícias do cache (filtradas)", cached_response['total_noticias'], extra=AMOSTRADO)
+            response.headers["X-Cache"] = "HIT"
+            with medir('response_serialize'):
+                return NoticiaResponse(**cached_response)
         
-        logger.info("Cache miss - realizando scraping com filtros automáticos")
+        # Quem pede only-if-cached (as sondas do keep-alive) não dispara scraping
+        if "only-if-cached" in request.headers.get("cache-control", ""):
+            return Response(status_code=504, headers={"X-Cache": "MISS"})
         
-        noticias = scraper.obter_noticias(
-            max_noticias=max_noticias,
-            apply_filters=True,
-            keywords_include=keywords_include,
-            keywords_exclude=keywords_exclude,
-            titulo_apenas=apenas_titulo,
-            caso_sensitivo=case_sensitive
-        )
+        response.headers["X-Cache"] = "MISS"
+        logger.info("Cache miss - realizando scraping com filtros automáticos", extra=AMOSTRADO)
+        
+        inicio_scrape = time.perf_counter()
+        with span('scrape'), prazo(settings.REQUEST_DEADLINE_SECONDS) as deadline:
+            noticias = scraper.obter_noticias(
+                max_noticias=max_noticias,
+                apply_filters=True,
+                keywords_include=keywords_include,
+                keywords_exclude=keywords_exclude,
+                titulo_apenas=apenas_titulo,
+                caso_sensitivo=case_sensitive
+            )
         
+        parcial = bool(deadline and deadline.esgotado)
         response_data = {
             "total_noticias": len(noticias),
             "dados_extraidos": ["Título ✓", "Resumo ✓", "Imagem ✓", "Link ✓", "Categoria ✓", "Data ✓"],
             "noticias": noticias,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "parcial": parcial
         }
         
-        news_cache.set(max_noticias, response_data, cache_filters)
+        # Respostas parciais não vão para o cache: a próxima requisição tenta completar
+        if parcial:
+            logger.warning(
+                "Prazo de %ss esgotado - retornando resposta parcial com %d notícias",
+                settings.REQUEST_DEADLINE_SECONDS, len(noticias)
+            )
+        else:
+            news_cache.set(
+                max_noticias, response_data, cache_filters,
+                custo_segundos=time.perf_counter() - inicio_scrape,
+                ttl_seconds=multi_site_scraper.janela_frescor()
+            )
         
-        response = NoticiaResponse(**response_data)
-        logger.info(f"Retornando {len(noticias)} notícias com filtros automáticos aplicados")
+        with medir('response_serialize'):
+            response = NoticiaResponse(**response_data)
+        logger.info("Retornando %d notícias com filtros automáticos aplicados", len(noticias), extra=AMOSTRADO)
         return response
         
     except Exception as e:
-        logger.error(f"Erro ao obter notícias: {str(e)}")
+        logger.error("Erro ao obter notícias: %s", e)
         
         error_response = ErrorResponse(
             erro="Erro interno do servidor",
@@ -92,3 +130,150 @@ async def obter_noticias(
             status_code=500,
             detail=error_response.model_dump()
         )
+
+
+@router.get("/noticias/delta",
+           response_model=DeltaResponse,
+           responses={304: {"description": "Nada novo desde a marca enviada em If-None-Match"}},
+           summary="Somente as notícias novas desde a última consulta",
+           description="Responde a partir do conjunto em cache da mesma consulta de /noticias, sem scraping, com as notícias que apareceram depois de `desde` (a `marca` da resposta anterior, um instante ISO 8601 ou o link da notícia mais recente já recebida) e a nova `marca`. A marca também vai no ETag: com `If-None-Match` e nada novo, a resposta é 304.")
+async def delta_noticias(
+    request: Request,
+    response: Response,
+    desde: Optional[str] = Query(
+        default=None,
+        description="Marca da consulta anterior, instante ISO 8601 ou link da última notícia recebida"
+    ),
+    max_noticias: Optional[int] = Query(
+        default=settings.DEFAULT_NOTICIAS,
+        ge=1,
+        le=settings.MAX_NOTICIAS_LIMIT,
+        description=f"Tamanho do conjunto de /noticias usado como base (1-{settings.MAX_NOTICIAS_LIMIT})"
+    ),
+    apenas_titulo: bool = Query(default=False),
+    case_sensitive: bool = Query(default=False)
+):
+    if_none_match = request.headers.get("if-none-match")
+    if desde is None and if_none_match:
+        desde = if_none_match.removeprefix("W/")
+
+    filter_summary = news_filter.get_filter_summary(
+        titulo_apenas=apenas_titulo,
+        caso_sensitivo=case_sensitive,
+        use_defaults=True
+    )
+    with span('cache_lookup'):
+        cached_response = news_cache.get(max_noticias, filter_summary)
+
+    if cached_response is None:
+        delta_service.aquecer(max_noticias, filter_summary)
+        response.headers["Retry-After"] = "5"
+        return DeltaResponse(
+            total_novas=0,
+            noticias=[],
+            marca=desde,
+            aquecendo=True,
+            timestamp=datetime.now().isoformat()
+        )
+
+    try:
+        delta = delta_service.calcular(cached_response["noticias"], desde)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    marca = delta_service.formatar_marca(delta["marca"]) if delta["marca"] else None
+    if marca:
+        response.headers["ETag"] = f'"{marca}"'
+    if if_none_match and not delta["noticias"] and not delta["completo"]:
+        return Response(status_code=304, headers={"ETag": f'"{marca}"'})
+
+    return DeltaResponse(
+        total_novas=len(delta["noticias"]),
+        noticias=delta["noticias"],
+        marca=marca,
+        completo=delta["completo"],
+        timestamp=datetime.now().isoformat()
+    )
+
+
+@router.post("/noticias/detalhes",
+            response_model=DetalhesResponse,
+            summary="Resumo e imagem de várias notícias a partir das URLs",
+            description=f"Enriquece até {settings.DETALHES_MAX_URLS} URLs dos sites suportados ({settings.DETALHES_MAX_URLS_POR_SITE} por site, o que a politeness por host permite buscar dentro do prazo), buscando em paralelo as que não estão no cache por URL nem no estado do crawl. Mais URLs de um site respondem 400. URLs de outros sites voltam com `erro`.")
+def detalhes_noticias(pedido: DetalhesRequest):
+    # Rota síncrona: o FastAPI a executa no threadpool e a espera pelas
+    # origens não bloqueia o event loop
+    try:
+        with span('detalhes'), prazo(settings.REQUEST_DEADLINE_SECONDS):
+            detalhes, parcial = detalhes_service.obter([str(url) for url in pedido.urls])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return DetalhesResponse(
+        total=len(detalhes),
+        detalhes=detalhes,
+        parcial=parcial,
+        timestamp=datetime.now().isoformat()
+    )
+
+
+@router.get("/noticias/eventos",
+           summary="Stream de novas notícias (SSE ou long-poll)",
+           description="Envia um evento por notícia nova descoberta pelos crawls. Com `Accept: text/event-stream` a conexão vira um stream SSE que aceita retomada por `Last-Event-ID`; sem isso, funciona como long-poll e responde assim que houver eventos após `ultimo_id` ou quando o tempo de espera acabar.")
+async def eventos_noticias(
+    request: Request,
+    ultimo_id: Optional[int] = Query(
+        default=None,
+        description="Último id de evento recebido (o header Last-Event-ID tem o mesmo efeito)"
+    ),
+    timeout: float = Query(
+        default=settings.EVENTOS_LONGPOLL_TIMEOUT_SECONDS,
+        ge=0,
+        le=60,
+        description="Espera máxima do long-poll em segundos"
+    )
+):
+    if ultimo_id is None:
+        try:
+            ultimo_id = int(request.headers["last-event-id"])
+        except (KeyError, ValueError):
+            ultimo_id = None
+
+    if event_service.assinantes >= settings.EVENTOS_MAX_ASSINANTES:
+        raise HTTPException(status_code=503, detail="Limite de assinantes do stream de eventos atingido")
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            event_service.stream(ultimo_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    return await event_service.long_poll(ultimo_id, timeout)
+
+
+@router.get("/noticias/eventos/stats")
+async def eventos_stats():
+    return event_service.get_stats()
+
+
+@router.get("/noticias/{noticia_id}/conteudo",
+           summary="Texto completo de uma notícia",
+           description="Devolve o texto completo guardado (comprimido) quando a notícia foi enriquecida, sem nova busca na origem. O `id` vem no campo `id` das notícias. Recurso opcional: com `CONTEUDO_COMPLETO_ENABLED` desligado (o padrão), responde sempre 404.")
+def conteudo_noticia(noticia_id: str):
+    if not settings.CONTEUDO_COMPLETO_ENABLED:
+        raise HTTPException(status_code=404, detail="Texto completo desativado (CONTEUDO_COMPLETO_ENABLED)")
+    # Síncrona: leitura em disco e descompressão rodam no threadpool, fora do event loop
+    with span('conteudo_load'):
+        conteudo = conteudo_store.ler(noticia_id)
+    if conteudo is None:
+        raise HTTPException(status_code=404, detail=f"Conteúdo da notícia '{noticia_id}' não encontrado")
+
+    return {
+        "id": noticia_id,
+        "link": conteudo["link"],
+        "conteudo": conteudo["corpo"],
+        "tamanho_caracteres": len(conteudo["corpo"]),
+        "tamanho_comprimido": conteudo["tamanho_comprimido"],
+        "gravado_em": datetime.fromtimestamp(conteudo["gravado_em"]).isoformat()
+    }
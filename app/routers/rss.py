@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Query, Response
+from fastapi import APIRouter, Query, Request, Response
 from datetime import datetime
+import time
 from typing import Optional
 
-from ..core import settings, get_logger
+from ..core import settings, get_logger, AMOSTRADO
 from ..services import rss_service
 from ..scraper import AndesScraper
+from ..scrapers import multi_site_scraper
 from ..cache import news_cache
 from ..filters import news_filter
+from ..core.timing import span
+from ..core.deadline import prazo
 
 logger = get_logger(__name__)
 
@@ -15,8 +19,10 @@ router = APIRouter(tags=["RSS"])
 scraper = AndesScraper()
 
 
+# Síncrona pelo mesmo motivo de /noticias: o scraping de um cache miss roda no threadpool
 @router.get("/rss")
-async def get_rss_feed(
+def get_rss_feed(
+    request: Request,
     max_noticias: int = Query(
         default=settings.DEFAULT_RSS_NOTICIAS, 
         ge=1, 
@@ -34,27 +40,37 @@ async def get_rss_feed(
             use_defaults=True
         )
         
-        cached_data = news_cache.get(max_noticias, filter_summary)
+        with span('cache_lookup'):
+            cached_data = news_cache.get(max_noticias, filter_summary)
         
+        parcial = False
         if cached_data:
-            logger.info(f"Retornando feed RSS com {len(cached_data['noticias'])} notícias (cache hit, filtradas)")
+            logger.info("Retornando feed RSS com %d notícias (cache hit, filtradas)", len(cached_data['noticias']), extra=AMOSTRADO)
             noticias = cached_data['noticias']
+            expira_em = datetime.fromisoformat(cached_data['cache_info']['expires_at'])
+            max_age = max(0, round((expira_em - datetime.now()).total_seconds()))
+        elif "only-if-cached" in request.headers.get("cache-control", ""):
+            # Quem pede only-if-cached (as sondas do keep-alive) não dispara scraping
+            return Response(status_code=504, headers={"X-Cache": "MISS"})
         else:
-            logger.info(f"Cache miss - buscando {max_noticias} notícias para feed RSS com filtros automáticos")
+            logger.info("Cache miss - buscando %d notícias para feed RSS com filtros automáticos", max_noticias, extra=AMOSTRADO)
             
-            noticias = scraper.obter_noticias(
-                max_noticias=max_noticias,
-                apply_filters=True,  
-                keywords_include=keywords_include,  
-                keywords_exclude=keywords_exclude  
-            )
+            inicio_scrape = time.perf_counter()
+            with span('scrape'), prazo(settings.REQUEST_DEADLINE_SECONDS) as deadline:
+                noticias = scraper.obter_noticias(
+                    max_noticias=max_noticias,
+                    apply_filters=True,  
+                    keywords_include=keywords_include,  
+                    keywords_exclude=keywords_exclude  
+                )
             
             if not noticias:
                 logger.warning("Nenhuma notícia encontrada para o feed RSS (após filtragem)")
                 empty_rss = rss_service.generate_empty_rss()
                 return Response(
                     content=empty_rss,
-                    media_type="application/rss+xml; charset=utf-8"
+                    media_type="application/rss+xml; charset=utf-8",
+                    headers={"X-Cache": "MISS"}
                 )
             
             response_data = {
@@ -65,22 +81,41 @@ async def get_rss_feed(
                 "filtros_aplicados": filter_summary
             }
             
-            news_cache.set(max_noticias, response_data, filter_summary)
-            logger.info(f"Feed RSS gerado com {len(noticias)} notícias (dados frescos, filtrados automaticamente)")
+            parcial = bool(deadline and deadline.esgotado)
+            max_age = round(multi_site_scraper.janela_frescor())
+            if parcial:
+                logger.warning(
+                    "Prazo de %ss esgotado - feed RSS parcial com %d notícias",
+                    settings.REQUEST_DEADLINE_SECONDS, len(noticias)
+                )
+            else:
+                news_cache.set(
+                    max_noticias, response_data, filter_summary,
+                    custo_segundos=time.perf_counter() - inicio_scrape,
+                    ttl_seconds=max_age
+                )
+            logger.info("Feed RSS gerado com %d notícias (dados frescos, filtrados automaticamente)", len(noticias), extra=AMOSTRADO)
         
         rss_xml = rss_service.generate_rss_xml(noticias)
         
+        headers = {
+            "Cache-Control": f"public, max-age={max_age}",
+            "X-Content-Type-Options": "nosniff",
+            "Link": f'<{settings.API_BASE_URL}/websub/hub>; rel="hub", <{settings.API_BASE_URL}/rss>; rel="self"',
+            "X-Cache": "HIT" if cached_data else "MISS"
+        }
+        if parcial:
+            headers["Cache-Control"] = "no-store"
+            headers["X-Partial-Response"] = "true"
+        
         return Response(
             content=rss_xml,
             media_type="application/rss+xml; charset=utf-8",
-            headers={
-                "Cache-Control": f"public, max-age={settings.CACHE_TTL_SECONDS}",
-                "X-Content-Type-Options": "nosniff"
-            }
+            headers=headers
         )
         
     except Exception as e:
-        logger.error(f"Erro ao gerar feed RSS: {str(e)}")
+        logger.error("Erro ao gerar feed RSS: %s", e)
         
         error_rss = rss_service.generate_error_rss(str(e))
         return Response(
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Request, Response
+from urllib.parse import parse_qs
+
+from ..core import get_logger
+from ..services import websub_hub
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["WebSub"])
+
+
+@router.post("/websub/hub", status_code=202)
+async def websub_hub_endpoint(request: Request):
+    # Corpo application/x-www-form-urlencoded, como manda a especificação WebSub
+    corpo = parse_qs((await request.body()).decode("utf-8"))
+    campos = {chave: valores[0] for chave, valores in corpo.items()}
+
+    try:
+        lease = campos.get("hub.lease_seconds")
+        await websub_hub.start()
+        websub_hub.solicitar(
+            modo=campos.get("hub.mode", ""),
+            callback=campos.get("hub.callback", ""),
+            topico=campos.get("hub.topic", ""),
+            lease_seconds=int(lease) if lease else None,
+            segredo=campos.get("hub.secret")
+        )
+    except ValueError as e:
+        logger.warning(f"Pedido WebSub recusado: {str(e)}")
+        return Response(content=str(e), status_code=400, media_type="text/plain; charset=utf-8")
+
+    return Response(status_code=202)
+
+
+@router.get("/websub/stats")
+async def websub_stats():
+    return websub_hub.get_stats()
@@ -4,7 +4,6 @@ from datetime import datetime
 import re
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -40,10 +39,6 @@ class AndesScraper:
                 sites=['andes', 'csp-conlutas']
             )
             
-            for noticia in noticias:
-                if 'data_obj' in noticia:
-                    del noticia['data_obj']
-            
             logger.info(f"✅ Scraping concluído: {len(noticias)} notícias de múltiplos sites")
             return noticias
             
@@ -61,10 +56,6 @@ class AndesScraper:
                     sites=['andes']
                 )
                 
-                for noticia in noticias:
-                    if 'data_obj' in noticia:
-                        del noticia['data_obj']
-                
                 logger.info(f"✅ Fallback concluído: {len(noticias)} notícias apenas do ANDES")
                 return noticias
             except Exception as fallback_error:
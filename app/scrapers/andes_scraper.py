@@ -1,10 +1,8 @@
 from .base_scraper import BaseScraper
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
 from typing import Dict, List
-from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +10,13 @@ logger = logging.getLogger(__name__)
 
 class AndesScraper(BaseScraper):
     
+    SELETORES_CORPO = [
+        'div.field-name-body',
+        'div.field-type-text-with-summary',
+        'article.node-noticia',
+        'div.content'
+    ]
+    
     def __init__(self):
         super().__init__(
             base_url='https://andes.org.br',
@@ -33,7 +38,7 @@ class AndesScraper(BaseScraper):
         if href:
             url_completa = f"{self.base_url}{href}" if href.startswith('/') else href
             try:
-                response = requests.get(url_completa, headers=self.headers, timeout=10)
+                response = self._get(url_completa, timeout=10)
                 soup_noticia = self._processar_pagina_com_encoding_correto(response)
                 
                 # Buscar especificamente por H2 primeiro (onde está o título real no ANDES)
@@ -137,20 +142,6 @@ class AndesScraper(BaseScraper):
             if match_data:
                 data = match_data.group(1)
         
-        if data == 'Data não encontrada':
-            from datetime import datetime
-            data = datetime.now().strftime('%d de %B de %Y')
-            meses_pt = {
-                'January': 'janeiro', 'February': 'fevereiro', 'March': 'março',
-                'April': 'abril', 'May': 'maio', 'June': 'junho',
-                'July': 'julho', 'August': 'agosto', 'September': 'setembro',
-                'October': 'outubro', 'November': 'novembro', 'December': 'dezembro'
-            }
-            for en, pt in meses_pt.items():
-                if en in data:
-                    data = data.replace(en, pt)
-                    break
-        
         return categoria, data
     
     def _extrair_resumo(self, soup_noticia) -> str:
@@ -7,11 +7,23 @@ from datetime import datetime
 import html
 import logging
 
+from .http_client import http_client
+from .circuit_breaker import CircuitOpenError
+from .conteudo_store import conteudo_store
+from .datas import DATA_MINIMA, parse_data
+from .image_metadata import image_metadata_cache
+from ..core.config import settings
+from ..core.deadline import DeadlineExceeded, deadline_atual
+from ..core.metrics import medir, origin_bytes, origin_responses
+
 logger = logging.getLogger(__name__)
 
 
 class BaseScraper(ABC):
     
+    # Contêineres do texto da notícia, do mais específico ao mais genérico
+    SELETORES_CORPO: List[str] = ['article', 'main']
+    
     def __init__(self, base_url: str, noticias_url: str):
         self.base_url = base_url
         self.noticias_url = noticias_url
@@ -19,6 +31,31 @@ class BaseScraper(ABC):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
     
+    def _get(self, url: str, timeout: float = 15, etapa: str = 'article_fetch') -> requests.Response:
+        return self._request(http_client.get, url, timeout, etapa)
+    
+    def _head(self, url: str, timeout: float = 5, etapa: str = 'image_head') -> requests.Response:
+        return self._request(http_client.head, url, timeout, etapa)
+    
+    def _request(self, metodo, url: str, timeout: float, etapa: str) -> requests.Response:
+        site = self.get_site_name()
+        try:
+            with medir(etapa, site):
+                response = metodo(url, headers=self.headers, timeout=timeout)
+        except CircuitOpenError:
+            origin_responses.inc(site=site, status='circuit_open')
+            raise
+        except DeadlineExceeded:
+            origin_responses.inc(site=site, status='deadline')
+            raise
+        except Exception:
+            origin_responses.inc(site=site, status='error')
+            raise
+        
+        origin_responses.inc(site=site, status=response.status_code)
+        origin_bytes.inc(len(response.content or b''), site=site)
+        return response
+    
     def _normalizar_url_imagem(self, img_src: str) -> str:
         img_src = img_src.strip()
         
@@ -46,30 +83,16 @@ class BaseScraper(ABC):
     
     def _verificar_imagem_acessivel(self, img_url: str) -> bool:
         try:
-            response = requests.head(img_url, headers=self.headers, timeout=5)
-            return response.status_code == 200 and 'image' in response.headers.get('content-type', '')
+            response = self._head(img_url, timeout=5)
+            if response.status_code != 200:
+                return False
+            image_metadata_cache.registrar(img_url, response.headers)
+            return 'image' in response.headers.get('content-type', '')
         except:
             return False
     
     def _parse_date_string(self, data_str: str) -> datetime:
-        try:
-            meses = {
-                'janeiro': '01', 'fevereiro': '02', 'março': '03', 'abril': '04',
-                'maio': '05', 'junho': '06', 'julho': '07', 'agosto': '08',
-                'setembro': '09', 'outubro': '10', 'novembro': '11', 'dezembro': '12'
-            }
-            
-            partes = data_str.lower().split()
-            if len(partes) >= 5:
-                dia = partes[0].zfill(2)
-                mes_nome = partes[2]
-                ano = partes[4]
-                mes_num = meses.get(mes_nome, '01')
-                return datetime.strptime(f"{ano}-{mes_num}-{dia}", "%Y-%m-%d")
-        except Exception as e:
-            logger.warning(f"Erro ao parsear data '{data_str}': {e}")
-        
-        return datetime.min
+        return parse_data(data_str) or DATA_MINIMA
     
     def _limpar_texto(self, texto):
         if not texto:
@@ -107,38 +130,74 @@ class BaseScraper(ABC):
     def get_site_name(self) -> str:
         pass
     
+    def _paragrafo_do_corpo(self, texto: str) -> bool:
+        return len(texto) > 20 and 'cookie' not in texto.lower()
+    
+    def _extrair_corpo(self, soup_noticia: BeautifulSoup) -> str:
+        for selector in self.SELETORES_CORPO:
+            container = soup_noticia.select_one(selector)
+            if not container:
+                continue
+            paragrafos = [self._limpar_texto(p.get_text()) for p in container.find_all('p')]
+            paragrafos = [texto for texto in paragrafos if self._paragrafo_do_corpo(texto)]
+            if paragrafos:
+                return "\n\n".join(paragrafos)
+        return ""
+    
     def _processar_pagina_com_encoding_correto(self, response):
         encodings = ['utf-8', 'cp1252', 'latin1', 'iso-8859-1']
         
         if response.encoding and response.encoding.lower() != 'iso-8859-1':
             encodings.insert(0, response.encoding)
         
-        for encoding in encodings:
-            try:
-                content = response.content.decode(encoding)
-                return BeautifulSoup(content, 'html.parser')
-            except UnicodeDecodeError:
-                continue
-        
-        return BeautifulSoup(response.text, 'html.parser')
+        with medir('html_parse', self.get_site_name()):
+            for encoding in encodings:
+                try:
+                    content = response.content.decode(encoding)
+                    return BeautifulSoup(content, 'html.parser')
+                except UnicodeDecodeError:
+                    continue
+            
+            return BeautifulSoup(response.text, 'html.parser')
 
     def extrair_resumo_e_imagem_noticia(self, url_noticia: str) -> Dict[str, str]:
         try:
             logger.info(f"Extraindo dados da notícia: {url_noticia}")
-            response = requests.get(url_noticia, headers=self.headers, timeout=15)
+            response = self._get(url_noticia, timeout=15)
             soup_noticia = self._processar_pagina_com_encoding_correto(response)
             
-            resumo = self._extrair_resumo(soup_noticia)
-            imagem_url = self._extrair_imagem(soup_noticia)
+            site = self.get_site_name()
+            with medir('summary_extract', site):
+                resumo = self._extrair_resumo(soup_noticia)
+            with medir('image_extract', site):
+                imagem_url = self._extrair_imagem(soup_noticia)
             
-            return {
+            # O texto completo vai comprimido para o disco; na memória fica só o resumo
+            if settings.CONTEUDO_COMPLETO_ENABLED:
+                with medir('body_extract', site):
+                    corpo = self._extrair_corpo(soup_noticia)
+                if corpo:
+                    conteudo_store.gravar(url_noticia, corpo)
+            
+            dados = {
                 'resumo': resumo if resumo else "Resumo não disponível",
                 'imagem': imagem_url if imagem_url else "Imagem não disponível"
             }
             
+            # A verificação da imagem pode ter sido cortada pelo prazo: a notícia
+            # é aproveitada, mas não deve ser lembrada como completa
+            deadline = deadline_atual()
+            if deadline is not None and deadline.esgotado:
+                dados['erro'] = "prazo da requisição esgotado"
+            
+            return dados
+            
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Erro ao extrair dados da notícia {url_noticia}: {str(e)}")
             return {
                 'resumo': f"Erro ao extrair resumo: {str(e)}",
-                'imagem': "Imagem não disponível"
+                'imagem': "Imagem não disponível",
+                'erro': str(e)
             }
\ No newline at end of file
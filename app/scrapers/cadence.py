@@ -0,0 +1,96 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+from .datas import DATA_MINIMA
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HORAS_SEMANA = 7 * 24
+# Descobertas "virtuais" por hora, para não zerar horários ainda não observados
+DESCOBERTAS_A_PRIORI = 0.1
+
+
+def _hora_da_semana(momento: datetime) -> int:
+    return momento.weekday() * 24 + momento.hour
+
+
+class PublicationCadence:
+
+    def __init__(self, site_nome: str):
+        self.site_nome = site_nome
+        self.intervalo_medio_horas: Optional[float] = None
+        # Novas notícias descobertas por hora da semana, com decaimento para
+        # acompanhar mudanças de rotina do site
+        self.descobertas = [0.0] * HORAS_SEMANA
+        self._lock = threading.Lock()
+
+    def registrar_datas(self, datas: List[datetime]) -> None:
+        datas = sorted({data for data in datas if data and data != DATA_MINIMA})
+        if len(datas) < settings.CACHE_CADENCE_MIN_ITEMS:
+            return
+
+        # As datas das origens têm granularidade de dia: o intervalo médio entre
+        # publicações vem da extensão coberta pelas notícias conhecidas
+        extensao_horas = max((datas[-1] - datas[0]).total_seconds() / 3600, 24.0)
+        with self._lock:
+            self.intervalo_medio_horas = extensao_horas / (len(datas) - 1)
+
+    def registrar_descobertas(self, quantidade: int, quando: Optional[datetime] = None) -> None:
+        if quantidade <= 0:
+            return
+
+        hora = _hora_da_semana(quando or datetime.now())
+        with self._lock:
+            self.descobertas = [contagem * settings.CACHE_CADENCE_DECAY for contagem in self.descobertas]
+            self.descobertas[hora] += quantidade
+
+    def _taxa_por_hora(self, hora: int) -> Optional[float]:
+        if self.intervalo_medio_horas is None:
+            return None
+
+        # Peso da hora frente a uma distribuição uniforme
+        total = sum(self.descobertas) + DESCOBERTAS_A_PRIORI * HORAS_SEMANA
+        peso = (self.descobertas[hora] + DESCOBERTAS_A_PRIORI) / total * HORAS_SEMANA
+        return peso / self.intervalo_medio_horas
+
+    def janela_frescor(self, agora: Optional[datetime] = None) -> float:
+        agora = agora or datetime.now()
+        minimo = settings.CACHE_TTL_MIN_SECONDS
+        maximo = settings.CACHE_TTL_MAX_SECONDS
+
+        with self._lock:
+            if self._taxa_por_hora(0) is None:
+                return float(settings.CACHE_TTL_SECONDS)
+
+            # Avança hora a hora somando as publicações esperadas até atingir a
+            # fração configurada: madrugadas e fins de semana quietos rendem
+            # janelas longas, sem atravessar o próximo horário movimentado
+            alvo = settings.CACHE_CADENCE_EXPECTED_ITEMS
+            esperadas = 0.0
+            segundos = 0.0
+            momento = agora
+            while segundos < maximo:
+                fim_da_hora = momento.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+                duracao = (fim_da_hora - momento).total_seconds()
+                taxa = self._taxa_por_hora(_hora_da_semana(momento)) / 3600
+                if esperadas + taxa * duracao >= alvo:
+                    segundos += (alvo - esperadas) / taxa
+                    break
+                esperadas += taxa * duracao
+                segundos += duracao
+                momento = fim_da_hora
+
+        return max(minimo, min(maximo, segundos))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            intervalo = self.intervalo_medio_horas
+            descobertas = round(sum(self.descobertas), 1)
+        return {
+            "intervalo_medio_horas": round(intervalo, 2) if intervalo is not None else None,
+            "descobertas_recentes": descobertas,
+            "janela_frescor_segundos": round(self.janela_frescor())
+        }
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+import logging
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+
+class Cassette:
+
+    MODOS = ("live", "record", "replay")
+
+    def __init__(self, diretorio: str, modo: str = "live", latencia_replay_ms: float = 0.0):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo HTTP inválido: '{modo}' (use {', '.join(self.MODOS)})")
+
+        self.diretorio = Path(diretorio)
+        self.modo = modo
+        self.latencia_replay_ms = latencia_replay_ms
+        self.stats = {"gravadas": 0, "reproduzidas": 0, "ausentes": 0}
+        self._lock = threading.Lock()
+
+        if modo != "live":
+            logger.info(f"Cassette HTTP em modo {modo}: {self.diretorio.resolve()}")
+
+    @property
+    def gravando(self) -> bool:
+        return self.modo == "record"
+
+    @property
+    def reproduzindo(self) -> bool:
+        return self.modo == "replay"
+
+    def _chave(self, metodo: str, url: str) -> str:
+        return hashlib.sha1(f"{metodo.upper()} {url}".encode("utf-8")).hexdigest()
+
+    def gravar(self, metodo: str, url: str, response: requests.Response, duracao: float) -> None:
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        chave = self._chave(metodo, url)
+
+        metadados = {
+            "metodo": metodo.upper(),
+            "url": url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "duracao_ms": round(duracao * 1000, 2),
+            "gravado_em": time.time()
+        }
+
+        (self.diretorio / f"{chave}.body").write_bytes(response.content or b"")
+        (self.diretorio / f"{chave}.json").write_text(
+            json.dumps(metadados, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        with self._lock:
+            self.stats["gravadas"] += 1
+
+    def reproduzir(self, metodo: str, url: str) -> requests.Response:
+        chave = self._chave(metodo, url)
+        arquivo_meta = self.diretorio / f"{chave}.json"
+
+        if not arquivo_meta.exists():
+            with self._lock:
+                self.stats["ausentes"] += 1
+            raise requests.ConnectionError(f"Resposta não gravada no cassette: {metodo.upper()} {url}")
+
+        metadados = json.loads(arquivo_meta.read_text(encoding="utf-8"))
+
+        if self.latencia_replay_ms > 0:
+            time.sleep(self.latencia_replay_ms / 1000)
+
+        response = requests.Response()
+        response.status_code = metadados["status_code"]
+        response.headers = CaseInsensitiveDict(metadados["headers"])
+        response.encoding = metadados.get("encoding")
+        response.url = url
+        response._content = (self.diretorio / f"{chave}.body").read_bytes()
+
+        with self._lock:
+            self.stats["reproduzidas"] += 1
+        return response
+
+    def get_stats(self) -> Optional[dict]:
+        if self.modo == "live":
+            return None
+        return {"modo": self.modo, "diretorio": str(self.diretorio), **self.stats}
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Dict
+import logging
+
+import requests
+
+from .politeness import host_da_url
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+
+class CircuitBreaker:
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, host: str, limite_falhas: int, limite_lentidao: float,
+                 tempo_aberto: float, tempo_aberto_max: float):
+        self.host = host
+        self.limite_falhas = limite_falhas
+        self.limite_lentidao = limite_lentidao
+        self.tempo_aberto_base = tempo_aberto
+        self.tempo_aberto_max = tempo_aberto_max
+
+        self.estado = self.FECHADO
+        self.falhas_consecutivas = 0
+        self.tempo_aberto = tempo_aberto
+        self.aberto_ate = 0.0
+        self.sonda_em_andamento = False
+        self.stats = {"aberturas": 0, "rejeitadas": 0, "falhas": 0, "lentas": 0}
+        self._lock = threading.Lock()
+
+    def permitir(self) -> bool:
+        with self._lock:
+            if self.estado == self.FECHADO:
+                return True
+
+            agora = time.monotonic()
+            if self.estado == self.ABERTO and agora >= self.aberto_ate:
+                self.estado = self.MEIO_ABERTO
+                self.sonda_em_andamento = False
+                logger.info(f"Circuit breaker {self.host}: meio aberto, enviando sonda")
+
+            # Meio aberto: apenas uma requisição de sonda por vez
+            if self.estado == self.MEIO_ABERTO and not self.sonda_em_andamento:
+                self.sonda_em_andamento = True
+                return True
+
+            self.stats["rejeitadas"] += 1
+            return False
+
+    def registrar_resultado(self, sucesso: bool, duracao: float) -> None:
+        lenta = duracao >= self.limite_lentidao
+
+        with self._lock:
+            if lenta:
+                self.stats["lentas"] += 1
+
+            if sucesso and not lenta:
+                if self.estado != self.FECHADO:
+                    logger.info(f"Circuit breaker {self.host}: sonda bem-sucedida, circuito fechado")
+                self.estado = self.FECHADO
+                self.falhas_consecutivas = 0
+                self.tempo_aberto = self.tempo_aberto_base
+                self.sonda_em_andamento = False
+                return
+
+            self.stats["falhas"] += 1
+            self.falhas_consecutivas += 1
+
+            if self.estado == self.MEIO_ABERTO:
+                # A sonda falhou: reabre com espera maior, até o máximo configurado
+                self.tempo_aberto = min(self.tempo_aberto * 2, self.tempo_aberto_max)
+                self._abrir()
+            elif self.estado == self.FECHADO and self.falhas_consecutivas >= self.limite_falhas:
+                self._abrir()
+
+    def descartar(self) -> None:
+        # A chamada foi abandonada por motivo alheio à origem (prazo da requisição)
+        with self._lock:
+            self.sonda_em_andamento = False
+
+    def _abrir(self) -> None:
+        self.estado = self.ABERTO
+        self.aberto_ate = time.monotonic() + self.tempo_aberto
+        self.sonda_em_andamento = False
+        self.stats["aberturas"] += 1
+        logger.warning(
+            f"Circuit breaker {self.host}: ABERTO por {self.tempo_aberto:.0f}s "
+            f"após {self.falhas_consecutivas} falhas/lentidões consecutivas"
+        )
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "estado": self.estado,
+                "falhas_consecutivas": self.falhas_consecutivas,
+                "reabre_em_segundos": round(max(0.0, self.aberto_ate - time.monotonic()), 1) if self.estado == self.ABERTO else 0,
+                **self.stats
+            }
+
+
+class CircuitBreakerRegistry:
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = host_da_url(url)
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    limite_falhas=settings.SCRAPER_CIRCUIT_FAILURE_THRESHOLD,
+                    limite_lentidao=settings.SCRAPER_CIRCUIT_SLOW_CALL_SECONDS,
+                    tempo_aberto=settings.SCRAPER_CIRCUIT_OPEN_SECONDS,
+                    tempo_aberto_max=settings.SCRAPER_CIRCUIT_MAX_OPEN_SECONDS
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def get_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.host: breaker.get_stats() for breaker in breakers}
+
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+from .noticia import id_da_noticia
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ConteudoStore:
+
+    # Texto completo das notícias em disco, comprimido com zlib: a memória fica
+    # só com os resumos e o corpo é descomprimido quando alguém o pede
+
+    def __init__(self, diretorio: str, nivel_compressao: int = 6, max_arquivos: int = 2000):
+        self.diretorio = Path(diretorio)
+        self.nivel_compressao = nivel_compressao
+        self.max_arquivos = max_arquivos
+        # Arquivos em disco, contados na primeira gravação
+        self._total: Optional[int] = None
+        self.stats = {
+            "gravados": 0, "lidos": 0, "ausentes": 0, "removidos_por_limite": 0,
+            "bytes_originais": 0, "bytes_comprimidos": 0
+        }
+        self._lock = threading.Lock()
+
+    def _arquivo(self, noticia_id: str) -> Path:
+        return self.diretorio / f"{noticia_id}.z"
+
+    def gravar(self, link: str, corpo: str) -> str:
+        noticia_id = id_da_noticia(link)
+        original = json.dumps(
+            {"link": link, "corpo": corpo, "gravado_em": time.time()}, ensure_ascii=False
+        ).encode("utf-8")
+        comprimido = zlib.compress(original, self.nivel_compressao)
+
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        # Escrita atômica: uma leitura concorrente nunca vê o arquivo pela metade
+        temporario = self.diretorio / f"{noticia_id}.{threading.get_ident()}.tmp"
+        temporario.write_bytes(comprimido)
+        arquivo = self._arquivo(noticia_id)
+        novo = not arquivo.exists()
+        os.replace(temporario, arquivo)
+
+        with self._lock:
+            self.stats["gravados"] += 1
+            self.stats["bytes_originais"] += len(original)
+            self.stats["bytes_comprimidos"] += len(comprimido)
+            if self._total is None:
+                self._total = sum(1 for _ in self.diretorio.glob("*.z"))
+            elif novo:
+                self._total += 1
+            if self._total > self.max_arquivos:
+                self._podar()
+        return noticia_id
+
+    def _podar(self) -> None:
+        # Chamado com o lock: remove os gravados há mais tempo até 90% do limite,
+        # para não listar o diretório a cada nova gravação
+        arquivos = sorted(self.diretorio.glob("*.z"), key=lambda arquivo: arquivo.stat().st_mtime)
+        excesso = len(arquivos) - int(self.max_arquivos * 0.9)
+        for arquivo in arquivos[:max(excesso, 0)]:
+            arquivo.unlink(missing_ok=True)
+            self.stats["removidos_por_limite"] += 1
+        self._total = len(arquivos) - max(excesso, 0)
+        logger.info(f"Conteúdos em disco podados: {max(excesso, 0)} removidos, {self._total} mantidos")
+
+    def ler(self, noticia_id: str) -> Optional[Dict]:
+        if not noticia_id.isalnum():
+            return None
+        try:
+            comprimido = self._arquivo(noticia_id).read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.stats["ausentes"] += 1
+            return None
+
+        dados = json.loads(zlib.decompress(comprimido))
+        with self._lock:
+            self.stats["lidos"] += 1
+        dados["tamanho_comprimido"] = len(comprimido)
+        return dados
+
+    def remover(self, link: str) -> bool:
+        try:
+            self._arquivo(id_da_noticia(link)).unlink()
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            if self._total:
+                self._total -= 1
+        return True
+
+    def limpar(self) -> int:
+        removidos = 0
+        with self._lock:
+            for arquivo in self.diretorio.glob("*.z"):
+                arquivo.unlink(missing_ok=True)
+                removidos += 1
+            self._total = None
+        return removidos
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        originais = stats["bytes_originais"]
+        return {
+            "habilitado": settings.CONTEUDO_COMPLETO_ENABLED,
+            "diretorio": str(self.diretorio),
+            "arquivos": self._total,
+            "max_arquivos": self.max_arquivos,
+            "taxa_compressao": round(stats["bytes_comprimidos"] / originais, 3) if originais else None,
+            **stats
+        }
+
+
+conteudo_store = ConteudoStore(settings.CONTEUDO_DIR, settings.CONTEUDO_NIVEL_COMPRESSAO, settings.CONTEUDO_MAX_ARQUIVOS)
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+from .datas import DATA_MINIMA
+from .noticia import Noticia
+
+logger = logging.getLogger(__name__)
+
+
+class SiteCrawlState:
+
+    def __init__(self, site_nome: str, max_noticias: int):
+        self.site_nome = site_nome
+        self.max_noticias = max_noticias
+        self._noticias: "OrderedDict[str, Noticia]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def conhece(self, href: str) -> bool:
+        return href in self._noticias
+
+    def total(self) -> int:
+        return len(self._noticias)
+
+    def registrar(self, noticias: List[Noticia]) -> None:
+        with self._lock:
+            for noticia in noticias:
+                self._noticias[noticia.href] = noticia.copiar()
+
+            if len(self._noticias) > self.max_noticias:
+                ordenadas = sorted(
+                    self._noticias.items(),
+                    key=lambda item: item[1].data_obj or DATA_MINIMA,
+                    reverse=True
+                )
+                self._noticias = OrderedDict(ordenadas[:self.max_noticias])
+
+        logger.info(f"{self.site_nome.upper()} - Estado do crawl: {len(self._noticias)} notícias conhecidas")
+
+    def datas(self) -> List[datetime]:
+        with self._lock:
+            return [noticia.data_obj for noticia in self._noticias.values()]
+
+    def noticias_conhecidas(self) -> List[Noticia]:
+        with self._lock:
+            return [noticia.copiar() for noticia in self._noticias.values()]
+
+    def por_link(self, link: str) -> Optional[Noticia]:
+        with self._lock:
+            noticia = next((noticia for noticia in self._noticias.values() if noticia.link == link), None)
+            return noticia.copiar() if noticia is not None else None
+
+    def esquecer_link(self, link: str) -> bool:
+        with self._lock:
+            href = next((href for href, noticia in self._noticias.items() if noticia.link == link), None)
+            if href is None:
+                return False
+            del self._noticias[href]
+            return True
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._noticias.clear()
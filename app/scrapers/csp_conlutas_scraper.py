@@ -1,8 +1,6 @@
 from .base_scraper import BaseScraper
-import requests
 from bs4 import BeautifulSoup
 import re
-from datetime import datetime
 from typing import List
 import html
 import logging
@@ -12,6 +10,14 @@ logger = logging.getLogger(__name__)
 
 class CSPConlutasScraper(BaseScraper):
     
+    SELETORES_CORPO = [
+        '.post-content',
+        'div.article-content',
+        'div.content',
+        'article',
+        'main'
+    ]
+    
     def __init__(self):
         super().__init__(
             base_url='https://cspconlutas.org.br',
@@ -27,6 +33,9 @@ class CSPConlutasScraper(BaseScraper):
     def get_site_name(self) -> str:
         return "CSP-Conlutas"
     
+    def _paragrafo_do_corpo(self, texto: str) -> bool:
+        return super()._paragrafo_do_corpo(texto) and not texto.startswith('Publicado em')
+    
     def _extrair_links_noticias(self, soup: BeautifulSoup) -> List:
         return soup.find_all('a', href=re.compile(r'/noticias/n/\d+/'))
     
@@ -67,19 +76,6 @@ class CSPConlutasScraper(BaseScraper):
                 if match_num:
                     data = self._converter_data_formato(match_num.group(1))
         
-        if data == 'Data não encontrada':
-            data = datetime.now().strftime('%d de %B de %Y')
-            meses_pt = {
-                'January': 'janeiro', 'February': 'fevereiro', 'March': 'março',
-                'April': 'abril', 'May': 'maio', 'June': 'junho',
-                'July': 'julho', 'August': 'agosto', 'September': 'setembro',
-                'October': 'outubro', 'November': 'novembro', 'December': 'dezembro'
-            }
-            for en, pt in meses_pt.items():
-                if en in data:
-                    data = data.replace(en, pt)
-                    break
-        
         return categoria, data
     
     def _converter_data_formato(self, data_str: str) -> str:
@@ -0,0 +1,89 @@
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# As duas origens publicam no horário de Brasília, que não tem horário de verão
+# desde 2019: um deslocamento fixo dispensa a base de fusos do sistema
+FUSO_ORIGENS = timezone(timedelta(hours=-3), "BRT")
+
+# Sentinela para ordenação de notícias sem data, comparável com as datas com fuso
+DATA_MINIMA = datetime.min.replace(tzinfo=timezone.utc)
+
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12
+}
+NOMES_MESES = (
+    'janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+    'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'
+)
+
+# Formatos aceitos, na ordem de tentativa: (padrão, grupos de dia, mês e ano)
+FORMATOS = (
+    (re.compile(r'(\d{1,2})\s+de\s+([a-zç]+)\.?\s+de\s+(\d{4})'), (1, 2, 3)),
+    (re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'), (1, 2, 3)),
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), (3, 2, 1)),
+)
+
+# As origens só informam o dia: a notícia é posicionada ao meio-dia local
+HORA_PADRAO = 12
+
+
+def _mes(valor: str) -> Optional[int]:
+    if valor.isdigit():
+        return int(valor)
+    return MESES.get(valor)
+
+
+@lru_cache(maxsize=4096)
+def parse_data(texto: str) -> Optional[datetime]:
+    # Memoizada: as mesmas poucas datas se repetem em todas as listagens
+    if not texto:
+        return None
+    texto = texto.lower()
+    for padrao, (grupo_dia, grupo_mes, grupo_ano) in FORMATOS:
+        match = padrao.search(texto)
+        if not match:
+            continue
+        mes = _mes(match.group(grupo_mes))
+        if mes is None:
+            continue
+        try:
+            return datetime(
+                int(match.group(grupo_ano)), mes, int(match.group(grupo_dia)), HORA_PADRAO, tzinfo=FUSO_ORIGENS
+            )
+        except ValueError:
+            continue
+    return None
+
+
+def agora() -> datetime:
+    return datetime.now(FUSO_ORIGENS)
+
+
+def formatar_data(data: datetime) -> str:
+    return f"{data.day:02d} de {NOMES_MESES[data.month - 1]} de {data.year}"
+
+
+def normalizar_data(texto: str) -> Tuple[str, datetime]:
+    # Única conversão de uma data raspada: o texto exibido e o datetime com fuso
+    # que ordenação, filtros, RSS e JSON usam dali em diante. Sem data na origem,
+    # vale o momento da coleta.
+    data = parse_data(texto)
+    if data is None:
+        data = agora()
+        texto = formatar_data(data)
+    return texto, data
+
+
+def formatar_rfc2822(data: datetime) -> str:
+    return format_datetime(data)
+
+
+def com_fuso(data: datetime) -> datetime:
+    # Datas gravadas antes da normalização não têm fuso
+    return data if data.tzinfo else data.replace(tzinfo=FUSO_ORIGENS)
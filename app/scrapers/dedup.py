@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Set
+import logging
+
+from .datas import DATA_MINIMA, com_fuso
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PALAVRAS_VAZIAS = frozenset({
+    "a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "no", "na", "nos", "nas",
+    "para", "por", "com", "um", "uma", "que", "se", "ao", "aos"
+})
+# Nomes dos sites e siglas de entidades sindicais: cada site assina a mesma
+# notícia com o próprio nome ("ANDES-SN cobra..." / "CSP-Conlutas cobra...")
+ENTIDADES = frozenset({
+    "andes", "sn", "csp", "conlutas", "sinasefe", "fasubra", "cnte", "fenasps", "condsef", "cut", "une"
+})
+BITS = 64
+# Radical das palavras: flexões ("mobilização"/"mobilizações") contam como a mesma
+TAMANHO_RADICAL = 5
+
+
+def normalizar_titulo(titulo: str) -> str:
+    texto = unicodedata.normalize("NFKD", titulo.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(
+        palavra for palavra in re.findall(r"[a-z0-9]+", texto)
+        if palavra not in PALAVRAS_VAZIAS and palavra not in ENTIDADES
+    )
+
+
+def simhash(titulo: str) -> int:
+    # Trigramas de caracteres: títulos são curtos e variam em flexões e
+    # preposições, que mudam palavras inteiras mas poucos trigramas
+    texto = normalizar_titulo(titulo)
+    pesos = [0] * BITS
+    for i in range(max(len(texto) - 2, 1)):
+        h = int.from_bytes(hashlib.blake2b(texto[i:i + 3].encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            pesos[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(BITS) if pesos[bit] > 0)
+
+
+def _radicais(titulo: str) -> Set[str]:
+    return {palavra[:TAMANHO_RADICAL] for palavra in normalizar_titulo(titulo).split()}
+
+
+def sobreposicao(titulo: str, outro: str) -> float:
+    # Fração das palavras do título mais curto presentes no outro: uma reescrita
+    # acrescenta palavras ("Plenária nacional define..."), uma notícia diferente
+    # no mesmo molde troca a palavra que importa ("UFF" por "UnB")
+    radicais, outros = _radicais(titulo), _radicais(outro)
+    if not radicais or not outros:
+        return 0.0
+    return len(radicais & outros) / min(len(radicais), len(outros))
+
+
+class IndiceDuplicatas:
+
+    # Impressões digitais (SimHash) dos títulos, por link, das notícias que de
+    # fato entraram no estado de algum site. Uma notícia de outro site com título
+    # e data próximos é a mesma história: não é enriquecida e não ocupa espaço
+    # na resposta, porque a original já está sendo servida.
+
+    # Índices de versões anteriores são descartados: a 1 registrava originais
+    # antes da seleção e a 2 calculava o SimHash com os nomes das entidades
+    VERSAO = 3
+
+    def __init__(self, caminho: Optional[str], max_entradas: int, max_distancia: int, janela_dias: int,
+                 min_sobreposicao: float = 0.0):
+        self.caminho = Path(caminho) if caminho else None
+        self.max_entradas = max_entradas
+        self.max_distancia = max_distancia
+        self.min_sobreposicao = min_sobreposicao
+        self.janela = timedelta(days=janela_dias)
+        self._originais: "OrderedDict[str, Dict]" = OrderedDict()
+        self._duplicatas: "OrderedDict[str, str]" = OrderedDict()
+        self._alterado = False
+        self._lock = threading.Lock()
+        self.stats = {"verificadas": 0, "duplicatas": 0}
+        self._carregar()
+
+    def _carregar(self) -> None:
+        if self.caminho is None or not self.caminho.exists():
+            return
+        try:
+            dados = json.loads(self.caminho.read_text(encoding="utf-8"))
+            if dados.get("versao") != self.VERSAO:
+                logger.warning(f"Índice de duplicatas de versão anterior ignorado ({self.caminho})")
+                return
+            self._originais = OrderedDict(dados.get("originais", {}))
+            self._duplicatas = OrderedDict(dados.get("duplicatas", {}))
+            logger.info(f"Índice de duplicatas carregado: {len(self._originais)} títulos")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Índice de duplicatas ignorado ({self.caminho}): {str(e)}")
+
+    def salvar(self) -> None:
+        if self.caminho is None:
+            return
+        with self._lock:
+            if not self._alterado:
+                return
+            conteudo = json.dumps(
+                {"versao": self.VERSAO, "originais": self._originais, "duplicatas": self._duplicatas},
+                ensure_ascii=False
+            )
+            self._alterado = False
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_suffix(f".{threading.get_ident()}.tmp")
+        temporario.write_text(conteudo, encoding="utf-8")
+        os.replace(temporario, self.caminho)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._originais.clear()
+            self._duplicatas.clear()
+            self._alterado = True
+
+    def e_duplicata(self, link: str) -> bool:
+        with self._lock:
+            return link in self._duplicatas
+
+    def _datas_proximas(self, data: Optional[datetime], outra: Optional[str]) -> bool:
+        if not data or data == DATA_MINIMA or not outra:
+            return True
+        return abs(data - com_fuso(datetime.fromisoformat(outra))) <= self.janela
+
+    def duplicata_de(self, titulo: str, site: str, link: str, data: Optional[datetime]) -> Optional[Dict]:
+        # Devolve a original de outro site de que a notícia é duplicata, se houver
+        impressao = simhash(titulo)
+        with self._lock:
+            self.stats["verificadas"] += 1
+            if link in self._originais:
+                return None
+
+            for link_original, original in self._originais.items():
+                if (original["site"] != site
+                        and (impressao ^ original["simhash"]).bit_count() <= self.max_distancia
+                        and sobreposicao(titulo, original["titulo"]) >= self.min_sobreposicao
+                        and self._datas_proximas(data, original["data"])):
+                    self._duplicatas[link] = link_original
+                    while len(self._duplicatas) > self.max_entradas:
+                        self._duplicatas.popitem(last=False)
+                    self.stats["duplicatas"] += 1
+                    self._alterado = True
+                    return {"link": link_original, **original}
+            return None
+
+    def registrar_original(self, titulo: str, site: str, link: str, data: Optional[datetime]) -> None:
+        # Só notícias que entraram no estado: uma original que não chega à
+        # resposta levaria junto as cópias dos outros sites
+        with self._lock:
+            if link in self._originais:
+                return
+            self._originais[link] = {
+                "simhash": simhash(titulo),
+                "site": site,
+                "titulo": titulo,
+                "data": data.isoformat() if data and data != DATA_MINIMA else None
+            }
+            while len(self._originais) > self.max_entradas:
+                self._originais.popitem(last=False)
+            self._alterado = True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "habilitado": settings.DUPLICATAS_ENABLED,
+                "titulos_indexados": len(self._originais),
+                "duplicatas_conhecidas": len(self._duplicatas),
+                **self.stats
+            }
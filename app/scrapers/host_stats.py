@@ -0,0 +1,130 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from .politeness import host_da_url
+from ..core.config import settings
+
+
+class HostLatency:
+
+    def __init__(self, janela: int, min_amostras: int):
+        self.min_amostras = min_amostras
+        self._amostras = deque(maxlen=janela)
+        self._lock = threading.Lock()
+
+    def registrar(self, duracao: float) -> None:
+        with self._lock:
+            self._amostras.append(duracao)
+
+    def percentil(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self._amostras) < self.min_amostras:
+                return None
+            ordenadas = sorted(self._amostras)
+
+        indice = max(0, math.ceil(p / 100 * len(ordenadas)) - 1)
+        return ordenadas[indice]
+
+    def timeout(self, timeout_padrao: float) -> float:
+        # Sem amostras suficientes vale o timeout do chamador, que também é o teto
+        p99 = self.percentil(99)
+        if p99 is None:
+            return timeout_padrao
+        adaptativo = p99 * settings.SCRAPER_TIMEOUT_P99_MULTIPLIER
+        return min(timeout_padrao, max(settings.SCRAPER_TIMEOUT_MIN_SECONDS, adaptativo))
+
+    def total(self) -> int:
+        with self._lock:
+            return len(self._amostras)
+
+
+class RetryBudget:
+
+    def __init__(self, proporcao: float, saldo_maximo: float):
+        # Cada requisição original deposita uma fração de token; retentativas e
+        # hedges gastam um token inteiro, limitando o tráfego extra à proporção
+        self.proporcao = proporcao
+        self.saldo_maximo = saldo_maximo
+        self.saldo = saldo_maximo
+        self.stats = {"retentativas": 0, "hedges": 0, "hedges_vencedores": 0, "negadas": 0}
+        self._lock = threading.Lock()
+
+    def depositar(self) -> None:
+        with self._lock:
+            self.saldo = min(self.saldo_maximo, self.saldo + self.proporcao)
+
+    def retirar(self, tipo: str) -> bool:
+        with self._lock:
+            if self.saldo < 1:
+                self.stats["negadas"] += 1
+                return False
+            self.saldo -= 1
+            self.stats[tipo] += 1
+            return True
+
+    def devolver(self, tipo: str) -> None:
+        with self._lock:
+            self.saldo = min(self.saldo_maximo, self.saldo + 1)
+            self.stats[tipo] -= 1
+
+    def registrar_hedge_vencedor(self) -> None:
+        with self._lock:
+            self.stats["hedges_vencedores"] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"saldo_retentativas": round(self.saldo, 2), **self.stats}
+
+
+class HostStatsRegistry:
+
+    def __init__(self):
+        self._latencias: Dict[str, HostLatency] = {}
+        self._orcamentos: Dict[str, RetryBudget] = {}
+        self._lock = threading.Lock()
+
+    def latencia(self, url: str) -> HostLatency:
+        host = host_da_url(url)
+        with self._lock:
+            latencia = self._latencias.get(host)
+            if latencia is None:
+                latencia = HostLatency(settings.SCRAPER_LATENCY_WINDOW, settings.SCRAPER_LATENCY_MIN_SAMPLES)
+                self._latencias[host] = latencia
+            return latencia
+
+    def orcamento(self, url: str) -> RetryBudget:
+        host = host_da_url(url)
+        with self._lock:
+            orcamento = self._orcamentos.get(host)
+            if orcamento is None:
+                orcamento = RetryBudget(settings.SCRAPER_RETRY_BUDGET_RATIO, settings.SCRAPER_RETRY_BUDGET_MAX_TOKENS)
+                self._orcamentos[host] = orcamento
+            return orcamento
+
+    def get_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            hosts = set(self._latencias) | set(self._orcamentos)
+            latencias = dict(self._latencias)
+            orcamentos = dict(self._orcamentos)
+
+        stats = {}
+        for host in sorted(hosts):
+            dados = {}
+            latencia = latencias.get(host)
+            if latencia is not None:
+                percentis = {f"p{p}_ms": latencia.percentil(p) for p in (50, 95, 99)}
+                dados["amostras"] = latencia.total()
+                dados.update({
+                    chave: round(valor * 1000, 1) if valor is not None else None
+                    for chave, valor in percentis.items()
+                })
+            orcamento = orcamentos.get(host)
+            if orcamento is not None:
+                dados.update(orcamento.get_stats())
+            stats[host] = dados
+        return stats
+
+
+host_stats = HostStatsRegistry()
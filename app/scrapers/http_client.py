@@ -0,0 +1,202 @@
+import random
+import threading
+import time
+import requests
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+from .cassette import Cassette
+from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError, circuit_breakers
+from .host_stats import HostStatsRegistry, RetryBudget, host_stats
+from .politeness import PolitenessScheduler, host_da_url, politeness_scheduler
+from ..core.config import settings
+from ..core.deadline import DeadlineExceeded, deadline_atual, marcar_esgotado, timeout_restante
+from ..core.metrics import origin_retries
+from ..core.timing import submit_com_contexto
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+
+    STATUS_COM_RETRY_AFTER = (429, 503)
+    STATUS_RETENTAVEIS = (502, 503, 504)
+
+    def __init__(self, scheduler: PolitenessScheduler, cassette: Cassette, breakers: CircuitBreakerRegistry,
+                 stats: HostStatsRegistry):
+        self.scheduler = scheduler
+        self.cassette = cassette
+        self.breakers = breakers
+        self.stats = stats
+        self._executor_hedge = ThreadPoolExecutor(
+            max_workers=settings.SCRAPER_HEDGE_WORKERS or self.workers_hedge_padrao(),
+            thread_name_prefix="hedge"
+        )
+
+    @staticmethod
+    def workers_hedge_padrao() -> int:
+        # Cada thread que chama get() ocupa até dois workers (primário e hedge):
+        # com menos, GETs esperam na fila do pool
+        chamadores = (settings.LISTING_PREFETCH_CONCURRENCY + settings.SCRAPER_ARTICLE_WORKERS
+                      + settings.SCRAPER_SITE_WORKERS + settings.DETALHES_WORKERS + 1)
+        return 2 * chamadores
+
+    def get(self, url: str, headers: dict, timeout: float) -> requests.Response:
+        return self._com_retentativas('GET', url, headers, timeout)
+
+    def head(self, url: str, headers: dict, timeout: float) -> requests.Response:
+        return self._com_retentativas('HEAD', url, headers, timeout)
+
+    def _com_retentativas(self, method: str, url: str, headers: dict, timeout: float) -> requests.Response:
+        # Em replay nada sai para a rede: sem politeness, retentativas ou hedges
+        if self.cassette.reproduzindo:
+            timeout_restante(timeout)
+            return self.cassette.reproduzir(method, url)
+
+        timeout = self.stats.latencia(url).timeout(timeout)
+        orcamento = self.stats.orcamento(url)
+        orcamento.depositar()
+
+        tentativa = 0
+        while True:
+            erro = None
+            try:
+                response = self._tentar(method, url, headers, timeout, orcamento)
+                # Com Retry-After a pausa do host fica a cargo da politeness
+                if response.status_code not in self.STATUS_RETENTAVEIS or response.headers.get('Retry-After'):
+                    return response
+            except (CircuitOpenError, DeadlineExceeded):
+                raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                erro = e
+
+            if not self._aguardar_retentativa(url, tentativa, orcamento):
+                if erro is not None:
+                    raise erro
+                return response
+
+            tentativa += 1
+            logger.info(f"Retentativa {tentativa} de {method} {url} ({erro or response.status_code})")
+
+    def _aguardar_retentativa(self, url: str, tentativa: int, orcamento: RetryBudget) -> bool:
+        if tentativa >= settings.SCRAPER_RETRY_MAX_ATTEMPTS:
+            return False
+
+        # Backoff exponencial com jitter completo
+        teto = min(settings.SCRAPER_RETRY_BACKOFF_MAX_SECONDS, settings.SCRAPER_RETRY_BACKOFF_BASE_SECONDS * 2 ** tentativa)
+        espera = random.uniform(0, teto)
+
+        deadline = deadline_atual()
+        if deadline is not None and deadline.restante() <= espera:
+            return False
+        if not orcamento.retirar("retentativas"):
+            return False
+
+        origin_retries.inc(host=host_da_url(url), kind="retry")
+        time.sleep(espera)
+        return True
+
+    def _tentar(self, method: str, url: str, headers: dict, timeout: float, orcamento: RetryBudget) -> requests.Response:
+        if not settings.SCRAPER_HEDGE_ENABLED or method != 'GET':
+            return self._request(method, url, headers, timeout)
+
+        limiar = self.stats.latencia(url).percentil(settings.SCRAPER_HEDGE_PERCENTILE)
+        if limiar is None:
+            return self._request(method, url, headers, timeout)
+
+        # O limiar conta a partir do envio de fato: fila do pool e espera da
+        # politeness não são latência da origem e não disparam hedges
+        enviado = threading.Event()
+        primario = submit_com_contexto(self._executor_hedge, self._request, method, url, headers, timeout, False, enviado)
+        primario.add_done_callback(lambda _: enviado.set())
+        enviado.wait()
+        feitos, _ = wait([primario], timeout=limiar)
+        if feitos:
+            return primario.result()
+
+        # O hedge só sai se houver orçamento e um token de politeness livre agora
+        if not orcamento.retirar("hedges"):
+            return primario.result()
+        if not self.scheduler.tentar_reservar(url):
+            orcamento.devolver("hedges")
+            return primario.result()
+
+        origin_retries.inc(host=host_da_url(url), kind="hedge")
+        hedge = submit_com_contexto(self._executor_hedge, self._request, method, url, headers, timeout, True)
+
+        pendentes = {primario, hedge}
+        while True:
+            feitos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            vencedor = next((futuro for futuro in feitos if futuro.exception() is None), None)
+            if vencedor is not None:
+                if vencedor is hedge:
+                    orcamento.registrar_hedge_vencedor()
+                return vencedor.result()
+            if not pendentes:
+                return primario.result()
+
+    def _request(self, method: str, url: str, headers: dict, timeout: float,
+                 reservado: bool = False, enviado: Optional[threading.Event] = None) -> requests.Response:
+        timeout_restante(timeout)
+
+        breaker = self.breakers.breaker(url)
+        if not breaker.permitir():
+            raise CircuitOpenError(f"Circuito aberto para {breaker.host}: {method} {url}")
+
+        try:
+            if not reservado:
+                deadline = deadline_atual()
+                espera = self.scheduler.aguardar(url, espera_maxima=deadline.restante() if deadline else None)
+                if espera is None:
+                    marcar_esgotado()
+                    raise DeadlineExceeded(f"Prazo da requisição esgota antes da vez de {url} no rate limiting")
+            timeout_efetivo = timeout_restante(timeout)
+        except DeadlineExceeded:
+            breaker.descartar()
+            raise
+
+        latencia = self.stats.latencia(url)
+        if enviado is not None:
+            enviado.set()
+        inicio = time.perf_counter()
+        try:
+            response = requests.request(method, url, headers=headers, timeout=timeout_efetivo)
+        except requests.Timeout as e:
+            if timeout_efetivo < timeout:
+                # O timeout foi encurtado pelo prazo da requisição: não conta contra a origem
+                breaker.descartar()
+                marcar_esgotado()
+                raise DeadlineExceeded(f"Prazo da requisição esgotado aguardando {url}") from e
+            breaker.registrar_resultado(False, time.perf_counter() - inicio)
+            # O tempo até o timeout também é amostra: a cauda alimenta o próprio timeout
+            latencia.registrar(time.perf_counter() - inicio)
+            raise
+        except Exception:
+            breaker.registrar_resultado(False, time.perf_counter() - inicio)
+            raise
+
+        breaker.registrar_resultado(response.status_code < 500, time.perf_counter() - inicio)
+        latencia.registrar(time.perf_counter() - inicio)
+
+        if self.cassette.gravando:
+            self.cassette.gravar(method, url, response, time.perf_counter() - inicio)
+
+        if response.status_code in self.STATUS_COM_RETRY_AFTER:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                self.scheduler.registrar_retry_after(url, retry_after)
+
+        return response
+
+
+http_client = HttpClient(
+    politeness_scheduler,
+    Cassette(
+        settings.SCRAPER_CASSETTE_DIR,
+        modo=settings.SCRAPER_HTTP_MODE,
+        latencia_replay_ms=settings.SCRAPER_REPLAY_LATENCY_MS
+    ),
+    circuit_breakers,
+    host_stats
+)
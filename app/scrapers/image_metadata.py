@@ -0,0 +1,76 @@
+import mimetypes
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+import logging
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MetadadosImagem:
+
+    __slots__ = ('content_type', 'tamanho', 'etag', 'atualizado_em')
+
+    def __init__(self, content_type: str, tamanho: Optional[int], etag: Optional[str]):
+        self.content_type = content_type
+        self.tamanho = tamanho
+        self.etag = etag
+        self.atualizado_em = time.time()
+
+
+class ImageMetadataCache:
+
+    # Metadados das imagens vistos nos HEADs que os scrapers já fazem para validar
+    # as imagens; o RSS lê daqui o tipo e o tamanho do enclosure sem nova requisição
+
+    def __init__(self, max_entradas: int):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[str, MetadadosImagem]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"registradas": 0, "hits": 0, "misses": 0}
+
+    def registrar(self, url: str, headers) -> None:
+        content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        if not content_type.startswith('image/'):
+            return
+
+        try:
+            tamanho = int(headers.get('content-length'))
+        except (TypeError, ValueError):
+            tamanho = None
+
+        metadados = MetadadosImagem(content_type, tamanho, headers.get('etag'))
+        with self._lock:
+            self._entradas[url] = metadados
+            self._entradas.move_to_end(url)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+            self.stats["registradas"] += 1
+
+    def obter(self, url: str) -> Optional[MetadadosImagem]:
+        with self._lock:
+            metadados = self._entradas.get(url)
+            if metadados is None:
+                self.stats["misses"] += 1
+                return None
+            self._entradas.move_to_end(url)
+            self.stats["hits"] += 1
+            return metadados
+
+    def tipo_e_tamanho(self, url: str) -> tuple:
+        metadados = self.obter(url)
+        if metadados is not None:
+            return metadados.content_type, metadados.tamanho
+        # Sem HEAD registrado, o tipo sai da extensão
+        tipo, _ = mimetypes.guess_type(url.split('?')[0])
+        return (tipo if tipo and tipo.startswith('image/') else 'image/jpeg'), None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"entradas": len(self._entradas), "max_entradas": self.max_entradas, **self.stats}
+
+
+image_metadata_cache = ImageMetadataCache(settings.IMAGEM_METADATA_MAX_SIZE)
@@ -1,10 +1,20 @@
 from .andes_scraper import AndesScraper
 from .csp_conlutas_scraper import CSPConlutasScraper
-import requests
+from .cadence import PublicationCadence
+from .crawl_state import SiteCrawlState
+from .datas import DATA_MINIMA, normalizar_data, parse_data
+from .dedup import IndiceDuplicatas
+from .noticia import Noticia
+from ..core.config import settings
+from ..core.deadline import DeadlineExceeded
+from ..core.metrics import medir
+from ..core.timing import span, submit_com_contexto
 from bs4 import BeautifulSoup
-import time
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 from datetime import datetime
+import math
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,11 +27,43 @@ class MultiSiteScraper:
             'andes': AndesScraper(),
             'csp-conlutas': CSPConlutasScraper()
         }
+        self.crawl_states = {
+            site_nome: SiteCrawlState(site_nome, settings.CRAWL_STATE_MAX_NOTICIAS)
+            for site_nome in self.scrapers
+        }
+        self.cadencias = {site_nome: PublicationCadence(site_nome) for site_nome in self.scrapers}
+        self.duplicatas = IndiceDuplicatas(
+            settings.DUPLICATAS_INDEX_PATH,
+            max_entradas=settings.DUPLICATAS_MAX_ENTRADAS,
+            max_distancia=settings.DUPLICATAS_MAX_DISTANCIA,
+            janela_dias=settings.DUPLICATAS_JANELA_DIAS,
+            min_sobreposicao=settings.DUPLICATAS_MIN_SOBREPOSICAO
+        )
+        self._links_por_pagina: Dict[str, float] = {}
+        self._executor_listagem = ThreadPoolExecutor(
+            max_workers=settings.LISTING_PREFETCH_CONCURRENCY,
+            thread_name_prefix="listagem"
+        )
+        self._executor_artigos = ThreadPoolExecutor(
+            max_workers=settings.SCRAPER_ARTICLE_WORKERS,
+            thread_name_prefix="artigos"
+        )
+        # Os sites são coletados em paralelo para dividirem o mesmo prazo da requisição
+        self._executor_sites = ThreadPoolExecutor(
+            max_workers=settings.SCRAPER_SITE_WORKERS,
+            thread_name_prefix="sites"
+        )
+        self._observadores: List[Callable[[str, List[Noticia], List[str]], None]] = []
+    
+    def observar(self, observador: Callable[[str, List[Noticia], List[str]], None]) -> None:
+        # Chamado a cada crawl com as notícias que ele acrescentou ao estado do
+        # site e os links de tudo o que a listagem mostrou, enriquecido ou não
+        self._observadores.append(observador)
     
     def obter_noticias(self, max_noticias: int = 10, apply_filters: bool = None, 
                       keywords_include: list = None, keywords_exclude: list = None,
                       titulo_apenas: bool = False, caso_sensitivo: bool = False,
-                      sites: List[str] = None) -> List[Dict]:
+                      sites: List[str] = None, noticias_por_site: Optional[int] = None) -> List[Noticia]:
         try:
             logger.info(f"Iniciando scraping multi-site de {max_noticias} notícias")
             
@@ -35,48 +77,50 @@ class MultiSiteScraper:
             
             logger.info(f"Sites ativos: {sites_ativos}")
             
-            noticias_por_site = max(max_noticias // len(sites_ativos), 5)
+            if noticias_por_site is None:
+                noticias_por_site = max(max_noticias // len(sites_ativos), 5)
             logger.info(f"Buscando {noticias_por_site} notícias por site")
             
             todas_noticias = []
             
+            # O primeiro site é coletado na própria thread enquanto os demais vão ao
+            # pool: uma coleta nunca espera inteira na fila atrás de outra requisição
+            futuros_sites = {
+                site_nome: submit_com_contexto(self._executor_sites, self._coletar_site, site_nome, noticias_por_site)
+                for site_nome in sites_ativos[1:]
+            }
+            
             for site_nome in sites_ativos:
                 try:
-                    logger.info(f"Buscando notícias do {site_nome.upper()}")
-                    scraper = self.scrapers[site_nome]
-                    
-                    noticias_site = self._obter_noticias_site(
-                        scraper, 
-                        noticias_por_site,
-                        site_nome
-                    )
-                    
+                    if site_nome in futuros_sites:
+                        noticias_site = futuros_sites[site_nome].result()
+                    else:
+                        noticias_site = self._coletar_site(site_nome, noticias_por_site)
                     logger.info(f"{site_nome.upper()}: {len(noticias_site)} notícias coletadas")
                     todas_noticias.extend(noticias_site)
                     
-                    time.sleep(1)
-                    
                 except Exception as e:
                     logger.error(f"Erro ao buscar notícias do {site_nome}: {str(e)}")
                     continue
             
-            todas_noticias.sort(key=lambda x: x.get('data_obj', datetime.min), reverse=True)
+            todas_noticias.sort(key=lambda x: x.data_obj or DATA_MINIMA, reverse=True)
             
             noticias_finais = todas_noticias[:max_noticias]
             for i, noticia in enumerate(noticias_finais):
-                noticia['numero'] = i + 1
+                noticia.numero = i + 1
             
             logger.info(f"Total coletado: {len(noticias_finais)} notícias de {len(sites_ativos)} sites")
             
             if apply_filters or keywords_include or keywords_exclude:
-                noticias_filtradas = news_filter.filter_news(
-                    noticias_finais,
-                    keywords_include=keywords_include,
-                    keywords_exclude=keywords_exclude,
-                    titulo_apenas=titulo_apenas,
-                    caso_sensitivo=caso_sensitivo,
-                    use_defaults=apply_filters
-                )
+                with medir('filter'):
+                    noticias_filtradas = news_filter.filter_news(
+                        noticias_finais,
+                        keywords_include=keywords_include,
+                        keywords_exclude=keywords_exclude,
+                        titulo_apenas=titulo_apenas,
+                        caso_sensitivo=caso_sensitivo,
+                        use_defaults=apply_filters
+                    )
                 logger.info(f"Filtragem aplicada: {len(noticias_filtradas)}/{len(noticias_finais)} notícias mantidas")
                 return noticias_filtradas
             
@@ -86,102 +130,317 @@ class MultiSiteScraper:
             logger.error(f"Erro no scraping multi-site: {str(e)}")
             raise Exception(f"Erro ao obter notícias: {str(e)}")
     
-    def _obter_noticias_site(self, scraper, max_noticias: int, site_nome: str) -> List[Dict]:
+    def scraper_para_url(self, url: str) -> Optional[Tuple[str, object]]:
+        host = urlparse(url).netloc.lower().removeprefix('www.')
+        for site_nome, scraper in self.scrapers.items():
+            if urlparse(scraper.base_url).netloc.lower().removeprefix('www.') == host:
+                return site_nome, scraper
+        return None
+    
+    def janela_frescor(self, sites: List[str] = None) -> float:
+        # Uma resposta combina vários sites: vale a janela do site mais ativo
+        sites_ativos = [site for site in (sites or self.scrapers) if site in self.cadencias]
+        return min(self.cadencias[site].janela_frescor() for site in sites_ativos)
+    
+    def get_cadencia_stats(self) -> Dict[str, Dict]:
+        return {site_nome: cadencia.get_stats() for site_nome, cadencia in self.cadencias.items()}
+    
+    def _coletar_site(self, site_nome: str, noticias_por_site: int) -> List[Noticia]:
+        logger.info(f"Buscando notícias do {site_nome.upper()}")
+        scraper = self.scrapers[site_nome]
+        
+        with span('site', scraper.get_site_name()):
+            return self._obter_noticias_site(scraper, noticias_por_site, site_nome)
+    
+    def _url_pagina(self, scraper, site_nome: str, page: int) -> str:
+        if page == 0:
+            return scraper.noticias_url
+        if site_nome == 'andes':
+            return f"{scraper.noticias_url}?page={page}"
+        return f"{scraper.noticias_url}?p={page}"
+    
+    def _profundidade_prefetch(self, site_nome: str, links_faltando: int, apenas_primeira: bool) -> int:
+        if apenas_primeira:
+            return 1
+        
+        media = self._links_por_pagina.get(site_nome, settings.LISTING_LINKS_POR_PAGINA_INICIAL)
+        paginas = math.ceil(links_faltando / max(media, 1.0))
+        return max(1, min(paginas, settings.LISTING_PREFETCH_MAX_DEPTH))
+    
+    def _registrar_links_por_pagina(self, site_nome: str, total_links: int) -> None:
+        anterior = self._links_por_pagina.get(site_nome)
+        if anterior is None:
+            self._links_por_pagina[site_nome] = float(total_links)
+        else:
+            self._links_por_pagina[site_nome] = 0.7 * anterior + 0.3 * total_links
+    
+    def _buscar_pagina(self, scraper, site_nome: str, page: int) -> List:
+        url = self._url_pagina(scraper, site_nome, page)
+        
+        logger.info(f"{site_nome.upper()} - Página {page}: {url}")
+        
+        response = scraper._get(url, timeout=15, etapa='listing_fetch')
+        soup = scraper._processar_pagina_com_encoding_correto(response)
+        
+        return scraper._extrair_links_noticias(soup)
+    
+    def _link_completo(self, scraper, href: str) -> str:
+        return f"{scraper.base_url}{href}" if href.startswith('/') else href
+    
+    def _extrair_metadata(self, scraper, href: str, link) -> Optional[Dict]:
+        link_completo = self._link_completo(scraper, href)
+        
+        with medir('title_extract', scraper.get_site_name()):
+            titulo = scraper._extrair_titulo(link)
+        if not titulo or len(titulo) <= 2:
+            return None
+            
+        categoria, data = scraper._extrair_categoria_e_data(link)
+        data, data_obj = normalizar_data(data)
+        
+        return {
+            'link': link,
+            'link_completo': link_completo,
+            'titulo': titulo,
+            'categoria': categoria,
+            'data': data,
+            'data_obj': data_obj,
+            'href': href,
+            'site': scraper.get_site_name()
+        }
+    
+    def _enriquecer(self, scraper, noticia_meta: Dict) -> Tuple[Noticia, bool]:
+        dados_noticia = scraper.extrair_resumo_e_imagem_noticia(noticia_meta['link_completo'])
+        
+        noticia_final = Noticia(
+            titulo=noticia_meta['titulo'],
+            resumo=dados_noticia['resumo'],
+            imagem=dados_noticia['imagem'],
+            link=noticia_meta['link_completo'],
+            categoria=noticia_meta['categoria'],
+            data=noticia_meta['data'],
+            data_obj=noticia_meta['data_obj'],
+            site=noticia_meta['site'],
+            href=noticia_meta['href']
+        )
+        
+        return noticia_final, not dados_noticia.get('erro')
+    
+    def _chave_duplicata(self, scraper, link) -> Optional[Tuple[str, Optional[datetime]]]:
+        # Só com o que a listagem já mostra (título e data do link): a mesma
+        # história vista em outro site não gasta busca de artigo nem vaga
+        titulo = scraper._limpar_texto(link.get_text())
+        if len(titulo) <= 10:
+            return None
+        _, data = scraper._extrair_categoria_e_data(link)
+        return titulo, parse_data(data)
+    
+    def _processar_link(self, scraper, site_nome: str, href: str, link, enriquecer: bool):
         try:
+            chave = None
+            if settings.DUPLICATAS_ENABLED:
+                chave = self._chave_duplicata(scraper, link)
+                original = chave and self.duplicatas.duplicata_de(
+                    chave[0], scraper.get_site_name(), self._link_completo(scraper, href), chave[1]
+                )
+                if original:
+                    logger.info(f"{site_nome.upper()} - {href} é duplicata de {original['link']} ({original['site']})")
+                    return None, None
+            
+            noticia_meta = self._extrair_metadata(scraper, href, link)
+            if noticia_meta is not None:
+                noticia_meta['chave_duplicata'] = chave
+        except Exception as e:
+            logger.warning(f"{site_nome.upper()} - Erro ao processar link {href}: {str(e)}")
+            return None, None
+        
+        if noticia_meta is None or not enriquecer:
+            return noticia_meta, None
+        
+        try:
+            return noticia_meta, self._enriquecer(scraper, noticia_meta)
+        except DeadlineExceeded:
+            return noticia_meta, None
+        except Exception as e:
+            logger.warning(f"{site_nome.upper()} - Erro ao processar notícia completa: {str(e)}")
+            return noticia_meta, None
+    
+    def _obter_noticias_site(self, scraper, max_noticias: int, site_nome: str) -> List[Noticia]:
+        try:
+            estado = self.crawl_states[site_nome]
+            # Só é seguro parar no território conhecido se ele já cobre o pedido
+            parada_antecipada = estado.total() >= max_noticias
+            
+            alvo_links = max_noticias * 2
+            max_pages = 10
+            
             all_unique_links = {}
+            links_vistos = set()
+            conhecidos_seguidos = 0
+            territorio_conhecido = False
+            futuros_links = []
+            especulativos = 0
+            paginas_futuras = {}
+            proxima_pagina = 0
             page = 0
-            max_pages = 10
             
-            while len(all_unique_links) < max_noticias * 2 and page < max_pages:
-                if page == 0:
-                    url = scraper.noticias_url
-                else:
-                    if site_nome == 'andes':
-                        url = f"{scraper.noticias_url}?page={page}"
-                    else:
-                        url = f"{scraper.noticias_url}?p={page}"
-                
-                logger.info(f"{site_nome.upper()} - Página {page}: {url}")
-                
-                response = requests.get(url, headers=scraper.headers, timeout=15)
-                soup = scraper._processar_pagina_com_encoding_correto(response)
-                
-                links_noticias = scraper._extrair_links_noticias(soup)
-                
-                new_links_found = 0
-                for link in links_noticias:
-                    href = link.get('href')
-                    if href and href not in all_unique_links:
-                        all_unique_links[href] = link
-                        new_links_found += 1
-                
-                logger.info(f"{site_nome.upper()} - Página {page}: {new_links_found} novos links")
-                
-                if new_links_found == 0:
-                    break
+            try:
+                while len(all_unique_links) < alvo_links and page < max_pages:
+                    profundidade = self._profundidade_prefetch(
+                        site_nome,
+                        alvo_links - len(all_unique_links),
+                        apenas_primeira=parada_antecipada and page == 0
+                    )
+                    while proxima_pagina < max_pages and proxima_pagina < page + profundidade:
+                        paginas_futuras[proxima_pagina] = submit_com_contexto(
+                            self._executor_listagem, self._buscar_pagina, scraper, site_nome, proxima_pagina
+                        )
+                        proxima_pagina += 1
                     
-                page += 1
-            
-            noticias_com_metadata = []
-            for i, (href, link) in enumerate(all_unique_links.items()):
-                try:
-                    if href.startswith('/'):
-                        link_completo = f"{scraper.base_url}{href}"
-                    else:
-                        link_completo = href
+                    try:
+                        links_noticias = paginas_futuras.pop(page).result()
+                    except DeadlineExceeded:
+                        raise
+                    except Exception as e:
+                        # Uma página que falha encerra a paginação, mas não joga fora
+                        # os links e artigos já coletados das anteriores
+                        logger.warning(f"{site_nome.upper()} - Erro na página {page} da listagem, seguindo com {len(all_unique_links)} links: {str(e)}")
+                        break
+                    self._registrar_links_por_pagina(site_nome, len(links_noticias))
                     
-                    titulo = scraper._extrair_titulo(link)
-                    if not titulo or len(titulo) <= 2:
-                        continue
+                    new_links_found = 0
+                    known_links_found = 0
+                    duplicatas_puladas = 0
+                    for link in links_noticias:
+                        href = link.get('href')
+                        if not href or href in links_vistos:
+                            continue
+                        links_vistos.add(href)
                         
-                    categoria, data = scraper._extrair_categoria_e_data(link)
-                    data_obj = scraper._parse_date_string(data)
+                        if self.duplicatas.e_duplicata(self._link_completo(scraper, href)):
+                            # Duplicata conhecida: não é buscada, mas também não diz
+                            # nada sobre o high-watermark deste site
+                            duplicatas_puladas += 1
+                        elif estado.conhece(href):
+                            known_links_found += 1
+                            conhecidos_seguidos += 1
+                            # A listagem vem da mais nova para a mais antiga, mas uma
+                            # notícia fixada no topo também é conhecida: só uma sequência
+                            # de conhecidos marca o high-watermark do último crawl
+                            if parada_antecipada and conhecidos_seguidos >= settings.CRAWL_PARADA_CONHECIDOS_SEGUIDOS:
+                                territorio_conhecido = True
+                                break
+                        else:
+                            conhecidos_seguidos = 0
+                            all_unique_links[href] = link
+                            new_links_found += 1
+                            
+                            # Os primeiros links da listagem são os mais recentes: já
+                            # começam a ser enriquecidos enquanto as páginas seguintes chegam
+                            enriquecer = especulativos < max_noticias
+                            if enriquecer:
+                                especulativos += 1
+                            futuros_links.append(submit_com_contexto(
+                                self._executor_artigos, self._processar_link, scraper, site_nome, href, link, enriquecer
+                            ))
                     
-                    noticias_com_metadata.append({
-                        'link': link,
-                        'link_completo': link_completo,
-                        'titulo': titulo,
-                        'categoria': categoria,
-                        'data': data,
-                        'data_obj': data_obj,
-                        'href': href,
-                        'site': scraper.get_site_name()
-                    })
+                    logger.info(f"{site_nome.upper()} - Página {page}: {new_links_found} novos links, {known_links_found} já conhecidos, {duplicatas_puladas} duplicatas")
                     
-                except Exception as e:
-                    logger.warning(f"{site_nome.upper()} - Erro ao processar link {i+1}: {str(e)}")
+                    if territorio_conhecido:
+                        logger.info(f"{site_nome.upper()} - Território conhecido alcançado na página {page}, encerrando listagem")
+                        break
+                    
+                    if new_links_found == 0 and known_links_found == 0 and duplicatas_puladas == 0:
+                        break
+                        
+                    page += 1
+            except DeadlineExceeded:
+                logger.warning(f"{site_nome.upper()} - Prazo da requisição esgotado na listagem (página {page}), seguindo com {len(all_unique_links)} links")
+            finally:
+                canceladas = sum(1 for futuro in paginas_futuras.values() if futuro.cancel())
+                if canceladas:
+                    logger.info(f"{site_nome.upper()} - {canceladas} páginas de listagem antecipadas canceladas")
+            
+            noticias_com_metadata = []
+            enriquecidas = {}
+            for futuro in futuros_links:
+                noticia_meta, enriquecida = futuro.result()
+                if noticia_meta is None:
                     continue
+                noticias_com_metadata.append(noticia_meta)
+                if enriquecida is not None:
+                    enriquecidas[noticia_meta['href']] = enriquecida
             
             noticias_com_metadata.sort(key=lambda x: x['data_obj'], reverse=True)
             max_a_processar = min(max_noticias, len(noticias_com_metadata))
+            selecionadas = noticias_com_metadata[:max_a_processar]
+            
+            pendentes = {
+                noticia_meta['href']: submit_com_contexto(self._executor_artigos, self._enriquecer, scraper, noticia_meta)
+                for noticia_meta in selecionadas
+                if noticia_meta['href'] not in enriquecidas
+            }
+            descartadas = len(enriquecidas) - (len(selecionadas) - len(pendentes))
+            if descartadas:
+                logger.info(f"{site_nome.upper()} - {descartadas} enriquecimentos antecipados descartados")
             
             noticias_processadas = []
-            for i, noticia_meta in enumerate(noticias_com_metadata[:max_a_processar]):
+            noticias_para_estado = []
+            originais = []
+            for noticia_meta in selecionadas:
+                href = noticia_meta['href']
                 try:
-                    dados_noticia = scraper.extrair_resumo_e_imagem_noticia(noticia_meta['link_completo'])
-                    
-                    noticia_final = {
-                        'numero': i + 1,
-                        'titulo': noticia_meta['titulo'],
-                        'resumo': dados_noticia['resumo'],
-                        'imagem': dados_noticia['imagem'],
-                        'link': noticia_meta['link_completo'],
-                        'categoria': noticia_meta['categoria'],
-                        'data': noticia_meta['data'],
-                        'data_obj': noticia_meta['data_obj'],
-                        'site': noticia_meta['site']
-                    }
-                    
-                    noticias_processadas.append(noticia_final)
-                    
-                    if i < max_a_processar - 1:
-                        time.sleep(1)
-                        
+                    if href in enriquecidas:
+                        noticia_final, sucesso = enriquecidas[href]
+                    else:
+                        noticia_final, sucesso = pendentes[href].result()
+                except DeadlineExceeded:
+                    # Sem prazo para enriquecer: a resposta sai só com o que já estava pronto
+                    continue
                 except Exception as e:
                     logger.warning(f"{site_nome.upper()} - Erro ao processar notícia completa: {str(e)}")
                     continue
+                
+                noticias_processadas.append(noticia_final)
+                
+                if sucesso:
+                    noticias_para_estado.append(noticia_final)
+                    if noticia_meta.get('chave_duplicata'):
+                        originais.append(noticia_meta)
+            
+            estado.registrar(noticias_para_estado)
+            links_listados = [self._link_completo(scraper, href) for href in links_vistos]
+            for noticia_meta in originais:
+                titulo, data = noticia_meta['chave_duplicata']
+                self.duplicatas.registrar_original(titulo, noticia_meta['site'], noticia_meta['link_completo'], data)
+            self.duplicatas.salvar()
+            for observador in self._observadores:
+                try:
+                    observador(site_nome, noticias_para_estado, links_listados)
+                except Exception as e:
+                    logger.error(f"{site_nome.upper()} - Erro ao notificar observador do crawl: {str(e)}")
+            
+            # Só crawls incrementais revelam quando as notícias aparecem; no crawl
+            # frio tudo seria "descoberto" no mesmo instante
+            cadencia = self.cadencias[site_nome]
+            if parada_antecipada:
+                cadencia.registrar_descobertas(len(noticias_para_estado))
+            cadencia.registrar_datas(estado.datas())
+            
+            hrefs_processados = {noticia.href for noticia in noticias_processadas}
+            noticias_conhecidas = [
+                noticia for noticia in estado.noticias_conhecidas()
+                if noticia.href not in hrefs_processados
+            ]
+            logger.info(f"{site_nome.upper()} - {len(noticias_processadas)} notícias enriquecidas, {len(noticias_conhecidas)} reaproveitadas do estado")
+            
+            noticias_site = noticias_processadas + noticias_conhecidas
+            noticias_site.sort(key=lambda x: x.data_obj, reverse=True)
+            noticias_site = noticias_site[:max_noticias]
+            for i, noticia in enumerate(noticias_site):
+                noticia.numero = i + 1
             
-            return noticias_processadas
+            return noticias_site
             
         except Exception as e:
             logger.error(f"Erro ao obter notícias do {site_nome}: {str(e)}")
@@ -0,0 +1,77 @@
+import hashlib
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def id_da_noticia(link: str) -> str:
+    # Identificador estável derivado do link
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()[:16]
+
+
+class Noticia:
+
+    __slots__ = ('numero', 'titulo', 'resumo', 'imagem', 'link', 'categoria', 'data', 'data_obj', 'site', 'href')
+
+    CAMPOS_PUBLICOS = ('id', 'numero', 'titulo', 'resumo', 'imagem', 'link', 'categoria', 'data')
+    _CAMPOS_LEITURA = frozenset(__slots__) | {'id', 'data_publicacao'}
+
+    def __init__(self, titulo: str, resumo: str, imagem: str, link: str, categoria: str, data: str,
+                 data_obj: Optional[datetime], site: str, href: str, numero: int = 0):
+        self.numero = numero
+        self.titulo = titulo
+        self.resumo = resumo
+        self.imagem = imagem
+        self.link = link
+        # Poucos valores distintos e repetidos em todas as notícias: uma cópia só na memória
+        self.categoria = sys.intern(categoria)
+        self.data = data
+        self.data_obj = data_obj
+        self.site = sys.intern(site)
+        self.href = href
+
+    @property
+    def id(self) -> str:
+        return id_da_noticia(self.link)
+
+    @property
+    def data_publicacao(self) -> Optional[datetime]:
+        # Data já normalizada na coleta, com fuso
+        return self.data_obj
+
+    def copiar(self, **alteracoes) -> "Noticia":
+        # As strings são imutáveis e ficam compartilhadas entre as cópias
+        copia = object.__new__(Noticia)
+        for campo in self.__slots__:
+            setattr(copia, campo, alteracoes.get(campo, getattr(self, campo)))
+        return copia
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {campo: getattr(self, campo) for campo in self.CAMPOS_PUBLICOS}
+
+    def tamanho_bytes(self) -> int:
+        # Aproximado: o objeto mais os valores próprios (strings internadas não contam)
+        total = sys.getsizeof(self)
+        for campo in ('titulo', 'resumo', 'imagem', 'link', 'data', 'data_obj', 'href'):
+            valor = getattr(self, campo)
+            if valor is not None:
+                total += sys.getsizeof(valor)
+        return total
+
+    # Leitura no estilo dict, para o código que ainda trata notícias como dicionários
+
+    def __getitem__(self, campo: str) -> Any:
+        if campo not in self._CAMPOS_LEITURA:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def get(self, campo: str, padrao: Any = None) -> Any:
+        if campo not in self._CAMPOS_LEITURA:
+            return padrao
+        return getattr(self, campo)
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in self._CAMPOS_LEITURA
+
+    def __repr__(self) -> str:
+        return f"Noticia(site={self.site!r}, numero={self.numero}, titulo={self.titulo!r})"
@@ -0,0 +1,155 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import logging
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def host_da_url(url: str) -> str:
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.atualizado_em = time.monotonic()
+        self.bloqueado_ate = 0.0
+
+    def reservar(self, agora: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (agora - self.atualizado_em) * self.rate)
+        self.atualizado_em = agora
+
+        # O token é consumido mesmo que o saldo fique negativo: o saldo negativo
+        # funciona como fila, e cada chamador espera apenas a sua vez
+        self.tokens -= 1
+        espera = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        return max(espera, self.bloqueado_ate - agora)
+
+
+class PolitenessScheduler:
+
+    def __init__(self, limites: Dict[str, Dict[str, float]], limite_padrao: Dict[str, float],
+                 max_retry_after: float):
+        self.limites = limites
+        self.limite_padrao = limite_padrao
+        self.max_retry_after = max_retry_after
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "requisicoes": 0,
+            "requisicoes_com_espera": 0,
+            "tempo_total_espera_segundos": 0.0,
+            "retry_after_recebidos": 0
+        }
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            limite = self.limites.get(host, self.limite_padrao)
+            bucket = TokenBucket(limite["rate"], limite["burst"])
+            self._buckets[host] = bucket
+        return bucket
+
+    def aguardar(self, url: str, espera_maxima: Optional[float] = None) -> Optional[float]:
+        host = host_da_url(url)
+
+        with self._lock:
+            bucket = self._bucket(host)
+            espera = bucket.reservar(time.monotonic())
+            if espera_maxima is not None and espera > espera_maxima:
+                # Não dá para esperar a vez: devolve o token reservado
+                bucket.tokens += 1
+                return None
+            self.stats["requisicoes"] += 1
+            if espera > 0:
+                self.stats["requisicoes_com_espera"] += 1
+                self.stats["tempo_total_espera_segundos"] += espera
+
+        if espera > 0:
+            logger.debug(f"Politeness {host}: aguardando {espera:.2f}s")
+            time.sleep(espera)
+
+        return espera
+
+    def tentar_reservar(self, url: str) -> bool:
+        # Reserva só se houver token livre agora: tráfego opcional (hedges) nunca espera na fila
+        host = host_da_url(url)
+
+        with self._lock:
+            bucket = self._bucket(host)
+            agora = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens + (agora - bucket.atualizado_em) * bucket.rate)
+            bucket.atualizado_em = agora
+            if bucket.tokens < 1 or bucket.bloqueado_ate > agora:
+                return False
+            bucket.tokens -= 1
+            self.stats["requisicoes"] += 1
+            return True
+
+    def registrar_retry_after(self, url: str, valor: str) -> None:
+        segundos = self._parse_retry_after(valor)
+        if segundos is None:
+            return
+
+        segundos = min(segundos, self.max_retry_after)
+        host = host_da_url(url)
+
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.bloqueado_ate = max(bucket.bloqueado_ate, time.monotonic() + segundos)
+            self.stats["retry_after_recebidos"] += 1
+
+        logger.warning(f"Politeness {host}: Retry-After recebido, pausando por {segundos:.0f}s")
+
+    def _parse_retry_after(self, valor: str) -> Optional[float]:
+        valor = (valor or '').strip()
+        if not valor:
+            return None
+
+        if valor.isdigit():
+            return float(valor)
+
+        try:
+            data = parsedate_to_datetime(valor)
+            if data.tzinfo is None:
+                data = data.replace(tzinfo=timezone.utc)
+            return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            logger.warning(f"Retry-After inválido ignorado: '{valor}'")
+            return None
+
+    def get_stats(self) -> Dict:
+        agora = time.monotonic()
+        with self._lock:
+            hosts = {
+                host: {
+                    "rate": bucket.rate,
+                    "burst": bucket.burst,
+                    "tokens_disponiveis": round(min(bucket.burst, bucket.tokens + (agora - bucket.atualizado_em) * bucket.rate), 2),
+                    "bloqueado_por_segundos": round(max(0.0, bucket.bloqueado_ate - agora), 2)
+                }
+                for host, bucket in self._buckets.items()
+            }
+            return {
+                **self.stats,
+                "tempo_total_espera_segundos": round(self.stats["tempo_total_espera_segundos"], 2),
+                "hosts": hosts
+            }
+
+
+politeness_scheduler = PolitenessScheduler(
+    limites=settings.SCRAPER_RATE_LIMITS,
+    limite_padrao=settings.SCRAPER_DEFAULT_RATE_LIMIT,
+    max_retry_after=settings.SCRAPER_MAX_RETRY_AFTER_SECONDS
+)
@@ -1,3 +1,8 @@
 from .rss_service import rss_service
+from .refresh_service import refresh_service
+from .websub_hub import websub_hub
+from .event_service import event_service
+from .delta_service import delta_service
+from .detalhes_service import detalhes_service
 
-__all__ = ["rss_service"]
+__all__ = ["rss_service", "refresh_service", "websub_hub", "event_service", "delta_service", "detalhes_service"]
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core import settings, get_logger
+from ..cache import news_cache
+from .refresh_service import refresh_service
+
+logger = get_logger(__name__)
+
+
+class DeltaService:
+
+    MAX_LINKS = 2000
+
+    def __init__(self, caminho: Optional[str] = None):
+        # Momento em que cada link apareceu pela primeira vez num conjunto do
+        # cache. Persiste entre reinícios: sem ele, depois de um restart todo
+        # link listado pareceria novo e quem tem uma marca antiga receberia tudo
+        self.caminho = Path(caminho) if caminho else None
+        self.primeira_vez: "OrderedDict[str, datetime]" = OrderedDict()
+        self._alterado = False
+        self._lock = threading.Lock()
+        self._job_aquecimento: Optional[str] = None
+        self._carregar()
+
+    def _carregar(self) -> None:
+        if self.caminho is None or not self.caminho.exists():
+            return
+        try:
+            dados = json.loads(self.caminho.read_text(encoding="utf-8"))
+            self.primeira_vez = OrderedDict(
+                (link, datetime.fromisoformat(momento)) for link, momento in dados.items()
+            )
+            logger.info(f"Marcas do delta carregadas: {len(self.primeira_vez)} links")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Marcas do delta ignoradas ({self.caminho}): {str(e)}")
+
+    def salvar(self) -> None:
+        if self.caminho is None:
+            return
+        with self._lock:
+            if not self._alterado:
+                return
+            conteudo = json.dumps({link: self.formatar_marca(momento) for link, momento in self.primeira_vez.items()})
+            self._alterado = False
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_suffix(f".{threading.get_ident()}.tmp")
+        temporario.write_text(conteudo, encoding="utf-8")
+        os.replace(temporario, self.caminho)
+
+    def ao_gravar_cache(self, max_noticias: int, filters: Optional[Dict], data: Dict) -> None:
+        self._registrar(data["noticias"])
+        self.salvar()
+
+    def _registrar(self, noticias: List) -> Dict[str, datetime]:
+        agora = datetime.now()
+        with self._lock:
+            vistos = {}
+            for noticia in noticias:
+                link = noticia.get("link")
+                if link not in self.primeira_vez:
+                    self.primeira_vez[link] = agora
+                    self._alterado = True
+                vistos[link] = self.primeira_vez[link]
+            while len(self.primeira_vez) > self.MAX_LINKS:
+                self.primeira_vez.popitem(last=False)
+        return vistos
+
+    @staticmethod
+    def formatar_marca(momento: datetime) -> str:
+        return momento.isoformat(timespec="microseconds")
+
+    @staticmethod
+    def interpretar_desde(desde: str) -> Tuple[Optional[datetime], Optional[str]]:
+        # A marca é um instante ISO 8601 (a devolvida pela própria rota) ou o
+        # link da notícia mais recente que o cliente já tem
+        desde = desde.strip().strip('"')
+        if desde.startswith(("http://", "https://")):
+            return None, desde
+        try:
+            momento = datetime.fromisoformat(desde)
+        except ValueError:
+            raise ValueError("'desde' inválido: use a marca devolvida pela rota, um instante ISO 8601 ou um link")
+        if momento.tzinfo is not None:
+            momento = momento.astimezone().replace(tzinfo=None)
+        return momento, None
+
+    def aquecer(self, max_noticias: int, filters: Optional[Dict]) -> None:
+        # Sem o conjunto no cache, o delta não faz scraping na requisição: agenda
+        # um refresh (um por vez) e o cliente tenta de novo em seguida
+        if self._job_aquecimento is not None:
+            job = refresh_service.obter(self._job_aquecimento)
+            if job is not None and job["status"] in ("pendente", "executando"):
+                return
+        job = refresh_service.iniciar(entradas_extras=[(max_noticias, filters)])
+        self._job_aquecimento = job["id"]
+
+    def calcular(self, noticias: List, desde: Optional[str]) -> Dict:
+        vistos = self._registrar(noticias)
+        marca_atual = max(vistos.values()) if vistos else None
+
+        if desde is None:
+            return {"noticias": list(noticias), "marca": marca_atual, "completo": True}
+
+        momento, link = self.interpretar_desde(desde)
+        if link is not None:
+            if link not in vistos:
+                # Link fora do conjunto atual: o cliente recebe tudo e substitui o que tem
+                return {"noticias": list(noticias), "marca": marca_atual, "completo": True}
+            momento = vistos[link]
+
+        novas = [noticia for noticia in noticias if vistos[noticia.get("link")] > momento]
+        if link is None and marca_atual is not None:
+            marca_atual = max(marca_atual, momento)
+        return {"noticias": novas, "marca": marca_atual or momento, "completo": False}
+
+
+delta_service = DeltaService(settings.DELTA_INDEX_PATH)
+news_cache.observar(delta_service.ao_gravar_cache)
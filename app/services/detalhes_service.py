@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ..core import settings, get_logger
+from ..core.deadline import DeadlineExceeded, deadline_atual
+from ..cache import GreedyDualCache, tamanho_aproximado
+from ..scrapers import multi_site_scraper
+
+logger = get_logger(__name__)
+
+
+class DetalhesService:
+
+    def __init__(self):
+        self.cache = GreedyDualCache(
+            max_entradas=settings.DETALHES_CACHE_MAX_SIZE,
+            ttl_seconds=settings.DETALHES_CACHE_TTL_SECONDS
+        )
+        # A concorrência real por host continua limitada pela politeness
+        self._executor = ThreadPoolExecutor(max_workers=settings.DETALHES_WORKERS, thread_name_prefix="detalhes")
+        # Buscas em andamento por URL: pedidos simultâneos da mesma URL esperam a mesma busca
+        self._em_andamento: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "estado_crawl": 0, "buscas": 0, "erros": 0}
+
+    def _do_estado(self, site_nome: str, url: str) -> Optional[Dict]:
+        # Notícias enriquecidas pelos crawls já têm resumo e imagem
+        noticia = multi_site_scraper.crawl_states[site_nome].por_link(url)
+        if noticia is None:
+            return None
+        return {"url": url, "site": noticia.site, "resumo": noticia.resumo, "imagem": noticia.imagem}
+
+    def _buscar(self, scraper, url: str) -> Dict:
+        inicio = time.perf_counter()
+        dados = scraper.extrair_resumo_e_imagem_noticia(url)
+        detalhe = {
+            "url": url,
+            "site": scraper.get_site_name(),
+            "resumo": dados["resumo"],
+            "imagem": dados["imagem"]
+        }
+        if dados.get("erro"):
+            detalhe["erro"] = dados["erro"]
+        else:
+            self.cache.set(url, detalhe, time.perf_counter() - inicio, tamanho_aproximado(detalhe))
+        return detalhe
+
+    def _buscar_compartilhado(self, scraper, url: str) -> Future:
+        with self._lock:
+            futuro = self._em_andamento.get(url)
+            if futuro is not None:
+                return futuro
+            # Sem o contexto de quem pediu primeiro: a busca é compartilhada e não
+            # pode herdar o prazo dele; cada pedido espera só até o próprio prazo
+            futuro = self._executor.submit(self._buscar, scraper, url)
+            self._em_andamento[url] = futuro
+            self.stats["buscas"] += 1
+        futuro.add_done_callback(lambda _: self._em_andamento.pop(url, None))
+        return futuro
+
+    def obter(self, urls: List[str]) -> Tuple[List[Dict], bool]:
+        urls = list(dict.fromkeys(urls))
+        alvos = {url: multi_site_scraper.scraper_para_url(url) for url in urls}
+        por_site = Counter(alvo[0] for alvo in alvos.values() if alvo is not None)
+        for site_nome, quantidade in por_site.items():
+            if quantidade > settings.DETALHES_MAX_URLS_POR_SITE:
+                raise ValueError(
+                    f"{quantidade} URLs de {site_nome} no pedido; o limite é "
+                    f"{settings.DETALHES_MAX_URLS_POR_SITE} por site"
+                )
+
+        resultados: Dict[str, Dict] = {}
+        futuros: Dict[str, Tuple[str, Future]] = {}
+
+        # Tudo o que não está em cache sai de uma vez; a politeness por host
+        # ainda espaça as buscas do mesmo site, e o limite por site mantém o
+        # lote dentro do prazo
+        for url in urls:
+            alvo = alvos[url]
+            if alvo is None:
+                resultados[url] = {"url": url, "erro": "Site não suportado"}
+                continue
+
+            site_nome, scraper = alvo
+            detalhe = self.cache.get(url)
+            if detalhe is not None:
+                self.stats["hits"] += 1
+            else:
+                detalhe = self._do_estado(site_nome, url)
+                if detalhe is not None:
+                    self.stats["estado_crawl"] += 1
+            if detalhe is not None:
+                resultados[url] = {**detalhe, "from_cache": True}
+                continue
+
+            futuros[url] = (scraper.get_site_name(), self._buscar_compartilhado(scraper, url))
+
+        deadline = deadline_atual()
+        parcial = False
+        for url, (site, futuro) in futuros.items():
+            try:
+                timeout = max(deadline.restante(), 0) if deadline is not None else None
+                resultados[url] = futuro.result(timeout=timeout)
+            except (DeadlineExceeded, TimeoutError):
+                parcial = True
+                resultados[url] = {"url": url, "site": site, "erro": "prazo da requisição esgotado"}
+            except Exception as e:
+                resultados[url] = {"url": url, "site": site, "erro": str(e)}
+            if resultados[url].get("erro"):
+                self.stats["erros"] += 1
+
+        logger.info(f"Detalhes de {len(urls)} URLs: {len(urls) - len(futuros)} do cache, {len(futuros)} buscadas")
+        return [resultados[url] for url in urls], parcial
+
+    def invalidar(self, site: Optional[str] = None, link: Optional[str] = None) -> int:
+        removidas = 0
+        for url, detalhe in self.cache.items():
+            if (site and detalhe.get("site") == site) or (link and url == link):
+                removidas += self.cache.remover(url)
+        return removidas
+
+    def get_stats(self) -> Dict:
+        return {
+            "entradas": len(self.cache),
+            "total_bytes": self.cache.total_bytes,
+            **self.cache.stats,
+            **self.stats
+        }
+
+
+detalhes_service = DetalhesService()
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from ..core import settings, get_logger
+from ..filters import news_filter
+from ..scrapers import multi_site_scraper
+from ..scrapers.datas import DATA_MINIMA
+
+logger = get_logger(__name__)
+
+
+class Evento:
+
+    __slots__ = ('id', 'dados', 'quadro')
+
+    def __init__(self, id: int, dados: Dict):
+        self.id = id
+        self.dados = dados
+        # Serializado uma vez só, não por assinante
+        self.quadro = f"id: {id}\nevent: noticia\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+class EventService:
+
+    # Links já vistos por site, para que um crawl refeito do zero não anuncie
+    # de novo o que já foi anunciado
+    MAX_LINKS_VISTOS = 1000
+    QUADRO_RESET = b"event: reset\ndata: {}\n\n"
+    QUADRO_HEARTBEAT = b": ping\n\n"
+
+    def __init__(self):
+        self.eventos: deque = deque(maxlen=settings.EVENTOS_BUFFER_SIZE)
+        # Ids crescem entre reinícios: um Last-Event-ID de antes do reinício cai
+        # antes do buffer e o cliente recebe um reset
+        self._proximo_id = int(time.time() * 1000)
+        self._vistos: Dict[str, "OrderedDict[str, None]"] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sinal: Optional[asyncio.Future] = None
+        self._tarefa_heartbeat: Optional[asyncio.Task] = None
+        self.assinantes = 0
+        self.stats = {"eventos_publicados": 0, "conexoes_sse": 0, "long_polls": 0, "resets": 0}
+
+    @property
+    def ultimo_id(self) -> int:
+        return self._proximo_id - 1
+
+    def ao_descobrir(self, site_nome: str, noticias: List, links_listados: List[str]) -> None:
+        # Chamado nas threads do scraping
+        with self._lock:
+            vistos = self._vistos.setdefault(site_nome, OrderedDict())
+            # O primeiro crawl de cada site é a linha de base: nada é "novo" ainda.
+            # Ela cobre tudo o que a listagem mostrou, não só o que o prazo deixou
+            # enriquecer; senão os artigos antigos enriquecidos no crawl seguinte
+            # sairiam como descobertas
+            linha_de_base = not vistos
+            if linha_de_base:
+                for link in links_listados:
+                    vistos[link] = None
+            novas = [noticia for noticia in noticias if noticia.link not in vistos]
+            for noticia in noticias:
+                vistos[noticia.link] = None
+            while len(vistos) > self.MAX_LINKS_VISTOS:
+                vistos.popitem(last=False)
+
+        if linha_de_base or not novas:
+            return
+
+        novas = news_filter.filter_news(novas, use_defaults=True)
+        novas.sort(key=lambda noticia: noticia.data_obj or DATA_MINIMA)
+        descoberta_em = datetime.now().isoformat()
+
+        with self._lock:
+            for noticia in novas:
+                dados = {campo: getattr(noticia, campo) for campo in noticia.CAMPOS_PUBLICOS if campo != 'numero'}
+                dados["site"] = noticia.site
+                dados["data_publicacao"] = noticia.data_obj.isoformat() if noticia.data_obj else None
+                dados["descoberta_em"] = descoberta_em
+                self.eventos.append(Evento(self._proximo_id, dados))
+                self._proximo_id += 1
+            self.stats["eventos_publicados"] += len(novas)
+
+        if novas:
+            logger.info(f"{site_nome.upper()} - {len(novas)} novas notícias publicadas no stream de eventos")
+            loop = self._loop
+            if loop is not None:
+                loop.call_soon_threadsafe(self._acordar)
+
+    def eventos_desde(self, ultimo_id: int) -> Tuple[List[Evento], bool]:
+        # Devolve os eventos após ultimo_id e se algum deles já saiu do buffer
+        with self._lock:
+            primeiro = self.eventos[0].id if self.eventos else self._proximo_id
+            if ultimo_id < primeiro - 1:
+                return list(self.eventos), True
+            # Ids consecutivos no buffer: a posição sai direto do id
+            return list(islice(self.eventos, max(ultimo_id - primeiro + 1, 0), None)), False
+
+    def _garantir_loop(self) -> None:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._tarefa_heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    def _aguardar_sinal(self) -> asyncio.Future:
+        # Um único future compartilhado por todos os assinantes ociosos: publicar
+        # custa resolver um future, não uma fila por conexão
+        if self._sinal is None:
+            self._sinal = self._loop.create_future()
+        return self._sinal
+
+    def _acordar(self) -> None:
+        sinal, self._sinal = self._sinal, None
+        if sinal is not None and not sinal.done():
+            sinal.set_result(None)
+
+    async def _heartbeat_loop(self) -> None:
+        # Um timer para todas as conexões, em vez de um por assinante
+        while True:
+            try:
+                await asyncio.sleep(settings.EVENTOS_HEARTBEAT_SECONDS)
+                self._acordar()
+            except asyncio.CancelledError:
+                break
+
+    async def start(self) -> None:
+        self._garantir_loop()
+
+    async def stop(self) -> None:
+        if self._tarefa_heartbeat is not None:
+            self._tarefa_heartbeat.cancel()
+            await asyncio.gather(self._tarefa_heartbeat, return_exceptions=True)
+            self._tarefa_heartbeat = None
+        self._acordar()
+        self._loop = None
+
+    async def stream(self, ultimo_id: Optional[int] = None) -> AsyncIterator[bytes]:
+        self._garantir_loop()
+        self.assinantes += 1
+        self.stats["conexoes_sse"] += 1
+        try:
+            yield b"retry: 3000\n\n"
+            cursor = ultimo_id if ultimo_id is not None else self.ultimo_id
+            while True:
+                # O sinal é obtido antes de olhar o buffer: uma publicação entre as
+                # duas coisas acorda este mesmo future
+                sinal = self._aguardar_sinal()
+                eventos, perdidos = self.eventos_desde(cursor)
+                if perdidos:
+                    self.stats["resets"] += 1
+                    yield self.QUADRO_RESET
+                for evento in eventos:
+                    yield evento.quadro
+                    cursor = evento.id
+                if eventos or perdidos:
+                    continue
+
+                await asyncio.shield(sinal)
+                if self.eventos_desde(cursor) == ([], False):
+                    yield self.QUADRO_HEARTBEAT
+        finally:
+            self.assinantes -= 1
+
+    async def long_poll(self, ultimo_id: Optional[int] = None, timeout: Optional[float] = None) -> Dict:
+        self._garantir_loop()
+        self.stats["long_polls"] += 1
+        cursor = ultimo_id if ultimo_id is not None else self.ultimo_id
+        limite = time.monotonic() + (timeout if timeout is not None else settings.EVENTOS_LONGPOLL_TIMEOUT_SECONDS)
+
+        self.assinantes += 1
+        try:
+            while True:
+                sinal = self._aguardar_sinal()
+                eventos, perdidos = self.eventos_desde(cursor)
+                restante = limite - time.monotonic()
+                if eventos or perdidos or restante <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(asyncio.shield(sinal), restante)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.assinantes -= 1
+
+        if perdidos:
+            self.stats["resets"] += 1
+        return {
+            "eventos": [{"id": evento.id, **evento.dados} for evento in eventos],
+            "ultimo_id": eventos[-1].id if eventos else cursor,
+            "reset": perdidos
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            em_buffer = len(self.eventos)
+        return {
+            "assinantes": self.assinantes,
+            "ultimo_id": self.ultimo_id,
+            "eventos_em_buffer": em_buffer,
+            **self.stats
+        }
+
+
+event_service = EventService()
+multi_site_scraper.observar(event_service.ao_descobrir)
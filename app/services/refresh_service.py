@@ -0,0 +1,172 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..core import settings, get_logger
+from ..cache import news_cache
+from ..filters import news_filter
+from ..scraper import AndesScraper
+from ..scrapers import multi_site_scraper
+from ..scrapers.conteudo_store import conteudo_store
+from ..scrapers.datas import DATA_MINIMA
+from .detalhes_service import detalhes_service
+
+logger = get_logger(__name__)
+
+
+class RefreshService:
+
+    MAX_JOBS_GUARDADOS = 50
+
+    def __init__(self):
+        self.scraper = AndesScraper()
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Um worker só: refreshes em fila não disputam as origens entre si
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresh")
+
+    def nome_do_site(self, site: str) -> str:
+        if site not in multi_site_scraper.scrapers:
+            raise ValueError(f"Site desconhecido: '{site}' (use {', '.join(multi_site_scraper.scrapers)})")
+        return multi_site_scraper.scrapers[site].get_site_name()
+
+    def invalidar(self, site: Optional[str] = None, link: Optional[str] = None) -> Dict:
+        if not site and not link:
+            raise ValueError("Informe 'site' ou 'url' para invalidar")
+
+        nome_site = self.nome_do_site(site) if site else None
+
+        # O estado do crawl também esquece, senão o próximo scraping reaproveitaria
+        # exatamente o que acabou de ser invalidado
+        if site:
+            multi_site_scraper.crawl_states[site].limpar()
+        esquecida = False
+        if link:
+            esquecida = any(estado.esquecer_link(link) for estado in multi_site_scraper.crawl_states.values())
+
+        removidas = news_cache.invalidar(site=nome_site, link=link)
+        detalhes_service.invalidar(site=nome_site, link=link)
+        if link:
+            conteudo_store.remover(link)
+        return {
+            "site": site,
+            "url": link,
+            "entries_removed": removidas,
+            "noticia_esquecida": esquecida,
+            "invalidated_at": datetime.now().isoformat()
+        }
+
+    def iniciar(self, site: Optional[str] = None, entradas_extras: Optional[List] = None) -> Dict:
+        if site:
+            self.nome_do_site(site)
+
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "site": site,
+            "status": "pendente",
+            "criado_em": datetime.now().isoformat(),
+            "iniciado_em": None,
+            "concluido_em": None,
+            "entradas_total": 0,
+            "entradas_atualizadas": 0,
+            "erro": None
+        }
+        with self._lock:
+            self.jobs[job["id"]] = job
+            while len(self.jobs) > self.MAX_JOBS_GUARDADOS:
+                self.jobs.popitem(last=False)
+
+        self._executor.submit(self._executar, job, entradas_extras or [])
+        logger.info(f"Refresh {job['id']} agendado (site={site or 'todos'})")
+        return dict(job)
+
+    def obter(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _atualizar(self, job: Dict, **campos) -> None:
+        with self._lock:
+            job.update(campos)
+
+    def _entradas_a_atualizar(self, extras: List) -> List:
+        entradas = news_cache.entradas()
+        if not entradas and not extras:
+            # Cache vazio: aquece a consulta padrão das rotas
+            entradas = [(settings.DEFAULT_NOTICIAS, news_filter.get_filter_summary(use_defaults=True))]
+        return entradas + [extra for extra in extras if extra not in entradas]
+
+    def _noticias_do_site(self, site: str, max_noticias: int, filtros: Dict) -> Optional[List]:
+        # Só o site pedido volta às origens; as notícias dos demais vêm da versão
+        # em cache da mesma consulta. Sem ela, não há com o que combinar.
+        atuais = news_cache.noticias(max_noticias, filtros or None)
+        if atuais is None:
+            return None
+
+        nome_site = self.nome_do_site(site)
+        frescas = multi_site_scraper.obter_noticias(
+            max_noticias=max_noticias,
+            apply_filters=True,
+            titulo_apenas=filtros.get("apenas_titulo", False),
+            caso_sensitivo=filtros.get("case_sensitive", False),
+            sites=[site],
+            # A mesma parte que o site teria num scraping de todos os sites
+            noticias_por_site=max(max_noticias // len(multi_site_scraper.scrapers), 5)
+        )
+        noticias = [noticia.copiar() for noticia in atuais if noticia.site != nome_site] + frescas
+        noticias.sort(key=lambda noticia: noticia.data_obj or DATA_MINIMA, reverse=True)
+        noticias = noticias[:max_noticias]
+        for i, noticia in enumerate(noticias):
+            noticia.numero = i + 1
+        return noticias
+
+    def _executar(self, job: Dict, extras: List) -> None:
+        entradas = self._entradas_a_atualizar(extras)
+        self._atualizar(job, status="executando", iniciado_em=datetime.now().isoformat(), entradas_total=len(entradas))
+
+        try:
+            # Refresh de um site recomeça o crawl dele do zero e só ele é buscado
+            # de novo; as entradas antigas continuam no cache, servindo as
+            # requisições até a troca
+            if job["site"]:
+                multi_site_scraper.crawl_states[job["site"]].limpar()
+
+            for max_noticias, filtros in entradas:
+                filtros = filtros or {}
+                inicio = time.perf_counter()
+                noticias = self._noticias_do_site(job["site"], max_noticias, filtros) if job["site"] else None
+                if noticias is None:
+                    noticias = self.scraper.obter_noticias(
+                        max_noticias=max_noticias,
+                        apply_filters=True,
+                        titulo_apenas=filtros.get("apenas_titulo", False),
+                        caso_sensitivo=filtros.get("case_sensitive", False)
+                    )
+
+                response_data = {
+                    "total_noticias": len(noticias),
+                    "dados_extraidos": ["Título ✓", "Resumo ✓", "Imagem ✓", "Link ✓", "Categoria ✓", "Data ✓"],
+                    "noticias": noticias,
+                    "timestamp": datetime.now().isoformat(),
+                    "filtros_aplicados": filtros or None
+                }
+                news_cache.set(
+                    max_noticias, response_data, filtros or None,
+                    custo_segundos=time.perf_counter() - inicio,
+                    ttl_seconds=multi_site_scraper.janela_frescor()
+                )
+                self._atualizar(job, entradas_atualizadas=job["entradas_atualizadas"] + 1)
+
+            self._atualizar(job, status="concluido", concluido_em=datetime.now().isoformat())
+            logger.info(f"Refresh {job['id']} concluído: {len(entradas)} entradas atualizadas")
+
+        except Exception as e:
+            logger.error(f"Erro no refresh {job['id']}: {str(e)}")
+            self._atualizar(job, status="erro", erro=str(e), concluido_em=datetime.now().isoformat())
+
+
+refresh_service = RefreshService()
@@ -1,10 +1,12 @@
-from datetime import datetime
 from typing import List, Dict
 from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
 import html
 
 from ..core import settings, get_logger
+from ..core.metrics import medir
+from ..scrapers.datas import DATA_MINIMA, agora, formatar_rfc2822, parse_data
+from ..scrapers.image_metadata import image_metadata_cache
 
 logger = get_logger(__name__)
 
@@ -13,18 +15,19 @@ class RSSService:
     
     def generate_rss_xml(self, noticias: List[Dict]) -> str:
         try:
-            rss = Element("rss")
-            rss.set("version", "2.0")
-            rss.set("xmlns:atom", "http://www.w3.org/2005/Atom")
-            
-            channel = SubElement(rss, "channel")
-            
-            self._add_channel_metadata(channel)
-            
-            for noticia in noticias:
-                self._add_news_item(channel, noticia)
-            
-            return self._format_xml(rss)
+            with medir('rss_render'):
+                rss = Element("rss")
+                rss.set("version", "2.0")
+                rss.set("xmlns:atom", "http://www.w3.org/2005/Atom")
+                
+                channel = SubElement(rss, "channel")
+                
+                self._add_channel_metadata(channel)
+                
+                for noticia in noticias:
+                    self._add_news_item(channel, noticia)
+                
+                return self._format_xml(rss)
             
         except Exception as e:
             logger.error(f"Erro ao gerar RSS XML: {str(e)}")
@@ -78,7 +81,7 @@ class RSSService:
         language.text = "pt-BR"
         
         last_build_date = SubElement(channel, "lastBuildDate")
-        last_build_date.text = datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z")
+        last_build_date.text = formatar_rfc2822(agora())
         
         generator = SubElement(channel, "generator")
         generator.text = f"{settings.APP_NAME} v{settings.VERSION}"
@@ -87,6 +90,11 @@ class RSSService:
         atom_link.set("href", f"{settings.API_BASE_URL}/rss")
         atom_link.set("rel", "self")
         atom_link.set("type", "application/rss+xml")
+        
+        # Leitores com suporte a WebSub assinam o hub e recebem o feed por push
+        hub_link = SubElement(channel, "atom:link")
+        hub_link.set("href", f"{settings.API_BASE_URL}/websub/hub")
+        hub_link.set("rel", "hub")
     
     def _add_news_item(self, channel: Element, noticia: Dict) -> None:
         item = SubElement(channel, "item")
@@ -119,15 +127,11 @@ class RSSService:
         self._add_image_enclosure(item, noticia)
     
     def _add_publication_date(self, item: Element, noticia: Dict) -> None:
-        if noticia.get('data') and noticia['data'] != 'Data não informada':
+        # A data vem normalizada da coleta; só dicionários soltos passam pelo parser (memoizado)
+        data = noticia.get('data_obj') or parse_data(noticia.get('data') or '')
+        if data and data != DATA_MINIMA:
             pub_date = SubElement(item, "pubDate")
-            try:
-                data_noticia_str = noticia['data']
-                data_formatada = self._converter_data_para_rfc2822(data_noticia_str)
-                pub_date.text = data_formatada
-            except Exception as e:
-                logger.warning(f"Erro ao formatar data da notícia '{noticia.get('data')}': {e}")
-                pub_date.text = datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z")
+            pub_date.text = formatar_rfc2822(data)
     
     def _add_image_enclosure(self, item: Element, noticia: Dict) -> None:
         if (noticia.get('imagem') and 
@@ -135,8 +139,10 @@ class RSSService:
             noticia['imagem'].startswith('http')):
             enclosure = SubElement(item, "enclosure")
             enclosure.set("url", noticia['imagem'])
-            enclosure.set("type", "image/jpeg")
-            enclosure.set("length", "0")
+            # Tipo e tamanho reais vêm do HEAD feito no scraping, sem I/O aqui
+            tipo, tamanho = image_metadata_cache.tipo_e_tamanho(noticia['imagem'])
+            enclosure.set("type", tipo)
+            enclosure.set("length", str(tamanho or 0))
     
     def _format_xml(self, rss: Element) -> str:
         xml_str = tostring(rss, encoding='unicode')
@@ -164,35 +170,6 @@ class RSSService:
         xml_str = re.sub(r'\s+_cdata_content="[^"]*"', '', xml_str)
         
         return xml_str
-    
-    def _converter_data_para_rfc2822(self, data_str: str) -> str:
-     
-        try:
-            meses = {
-                'janeiro': 'Jan', 'fevereiro': 'Feb', 'março': 'Mar', 'abril': 'Apr',
-                'maio': 'May', 'junho': 'Jun', 'julho': 'Jul', 'agosto': 'Aug',
-                'setembro': 'Sep', 'outubro': 'Oct', 'novembro': 'Nov', 'dezembro': 'Dec'
-            }
-            
-            dias_semana = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-            
-            partes = data_str.lower().split()
-            if len(partes) >= 5:
-                dia = int(partes[0])
-                mes_nome = partes[2]
-                ano = int(partes[4])
-                
-                mes_abrev = meses.get(mes_nome, 'Jan')
-                
-                data_obj = datetime(ano, list(meses.keys()).index(mes_nome) + 1, dia)
-                dia_semana = dias_semana[data_obj.weekday()]
-                
-                return f"{dia_semana}, {dia:02d} {mes_abrev} {ano} 12:00:00 +0000"
-                
-        except Exception as e:
-            logger.warning(f"Erro ao converter data '{data_str}' para RFC 2822: {e}")
-        
-        return datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z")
 
 
 rss_service = RSSService()
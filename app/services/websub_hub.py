@@ -0,0 +1,288 @@
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from ..core import settings, get_logger
+from ..cache import news_cache
+from ..filters import news_filter
+from .rss_service import rss_service
+
+logger = get_logger(__name__)
+
+
+class Assinatura:
+
+    __slots__ = ('callback', 'topico', 'segredo', 'lease_seconds', 'expira_em', 'entregas', 'falhas')
+
+    def __init__(self, callback: str, topico: str, segredo: Optional[str], lease_seconds: int):
+        self.callback = callback
+        self.topico = topico
+        self.segredo = segredo
+        self.lease_seconds = lease_seconds
+        self.expira_em = datetime.now() + timedelta(seconds=lease_seconds)
+        self.entregas = 0
+        self.falhas = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "callback": self.callback,
+            "topic": self.topico,
+            "lease_seconds": self.lease_seconds,
+            "expires_at": self.expira_em.isoformat(),
+            "entregas": self.entregas,
+            "falhas": self.falhas
+        }
+
+
+class WebSubHub:
+
+    def __init__(self):
+        self.hub_url = f"{settings.API_BASE_URL}/websub/hub"
+        self.topico = f"{settings.API_BASE_URL}/rss"
+        self.assinaturas: Dict[str, Assinatura] = {}
+        self.is_running = False
+        self.stats = {
+            "verificacoes_ok": 0,
+            "verificacoes_falhas": 0,
+            "publicacoes": 0,
+            "entregas_ok": 0,
+            "entregas_falhas": 0,
+            "retentativas": 0,
+            "descartadas_fila_cheia": 0
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fila: Optional[asyncio.Queue] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tarefas: List[asyncio.Task] = []
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def topico_valido(self, topico: str) -> bool:
+        # Aceita o feed pelo caminho: a mesma instância pode ser vista por vários hosts
+        return topico == self.topico or urlparse(topico).path == "/rss"
+
+    def consulta_do_topico(self) -> tuple:
+        return settings.DEFAULT_RSS_NOTICIAS, news_filter.get_filter_summary(use_defaults=True)
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._fila = asyncio.Queue(maxsize=settings.WEBSUB_QUEUE_SIZE)
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=settings.WEBSUB_DELIVERY_TIMEOUT_SECONDS)
+        )
+        self._tarefas = [
+            asyncio.create_task(self._worker(i)) for i in range(settings.WEBSUB_DELIVERY_WORKERS)
+        ]
+        self._tarefas.append(asyncio.create_task(self._manutencao_loop()))
+        logger.info(f"Hub WebSub iniciado - {settings.WEBSUB_DELIVERY_WORKERS} workers de entrega")
+
+    async def stop(self) -> None:
+        self.is_running = False
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas = []
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._loop = None
+        logger.info("Hub WebSub parado")
+
+    def solicitar(self, modo: str, callback: str, topico: str, lease_seconds: Optional[int] = None,
+                  segredo: Optional[str] = None) -> None:
+        if modo not in ("subscribe", "unsubscribe"):
+            raise ValueError(f"hub.mode inválido: '{modo}'")
+        if not callback or urlparse(callback).scheme not in ("http", "https"):
+            raise ValueError("hub.callback deve ser uma URL http(s)")
+        if not self.topico_valido(topico or ""):
+            raise ValueError(f"hub.topic desconhecido: '{topico}' (use {self.topico})")
+        if segredo is not None and len(segredo.encode()) >= 200:
+            raise ValueError("hub.secret deve ter menos de 200 bytes")
+
+        lease = lease_seconds or settings.WEBSUB_LEASE_DEFAULT_SECONDS
+        lease = max(settings.WEBSUB_LEASE_MIN_SECONDS, min(settings.WEBSUB_LEASE_MAX_SECONDS, lease))
+
+        # A verificação é assíncrona: o pedido é aceito (202) e confirmado depois
+        self._enfileirar({
+            "tipo": "verificacao",
+            "modo": modo,
+            "assinatura": Assinatura(callback, topico, segredo, lease)
+        })
+
+    def ao_gravar_cache(self, max_noticias: int, filters: Optional[Dict], data: Dict) -> None:
+        if (max_noticias, filters) == self.consulta_do_topico():
+            self.publicar(data["noticias"])
+
+    def publicar(self, noticias: List) -> None:
+        # Pode ser chamado de threads do scraping: o feed é montado aqui e o envio
+        # fica para o event loop do hub
+        fingerprint = hashlib.sha1(
+            "\n".join(f"{noticia.get('link')}|{noticia.get('titulo')}" for noticia in noticias).encode("utf-8")
+        ).hexdigest()
+
+        with self._lock:
+            anterior = self._fingerprint
+            self._fingerprint = fingerprint
+
+        if anterior is None or anterior == fingerprint or not self.assinaturas or self._loop is None:
+            return
+
+        conteudo = rss_service.generate_rss_xml(noticias).encode("utf-8")
+        self.stats["publicacoes"] += 1
+        logger.info(f"Feed alterado: publicando para {len(self.assinaturas)} assinantes")
+        self._loop.call_soon_threadsafe(self._distribuir, conteudo)
+
+    def _distribuir(self, conteudo: bytes) -> None:
+        for assinatura in list(self.assinaturas.values()):
+            self._enfileirar({"tipo": "entrega", "assinatura": assinatura, "conteudo": conteudo, "tentativa": 1})
+
+    def _enfileirar(self, job: Dict) -> None:
+        if self._fila is None:
+            raise RuntimeError("Hub WebSub não iniciado")
+        try:
+            self._fila.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["descartadas_fila_cheia"] += 1
+            logger.warning(f"Fila do hub WebSub cheia: {job['tipo']} para {job['assinatura'].callback} descartada")
+
+    def _reagendar(self, job: Dict) -> None:
+        tentativa = job["tentativa"]
+        if tentativa >= settings.WEBSUB_DELIVERY_MAX_ATTEMPTS:
+            logger.warning(f"Entrega para {job['assinatura'].callback} abandonada após {tentativa} tentativas")
+            return
+
+        espera = settings.WEBSUB_RETRY_BASE_SECONDS * 2 ** (tentativa - 1)
+        self.stats["retentativas"] += 1
+        self._loop.call_later(espera, self._enfileirar, {**job, "tentativa": tentativa + 1})
+
+    async def _worker(self, numero: int) -> None:
+        while True:
+            job = await self._fila.get()
+            try:
+                if job["tipo"] == "verificacao":
+                    await self._verificar(job["modo"], job["assinatura"])
+                else:
+                    await self._entregar(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro no worker {numero} do hub WebSub: {str(e)}")
+            finally:
+                self._fila.task_done()
+
+    async def _verificar(self, modo: str, assinatura: Assinatura) -> None:
+        desafio = secrets.token_urlsafe(16)
+        params = {
+            "hub.mode": modo,
+            "hub.topic": assinatura.topico,
+            "hub.challenge": desafio
+        }
+        if modo == "subscribe":
+            params["hub.lease_seconds"] = str(assinatura.lease_seconds)
+
+        try:
+            async with self._session.get(assinatura.callback, params=params) as response:
+                corpo = (await response.text()).strip()
+                confirmado = 200 <= response.status < 300 and corpo == desafio
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Verificação de {assinatura.callback} falhou: {str(e)}")
+            confirmado = False
+
+        if not confirmado:
+            self.stats["verificacoes_falhas"] += 1
+            logger.warning(f"Assinante {assinatura.callback} não confirmou o {modo}")
+            return
+
+        self.stats["verificacoes_ok"] += 1
+        if modo == "subscribe":
+            # Reassinar o mesmo callback renova o lease
+            self.assinaturas[assinatura.callback] = assinatura
+            logger.info(f"Assinatura confirmada: {assinatura.callback} (lease {assinatura.lease_seconds}s)")
+        else:
+            self.assinaturas.pop(assinatura.callback, None)
+            logger.info(f"Assinatura cancelada: {assinatura.callback}")
+
+    async def _entregar(self, job: Dict) -> None:
+        assinatura = job["assinatura"]
+        if self.assinaturas.get(assinatura.callback) is not assinatura:
+            return
+
+        headers = {
+            "Content-Type": "application/rss+xml; charset=utf-8",
+            "Link": f'<{self.hub_url}>; rel="hub", <{assinatura.topico}>; rel="self"'
+        }
+        if assinatura.segredo:
+            assinatura_hmac = hmac.new(assinatura.segredo.encode(), job["conteudo"], hashlib.sha256).hexdigest()
+            headers["X-Hub-Signature"] = f"sha256={assinatura_hmac}"
+
+        try:
+            async with self._session.post(assinatura.callback, data=job["conteudo"], headers=headers) as response:
+                await response.read()
+                sucesso = 200 <= response.status < 300
+                if response.status == 410:
+                    # 410 Gone: o assinante não quer mais o conteúdo
+                    self.assinaturas.pop(assinatura.callback, None)
+                    return
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            sucesso = False
+
+        if sucesso:
+            assinatura.entregas += 1
+            self.stats["entregas_ok"] += 1
+        else:
+            assinatura.falhas += 1
+            self.stats["entregas_falhas"] += 1
+            self._reagendar(job)
+
+    async def _manutencao_loop(self) -> None:
+        from .refresh_service import refresh_service
+
+        proximo_refresh = time.monotonic()
+        while self.is_running:
+            try:
+                await asyncio.sleep(settings.WEBSUB_MAINTENANCE_INTERVAL_SECONDS)
+
+                agora = datetime.now()
+                expiradas = [callback for callback, assinatura in self.assinaturas.items() if assinatura.expira_em <= agora]
+                for callback in expiradas:
+                    del self.assinaturas[callback]
+                if expiradas:
+                    logger.info(f"{len(expiradas)} assinaturas WebSub expiradas")
+
+                # Com assinantes, o próprio hub renova o feed no ritmo da cadência dos
+                # sites: quem recebe push não precisa mais fazer polling
+                if self.assinaturas and time.monotonic() >= proximo_refresh:
+                    from ..scrapers import multi_site_scraper
+                    refresh_service.iniciar(entradas_extras=[self.consulta_do_topico()])
+                    proximo_refresh = time.monotonic() + multi_site_scraper.janela_frescor()
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Erro na manutenção do hub WebSub: {str(e)}")
+
+    def get_stats(self) -> Dict:
+        return {
+            "hub": self.hub_url,
+            "topic": self.topico,
+            "ativo": self.is_running,
+            "fila": self._fila.qsize() if self._fila is not None else 0,
+            "assinaturas": [assinatura.to_dict() for assinatura in self.assinaturas.values()],
+            **self.stats
+        }
+
+
+websub_hub = WebSubHub()
+news_cache.observar(websub_hub.ao_gravar_cache)
@@ -0,0 +1,52 @@
+import asyncio
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+
+async def asgi_request(app, method: str, path: str, headers: List[Tuple[bytes, bytes]] = None,
+                       body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench.local")] + (headers or []),
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench.local", 80),
+    }
+
+    enviado = False
+    # O "cliente" só desconecta depois de receber a resposta inteira; desconectar
+    # antes faz o middleware HTTP descartar o corpo de respostas lentas
+    concluida = asyncio.Event()
+
+    async def receive():
+        nonlocal enviado
+        if not enviado:
+            enviado = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await concluida.wait()
+        return {"type": "http.disconnect"}
+
+    resposta = {"status": 0, "headers": {}, "corpo": bytearray()}
+
+    async def send(mensagem):
+        if mensagem["type"] == "http.response.start":
+            resposta["status"] = mensagem["status"]
+            resposta["headers"] = {
+                chave.decode("latin-1").lower(): valor.decode("latin-1")
+                for chave, valor in mensagem.get("headers", [])
+            }
+        elif mensagem["type"] == "http.response.body":
+            resposta["corpo"].extend(mensagem.get("body", b""))
+            if not mensagem.get("more_body", False):
+                concluida.set()
+
+    await app(scope, receive, send)
+    return resposta["status"], resposta["headers"], bytes(resposta["corpo"])
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from benchmarks.run import resumir
+
+
+def noticia_falsa(indice: int):
+    from app.scrapers.noticia import Noticia
+
+    return Noticia(
+        titulo=f"Greve nas universidades federais {indice}",
+        resumo="Docentes das universidades federais discutem a greve da educação",
+        imagem="", link=f"https://exemplo.org/noticia-{indice}", categoria="Notícias",
+        data="10/05/2024", data_obj=datetime(2024, 5, 10), site="ANDES", href=f"/noticia-{indice}"
+    )
+
+
+async def assinante(servico, chegadas: List[float], recebidos: asyncio.Event, total: int, contador: Dict) -> None:
+    async for quadro in servico.stream():
+        if quadro.startswith(b"id:"):
+            chegadas.append(time.perf_counter())
+            contador["n"] += 1
+            if contador["n"] == total:
+                recebidos.set()
+
+
+async def medir(assinantes: int, rodadas: int) -> Dict:
+    from app.services.event_service import EventService
+
+    servico = EventService()
+    servico.ao_descobrir("andes", [noticia_falsa(-1)], [])  # linha de base
+
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    chegadas: List[float] = []
+    tarefas = []
+    latencias = []
+
+    recebidos = asyncio.Event()
+    contador = {"n": 0}
+    for _ in range(assinantes):
+        tarefas.append(asyncio.create_task(assinante(servico, chegadas, recebidos, assinantes, contador)))
+    await asyncio.sleep(0.5)
+    memoria = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(antes, "filename"))
+    tracemalloc.stop()
+
+    for rodada in range(rodadas):
+        chegadas.clear()
+        contador["n"] = 0
+        recebidos.clear()
+        inicio = time.perf_counter()
+        # A publicação vem de uma thread do scraping, como no crawl de verdade
+        threading.Thread(target=servico.ao_descobrir, args=("andes", [noticia_falsa(rodada)], [])).start()
+        await asyncio.wait_for(recebidos.wait(), timeout=30)
+        latencias.append(max(chegadas) - inicio)
+
+    for tarefa in tarefas:
+        tarefa.cancel()
+    await asyncio.gather(*tarefas, return_exceptions=True)
+    await servico.stop()
+
+    return {
+        "assinantes": assinantes,
+        "bytes_por_assinante_ocioso": round(memoria / assinantes),
+        "entrega_para_todos": resumir(latencias)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo do fan-out do stream de eventos com muitos assinantes ociosos")
+    parser.add_argument("--assinantes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rodadas", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    resultados = [asyncio.run(medir(n, args.rodadas)) for n in args.assinantes]
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
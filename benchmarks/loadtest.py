@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from benchmarks.asgi_client import asgi_request
+from benchmarks.run import commit_atual, resumir
+from benchmarks.stub_server import apontar_scrapers, iniciar_stubs
+
+ENDPOINTS = {
+    "noticias": ("GET", "/noticias?max_noticias={max_noticias}"),
+    "rss": ("GET", "/rss?max_noticias={max_noticias}"),
+    "health": ("GET", "/health"),
+    "cache_stats": ("GET", "/cache/stats"),
+    "cache_info": ("GET", "/cache/info"),
+}
+
+MIX_PADRAO = "noticias=55,rss=35,health=5,cache_stats=3,cache_info=2"
+
+Enviar = Callable[[str, str], Awaitable[int]]
+
+
+def parse_mix(texto: str) -> List[Tuple[str, float]]:
+    mix = []
+    for parte in texto.split(","):
+        nome, _, peso = parte.partition("=")
+        nome = nome.strip()
+        if nome not in ENDPOINTS:
+            raise ValueError(f"Endpoint desconhecido no mix: '{nome}' (disponíveis: {', '.join(ENDPOINTS)})")
+        mix.append((nome, float(peso or 1)))
+    return mix
+
+
+class Coletor:
+
+    def __init__(self, janela_pos_expiracao: float):
+        self.janela_pos_expiracao = janela_pos_expiracao
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.latencias_pos_expiracao: Dict[str, List[float]] = defaultdict(list)
+        self.status: Dict[str, Counter] = defaultdict(Counter)
+        self.ultima_expiracao: Optional[float] = None
+
+    def registrar(self, nome: str, inicio: float, duracao: float, status) -> None:
+        self.latencias[nome].append(duracao)
+        self.status[nome][str(status)] += 1
+        if self.ultima_expiracao is not None and 0 <= inicio - self.ultima_expiracao <= self.janela_pos_expiracao:
+            self.latencias_pos_expiracao[nome].append(duracao)
+
+    def relatorio(self, duracao_total: float) -> Dict:
+        todas = [valor for valores in self.latencias.values() for valor in valores]
+        por_endpoint = {}
+        for nome, valores in sorted(self.latencias.items()):
+            por_endpoint[nome] = {
+                **resumir(valores),
+                "requisicoes_por_segundo": round(len(valores) / duracao_total, 1),
+                "status": dict(self.status[nome]),
+            }
+            if self.latencias_pos_expiracao.get(nome):
+                por_endpoint[nome]["pos_expiracao"] = resumir(self.latencias_pos_expiracao[nome])
+
+        return {
+            "duracao_segundos": round(duracao_total, 2),
+            "total_requisicoes": len(todas),
+            "requisicoes_por_segundo": round(len(todas) / duracao_total, 1) if duracao_total else None,
+            "geral": resumir(todas),
+            "por_endpoint": por_endpoint,
+        }
+
+
+async def executar_carga(enviar: Enviar, mix: List[Tuple[str, float]], max_noticias: int, duracao: float,
+                         concorrencia: int, rps: Optional[float], intervalo_expiracao: Optional[float],
+                         janela_pos_expiracao: float) -> Dict:
+    coletor = Coletor(janela_pos_expiracao)
+    nomes = [nome for nome, _ in mix]
+    pesos = [peso for _, peso in mix]
+    fim = time.perf_counter() + duracao
+    limite = asyncio.Semaphore(concorrencia)
+
+    async def uma_requisicao():
+        nome = random.choices(nomes, pesos)[0]
+        metodo, path = ENDPOINTS[nome]
+        inicio = time.perf_counter()
+        try:
+            status = await enviar(metodo, path.format(max_noticias=max_noticias))
+        except Exception as e:
+            status = type(e).__name__
+        coletor.registrar(nome, inicio, time.perf_counter() - inicio, status)
+
+    async def trabalhador_fechado():
+        while time.perf_counter() < fim:
+            await uma_requisicao()
+
+    async def gerador_aberto():
+        # Carga em malha aberta: as chegadas seguem a taxa pedida mesmo que o servidor atrase
+        intervalo = 1.0 / rps
+        pendentes = set()
+        proxima = time.perf_counter()
+        while proxima < fim:
+            await asyncio.sleep(max(0.0, proxima - time.perf_counter()))
+            proxima += intervalo
+
+            async def limitada():
+                async with limite:
+                    await uma_requisicao()
+
+            tarefa = asyncio.create_task(limitada())
+            pendentes.add(tarefa)
+            tarefa.add_done_callback(pendentes.discard)
+        if pendentes:
+            await asyncio.gather(*pendentes)
+
+    async def expirador():
+        while True:
+            await asyncio.sleep(intervalo_expiracao)
+            if time.perf_counter() >= fim:
+                return
+            coletor.ultima_expiracao = time.perf_counter()
+            await enviar("POST", "/cache/clear")
+
+    tarefa_expiracao = asyncio.create_task(expirador()) if intervalo_expiracao else None
+    inicio = time.perf_counter()
+    try:
+        if rps:
+            await gerador_aberto()
+        else:
+            await asyncio.gather(*(trabalhador_fechado() for _ in range(concorrencia)))
+    finally:
+        if tarefa_expiracao:
+            tarefa_expiracao.cancel()
+
+    return coletor.relatorio(time.perf_counter() - inicio)
+
+
+def enviar_em_processo() -> Enviar:
+    import main
+
+    async def enviar(metodo: str, path: str) -> int:
+        status, _, _ = await asgi_request(main.app, metodo, path)
+        return status
+
+    return enviar
+
+
+class ServidorLocal:
+
+    def __init__(self):
+        import uvicorn
+        import main
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.porta = sock.getsockname()[1]
+
+        # lifespan desligado: o keep-alive não deve pingar a instância de produção
+        config = uvicorn.Config(main.app, host="127.0.0.1", port=self.porta, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self) -> "ServidorLocal":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+async def executar_via_localhost(porta: int, concorrencia: int, **kwargs) -> Dict:
+    import aiohttp
+
+    base = f"http://127.0.0.1:{porta}"
+    conector = aiohttp.TCPConnector(limit=concorrencia)
+    async with aiohttp.ClientSession(connector=conector, timeout=aiohttp.ClientTimeout(total=120)) as session:
+
+        async def enviar(metodo: str, path: str) -> int:
+            async with session.request(metodo, f"{base}{path}") as response:
+                await response.read()
+                return response.status
+
+        return await executar_com_aquecimento(enviar, concorrencia=concorrencia, **kwargs)
+
+
+async def executar_com_aquecimento(enviar: Enviar, mix, max_noticias: int, **kwargs) -> Dict:
+    for nome, _ in mix:
+        metodo, path = ENDPOINTS[nome]
+        await enviar(metodo, path.format(max_noticias=max_noticias))
+    return await executar_carga(enviar, mix, max_noticias, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da API com origens substituídas pelo stub local")
+    parser.add_argument("--modo", choices=["processo", "localhost"], default="processo",
+                        help="chamar o app ASGI em processo ou via uvicorn em localhost")
+    parser.add_argument("--cenario", choices=["estavel", "tempestade"], default="estavel",
+                        help="'tempestade' limpa o cache periodicamente durante a carga")
+    parser.add_argument("--mix", default=MIX_PADRAO, help="pesos por endpoint, ex.: noticias=60,rss=40")
+    parser.add_argument("--duracao", type=float, default=20.0, help="segundos de carga medida")
+    parser.add_argument("--concorrencia", type=int, default=32)
+    parser.add_argument("--rps", type=float, default=None, help="taxa de chegada fixa (malha aberta)")
+    parser.add_argument("--intervalo-expiracao", type=float, default=5.0, help="segundos entre limpezas de cache no cenário tempestade")
+    parser.add_argument("--janela-pos-expiracao", type=float, default=2.0)
+    parser.add_argument("--max-noticias", type=int, default=10)
+    parser.add_argument("--latencia-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--rate", type=float, default=20.0, help="requisições/s permitidas por host no stub")
+    parser.add_argument("--burst", type=float, default=5.0)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from app.scrapers import multi_site_scraper
+
+    mix = parse_mix(args.mix)
+    parametros_carga = {
+        "mix": mix,
+        "max_noticias": args.max_noticias,
+        "duracao": args.duracao,
+        "rps": args.rps,
+        "intervalo_expiracao": args.intervalo_expiracao if args.cenario == "tempestade" else None,
+        "janela_pos_expiracao": args.janela_pos_expiracao,
+    }
+
+    stubs = iniciar_stubs(args.latencia_ms, args.jitter_ms)
+    servidor = None
+    try:
+        apontar_scrapers(multi_site_scraper, stubs, args.rate, args.burst)
+
+        if args.modo == "processo":
+            resultado = asyncio.run(executar_com_aquecimento(
+                enviar_em_processo(), concorrencia=args.concorrencia, **parametros_carga
+            ))
+        else:
+            servidor = ServidorLocal().start()
+            resultado = asyncio.run(executar_via_localhost(servidor.porta, args.concorrencia, **parametros_carga))
+
+        requisicoes_origem = {nome: dict(stub.requisicoes) for nome, stub in stubs.items()}
+    finally:
+        if servidor:
+            servidor.stop()
+        for stub in stubs.values():
+            stub.stop()
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(),
+        "git_commit": commit_atual(),
+        "parametros": {chave: str(valor) if isinstance(valor, Path) else valor for chave, valor in vars(args).items()},
+        "resultado": resultado,
+        "requisicoes_origem": requisicoes_origem,
+    }
+
+    saida = args.output or RAIZ / "benchmarks" / "results" / f"load-{args.cenario}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"{'endpoint':<14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for nome, dados in resultado["por_endpoint"].items():
+        print(f"{nome:<14}{dados['requisicoes_por_segundo']:>10}{dados['mediana_ms']:>10}{dados['p95_ms']:>10}{dados['p99_ms']:>10}")
+    print(f"total: {resultado['requisicoes_por_segundo']} req/s - resultados em {saida}")
+
+
+if __name__ == "__main__":
+    main()
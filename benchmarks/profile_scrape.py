@@ -0,0 +1,93 @@
+import argparse
+import cProfile
+import io
+import logging
+import pstats
+import sys
+from concurrent.futures import Executor, Future
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+
+class ExecutorSincrono(Executor):
+
+    # Executa as tarefas na própria thread: o cProfile só enxerga a thread em que foi ativado
+    def submit(self, fn, *args, **kwargs):
+        futuro = Future()
+        try:
+            futuro.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            futuro.set_exception(e)
+        return futuro
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfila o scraping reproduzindo respostas gravadas (cassette)")
+    parser.add_argument("cassette", type=Path, help="diretório do cassette")
+    parser.add_argument("--gravar", action="store_true",
+                        help="grava um crawl novo no cassette antes de perfilar (usa as origens reais, ou o stub com --stub)")
+    parser.add_argument("--stub", action="store_true", help="grava a partir do stub local em vez das origens reais")
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="latência simulada no replay")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--max-noticias", type=int, default=20)
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--saida-prof", type=Path, default=None, help="grava o perfil bruto para snakeviz/pstats")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from app.scrapers import multi_site_scraper
+    from app.scrapers.cassette import Cassette
+    from app.scrapers.http_client import http_client
+
+    from benchmarks.stub_server import apontar_scrapers, iniciar_stubs, isolar_armazenamento, limpar_estado
+
+    stubs = {}
+    if args.stub:
+        stubs = iniciar_stubs()
+        apontar_scrapers(multi_site_scraper, stubs, rate=1000, burst=1000)
+    else:
+        isolar_armazenamento(multi_site_scraper)
+
+    try:
+        if args.gravar:
+            # O replay parte do mesmo estado vazio da gravação
+            limpar_estado(multi_site_scraper)
+            http_client.cassette = Cassette(str(args.cassette), modo="record")
+            multi_site_scraper.obter_noticias(max_noticias=args.max_noticias)
+            print(f"Gravadas {http_client.cassette.stats['gravadas']} respostas em {args.cassette}", file=sys.stderr)
+
+        http_client.cassette = Cassette(str(args.cassette), modo="replay", latencia_replay_ms=args.latencia_ms)
+        multi_site_scraper._executor_sites = ExecutorSincrono()
+        multi_site_scraper._executor_listagem = ExecutorSincrono()
+        multi_site_scraper._executor_artigos = ExecutorSincrono()
+        http_client._executor_hedge = ExecutorSincrono()
+
+        perfil = cProfile.Profile()
+        for _ in range(args.repeticoes):
+            limpar_estado(multi_site_scraper)
+            perfil.enable()
+            multi_site_scraper.obter_noticias(max_noticias=args.max_noticias)
+            perfil.disable()
+    finally:
+        for stub in stubs.values():
+            stub.stop()
+
+    stats = http_client.cassette.stats
+    if stats["ausentes"]:
+        print(f"Aviso: {stats['ausentes']} requisições não estavam no cassette", file=sys.stderr)
+
+    if args.saida_prof:
+        perfil.dump_stats(str(args.saida_prof))
+
+    saida = io.StringIO()
+    pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(args.top)
+    print(saida.getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import requests
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from benchmarks.asgi_client import asgi_request
+from benchmarks.stub_server import FIXTURES_DIR, apontar_scrapers, iniciar_stubs, limpar_estado
+
+
+def resumir(amostras: List[float]) -> Dict:
+    ordenadas = sorted(amostras)
+    if not ordenadas:
+        return {"n": 0}
+
+    def percentil(p: float) -> float:
+        indice = min(len(ordenadas) - 1, max(0, round(p / 100 * len(ordenadas) + 0.5) - 1))
+        return ordenadas[indice]
+
+    return {
+        "n": len(ordenadas),
+        "media_ms": round(statistics.fmean(ordenadas) * 1000, 3),
+        "mediana_ms": round(statistics.median(ordenadas) * 1000, 3),
+        "p95_ms": round(percentil(95) * 1000, 3),
+        "p99_ms": round(percentil(99) * 1000, 3),
+        "min_ms": round(ordenadas[0] * 1000, 3),
+        "max_ms": round(ordenadas[-1] * 1000, 3),
+    }
+
+
+def cronometrar(fn: Callable, repeticoes: int) -> List[float]:
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        amostras.append(time.perf_counter() - inicio)
+    return amostras
+
+
+def resposta_de_fixture(arquivo: Path) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    response._content = arquivo.read_bytes()
+    return response
+
+
+def bench_scrape(multi_site_scraper, stubs, repeticoes: int, max_noticias: int) -> Dict:
+    frio, quente, requisicoes_frio, requisicoes_quente = [], [], [], []
+
+    for _ in range(repeticoes):
+        limpar_estado(multi_site_scraper)
+
+        for stub in stubs.values():
+            stub.requisicoes.clear()
+        inicio = time.perf_counter()
+        multi_site_scraper.obter_noticias(max_noticias=max_noticias, apply_filters=True)
+        frio.append(time.perf_counter() - inicio)
+        requisicoes_frio.append(sum(sum(stub.requisicoes.values()) for stub in stubs.values()))
+
+        for stub in stubs.values():
+            stub.requisicoes.clear()
+        inicio = time.perf_counter()
+        multi_site_scraper.obter_noticias(max_noticias=max_noticias, apply_filters=True)
+        quente.append(time.perf_counter() - inicio)
+        requisicoes_quente.append(sum(sum(stub.requisicoes.values()) for stub in stubs.values()))
+
+    return {
+        "frio": {**resumir(frio), "requisicoes_origem": statistics.fmean(requisicoes_frio)},
+        "incremental": {**resumir(quente), "requisicoes_origem": statistics.fmean(requisicoes_quente)},
+    }
+
+
+def bench_artigos(multi_site_scraper, repeticoes: int) -> Dict:
+    resultados = {}
+
+    for site_nome, scraper in multi_site_scraper.scrapers.items():
+        parse, resumo, imagem = [], [], []
+        for arquivo in sorted((FIXTURES_DIR / site_nome).glob("noticia_*.html")):
+            response = resposta_de_fixture(arquivo)
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                soup = scraper._processar_pagina_com_encoding_correto(response)
+                meio = time.perf_counter()
+                scraper._extrair_resumo(soup)
+                fim_resumo = time.perf_counter()
+                scraper._extrair_imagem(soup)
+                fim = time.perf_counter()
+
+                parse.append(meio - inicio)
+                resumo.append(fim_resumo - meio)
+                imagem.append(fim - fim_resumo)
+
+        resultados[site_nome] = {
+            "html_parse": resumir(parse),
+            "summary_extract": resumir(resumo),
+            "image_extract_com_head": resumir(imagem),
+        }
+
+    return resultados
+
+
+def bench_filtro(noticias: List[Dict], tamanho: int, repeticoes: int) -> Dict:
+    from app.filters import news_filter
+
+    lote = (noticias * (tamanho // max(len(noticias), 1) + 1))[:tamanho]
+    amostras = cronometrar(lambda: news_filter.filter_news(lote, use_defaults=True), repeticoes)
+    mediana = statistics.median(amostras)
+
+    return {
+        **resumir(amostras),
+        "noticias_por_lote": len(lote),
+        "noticias_por_segundo": round(len(lote) / mediana) if mediana else None,
+    }
+
+
+def bench_rss(noticias: List[Dict], repeticoes: int) -> Dict:
+    from app.services import rss_service
+
+    amostras = cronometrar(lambda: rss_service.generate_rss_xml(noticias), repeticoes)
+    return {**resumir(amostras), "noticias_por_feed": len(noticias)}
+
+
+def bench_memoria(noticias: List, entradas: int) -> Dict:
+    # Simula várias entradas de cache, cada uma vinda de um scrape diferente
+    # (strings novas a cada vez), no formato antigo (dict) e no atual (Noticia)
+    from app.cache import tamanho_aproximado
+    from app.scrapers.noticia import Noticia
+
+    def nova(texto):
+        return texto.encode("utf-8").decode("utf-8") if isinstance(texto, str) else texto
+
+    def como_dict(noticia) -> Dict:
+        return {campo: nova(getattr(noticia, campo)) for campo in Noticia.__slots__}
+
+    def como_noticia(noticia) -> Noticia:
+        return Noticia(**{campo: nova(getattr(noticia, campo)) for campo in Noticia.__slots__})
+
+    resultados = {}
+    for nome, construir in (("dict", como_dict), ("noticia", como_noticia)):
+        tracemalloc.start()
+        antes, _ = tracemalloc.get_traced_memory()
+        cache = [{"noticias": [construir(noticia) for noticia in noticias]} for _ in range(entradas)]
+        depois, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        total_artigos = entradas * len(noticias)
+        resultados[nome] = {
+            "bytes_por_artigo": round((depois - antes) / total_artigos),
+            "bytes_estimados_por_artigo": round(sum(tamanho_aproximado(entrada) for entrada in cache) / total_artigos),
+        }
+        del cache
+
+    resultados["reducao_percentual"] = round(
+        100 * (1 - resultados["noticia"]["bytes_por_artigo"] / resultados["dict"]["bytes_por_artigo"]), 1
+    )
+    return resultados
+
+
+def bench_cache_hit(requisicoes: int, max_noticias: int) -> Dict:
+    import main
+
+    resultados = {}
+
+    async def executar(path: str) -> List[float]:
+        status, _, _ = await asgi_request(main.app, "GET", path)
+        if status != 200:
+            raise RuntimeError(f"{path} retornou status {status} no aquecimento")
+
+        amostras = []
+        for _ in range(requisicoes):
+            inicio = time.perf_counter()
+            await asgi_request(main.app, "GET", path)
+            amostras.append(time.perf_counter() - inicio)
+        return amostras
+
+    for path in (f"/noticias?max_noticias={max_noticias}", f"/rss?max_noticias={max_noticias}"):
+        amostras = asyncio.run(executar(path))
+        total = sum(amostras)
+        resultados[path] = {
+            **resumir(amostras),
+            "requisicoes_por_segundo": round(len(amostras) / total, 1) if total else None,
+        }
+
+    return resultados
+
+
+def commit_atual() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, text=True).strip()
+    except Exception:
+        return "desconhecido"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline do scraping, filtragem, RSS e cache")
+    parser.add_argument("--latencia-ms", type=float, default=50.0, help="latência simulada das origens")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="variação aleatória da latência")
+    parser.add_argument("--rate", type=float, default=50.0, help="requisições/s permitidas por host no stub")
+    parser.add_argument("--burst", type=float, default=10.0, help="rajada permitida por host no stub")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--max-noticias", type=int, default=20)
+    parser.add_argument("--requisicoes-cache", type=int, default=2000)
+    parser.add_argument("--output", type=Path, default=None, help="arquivo JSON de saída")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from app.scrapers import multi_site_scraper
+
+    stubs = iniciar_stubs(args.latencia_ms, args.jitter_ms)
+    try:
+        apontar_scrapers(multi_site_scraper, stubs, args.rate, args.burst)
+
+        resultados = {}
+        print("scrape end-to-end...", file=sys.stderr)
+        resultados["scrape_multi_site"] = bench_scrape(multi_site_scraper, stubs, args.repeticoes, args.max_noticias)
+
+        print("parse e extração por artigo...", file=sys.stderr)
+        resultados["artigo"] = bench_artigos(multi_site_scraper, args.repeticoes)
+
+        noticias = multi_site_scraper.obter_noticias(max_noticias=args.max_noticias)
+
+        print("filtragem...", file=sys.stderr)
+        resultados["filter_news"] = bench_filtro(noticias, 1000, args.repeticoes * 4)
+
+        print("RSS...", file=sys.stderr)
+        resultados["generate_rss_xml"] = bench_rss(noticias, args.repeticoes * 20)
+
+        print("memória por artigo em cache...", file=sys.stderr)
+        resultados["memoria_cache"] = bench_memoria(noticias, 200)
+
+        print("requisições com cache hit...", file=sys.stderr)
+        resultados["cache_hit"] = bench_cache_hit(args.requisicoes_cache, args.max_noticias)
+    finally:
+        for stub in stubs.values():
+            stub.stop()
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(),
+        "git_commit": commit_atual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {chave: str(valor) if isinstance(valor, Path) else valor for chave, valor in vars(args).items()},
+        "resultados": resultados,
+    }
+
+    saida = args.output or RAIZ / "benchmarks" / "results" / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados gravados em {saida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import atexit
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+SITES = {
+    "andes": {
+        "listagem": "/sites/noticias",
+        "param_pagina": "page",
+        "artigo": re.compile(r"^/conteudos/noticia/(?P<chave>[^/]+)$"),
+    },
+    "csp-conlutas": {
+        "listagem": "/noticias",
+        "param_pagina": "p",
+        "artigo": re.compile(r"^/noticias/n/(?P<chave>\d+)/"),
+    },
+}
+
+LISTAGEM_VAZIA = b"<!DOCTYPE html><html><body><main><h1>Not\xc3\xadcias</h1></main></body></html>"
+IMAGEM_FALSA = b"\xff\xd8\xff\xe0" + b"\x00" * 20476
+
+
+class OriginStub:
+
+    def __init__(self, site: str, host_publico: str = "127.0.0.1", latencia_ms: float = 0.0,
+                 jitter_ms: float = 0.0, fixtures_dir: Path = FIXTURES_DIR):
+        self.site = site
+        self.rotas = SITES[site]
+        self.host_publico = host_publico
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.fixtures_dir = fixtures_dir / site
+        self.requisicoes = Counter()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host_publico}:{self._server.server_address[1]}"
+
+    @property
+    def noticias_url(self) -> str:
+        return f"{self.base_url}{self.rotas['listagem']}"
+
+    def start(self) -> "OriginStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._responder(self, com_corpo=True)
+
+            def do_HEAD(self):
+                stub._responder(self, com_corpo=False)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _simular_latencia(self) -> None:
+        atraso = self.latencia_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if atraso > 0:
+            time.sleep(atraso / 1000)
+
+    def _resolver(self, path: str, query: Dict) -> tuple:
+        if path == self.rotas["listagem"]:
+            pagina = int(query.get(self.rotas["param_pagina"], ["0"])[0] or 0)
+            arquivo = self.fixtures_dir / f"listagem_{pagina}.html"
+            corpo = arquivo.read_bytes() if arquivo.exists() else LISTAGEM_VAZIA
+            return "listagem", 200, "text/html; charset=utf-8", corpo
+
+        match = self.rotas["artigo"].match(path)
+        if match:
+            arquivo = self.fixtures_dir / f"noticia_{match.group('chave')}.html"
+            if arquivo.exists():
+                return "artigo", 200, "text/html; charset=utf-8", arquivo.read_bytes()
+            return "artigo", 404, "text/html; charset=utf-8", b"<html><body>404</body></html>"
+
+        if path.lower().endswith((".jpg", ".jpeg", ".png", ".webp", ".gif")):
+            return "imagem", 200, "image/jpeg", IMAGEM_FALSA
+
+        return "outro", 404, "text/plain", b"not found"
+
+    def _responder(self, handler: BaseHTTPRequestHandler, com_corpo: bool) -> None:
+        url = urlparse(handler.path)
+        tipo, status, content_type, corpo = self._resolver(url.path, parse_qs(url.query))
+        self.requisicoes[f"{handler.command} {tipo}"] += 1
+
+        self._simular_latencia()
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(corpo)))
+        handler.end_headers()
+        if com_corpo:
+            handler.wfile.write(corpo)
+
+
+def iniciar_stubs(latencia_ms: float = 0.0, jitter_ms: float = 0.0) -> Dict[str, OriginStub]:
+    # Hosts públicos diferentes para que cada site tenha o seu bucket de politeness
+    return {
+        "andes": OriginStub("andes", "127.0.0.1", latencia_ms, jitter_ms).start(),
+        "csp-conlutas": OriginStub("csp-conlutas", "localhost", latencia_ms, jitter_ms).start(),
+    }
+
+
+def isolar_armazenamento(multi_site_scraper) -> Path:
+    # Índice de duplicatas, marcas do delta e textos completos num diretório
+    # temporário: os benchmarks não gravam entradas do stub nos arquivos da instância
+    from app.scrapers.conteudo_store import conteudo_store
+    from app.services.delta_service import delta_service
+
+    diretorio = Path(tempfile.mkdtemp(prefix="andes-bench-"))
+    atexit.register(shutil.rmtree, diretorio, True)
+    multi_site_scraper.duplicatas.caminho = diretorio / "duplicatas.json"
+    conteudo_store.diretorio = diretorio / "conteudos"
+    delta_service.caminho = diretorio / "delta.json"
+    delta_service.primeira_vez.clear()
+    limpar_estado(multi_site_scraper)
+    return diretorio
+
+
+def limpar_estado(multi_site_scraper) -> None:
+    # Tudo o que faz um crawl deixar de ser frio
+    from app.scrapers.conteudo_store import conteudo_store
+
+    for estado in multi_site_scraper.crawl_states.values():
+        estado.limpar()
+    multi_site_scraper.duplicatas.limpar()
+    conteudo_store.limpar()
+
+
+def apontar_scrapers(multi_site_scraper, stubs: Dict[str, OriginStub], rate: float, burst: float) -> None:
+    from app.scrapers.politeness import host_da_url, politeness_scheduler
+
+    isolar_armazenamento(multi_site_scraper)
+
+    for site_nome, stub in stubs.items():
+        scraper = multi_site_scraper.scrapers[site_nome]
+        scraper.base_url = stub.base_url
+        scraper.noticias_url = stub.noticias_url
+        politeness_scheduler.limites[host_da_url(stub.base_url)] = {"rate": rate, "burst": burst}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor local com as páginas gravadas da ANDES e da CSP-Conlutas")
+    parser.add_argument("--latencia-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    stubs = iniciar_stubs(args.latencia_ms, args.jitter_ms)
+    for nome, stub in stubs.items():
+        print(f"{nome}: {stub.noticias_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        for stub in stubs.values():
+            stub.stop()
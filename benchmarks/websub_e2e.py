@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from benchmarks.loadtest import ServidorLocal
+from benchmarks.stub_server import FIXTURES_DIR, OriginStub, apontar_scrapers
+
+
+class AssinanteStub:
+    # Assinante WebSub local: confirma os desafios do hub e guarda as entregas
+
+    def __init__(self, nome: str, segredo: Optional[str] = None, falhas_iniciais: int = 0):
+        self.nome = nome
+        self.segredo = segredo
+        self.falhas_restantes = falhas_iniciais
+        self.verificacoes: List[Dict] = []
+        self.entregas: List[Dict] = []
+        self.recusadas = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def callback(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/callback/{self.nome}"
+
+    def start(self) -> "AssinanteStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                params = {chave: valores[0] for chave, valores in parse_qs(urlparse(self.path).query).items()}
+                stub.verificacoes.append(params)
+                corpo = params.get("hub.challenge", "").encode()
+                self._responder(200, corpo)
+
+            def do_POST(self):
+                corpo = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if stub.falhas_restantes > 0:
+                    stub.falhas_restantes -= 1
+                    stub.recusadas += 1
+                    self._responder(503, b"")
+                    return
+                stub.entregas.append({"headers": dict(self.headers), "corpo": corpo})
+                self._responder(200, b"")
+
+            def _responder(self, status: int, corpo: bytes):
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def assinatura_valida(self, entrega: Dict) -> bool:
+        if not self.segredo:
+            return True
+        esperada = hmac.new(self.segredo.encode(), entrega["corpo"], hashlib.sha256).hexdigest()
+        return entrega["headers"].get("X-Hub-Signature") == f"sha256={esperada}"
+
+
+def preparar_fixtures(destino: Path) -> None:
+    # Antes da "publicação" as origens mostram só as páginas mais antigas
+    shutil.copytree(FIXTURES_DIR, destino / "original")
+    shutil.copytree(FIXTURES_DIR, destino / "atual")
+    for site_dir in (destino / "atual").iterdir():
+        for pagina in (0, 1):
+            shutil.copy(destino / "original" / site_dir.name / f"listagem_{pagina + 1}.html", site_dir / f"listagem_{pagina}.html")
+        (site_dir / "listagem_2.html").unlink()
+
+
+def publicar_fixtures(destino: Path) -> None:
+    for site_dir in (destino / "original").iterdir():
+        for arquivo in site_dir.glob("listagem_*.html"):
+            shutil.copy(arquivo, destino / "atual" / site_dir.name / arquivo.name)
+
+
+def esperar(condicao, timeout: float, descricao: str) -> None:
+    limite = time.monotonic() + timeout
+    while not condicao():
+        if time.monotonic() > limite:
+            raise TimeoutError(f"Tempo esgotado esperando {descricao}")
+        time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste ponta a ponta do hub WebSub contra assinantes locais")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from app.core.config import settings
+    from app.scrapers import multi_site_scraper
+
+    settings.WEBSUB_RETRY_BASE_SECONDS = 0.2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        preparar_fixtures(tmp)
+        stubs = {
+            "andes": OriginStub("andes", "127.0.0.1", fixtures_dir=tmp / "atual").start(),
+            "csp-conlutas": OriginStub("csp-conlutas", "localhost", fixtures_dir=tmp / "atual").start(),
+        }
+        apontar_scrapers(multi_site_scraper, stubs, rate=100, burst=100)
+
+        servidor = ServidorLocal().start()
+        base = f"http://127.0.0.1:{servidor.porta}"
+        assinantes = [
+            AssinanteStub("leitor").start(),
+            AssinanteStub("instavel", segredo="s3gredo", falhas_iniciais=2).start(),
+        ]
+
+        try:
+            rss = requests.get(f"{base}/rss", timeout=60)
+            if 'rel="hub"' not in rss.headers.get("Link", ""):
+                raise AssertionError("/rss não anuncia o hub no header Link")
+
+            for assinante in assinantes:
+                dados = {"hub.mode": "subscribe", "hub.topic": f"{base}/rss", "hub.callback": assinante.callback}
+                if assinante.segredo:
+                    dados["hub.secret"] = assinante.segredo
+                resposta = requests.post(f"{base}/websub/hub", data=urlencode(dados),
+                                         headers={"Content-Type": "application/x-www-form-urlencoded"}, timeout=10)
+                if resposta.status_code != 202:
+                    raise AssertionError(f"Assinatura recusada: {resposta.status_code} {resposta.text}")
+
+            esperar(lambda: len(requests.get(f"{base}/websub/stats").json()["assinaturas"]) == 2,
+                    args.timeout, "a verificação das assinaturas")
+
+            publicar_fixtures(tmp)
+            job = requests.post(f"{base}/cache/refresh", timeout=10).json()
+            esperar(lambda: requests.get(f"{base}/cache/refresh/{job['id']}").json()["status"] in ("concluido", "erro"),
+                    args.timeout, "o refresh do cache")
+            esperar(lambda: all(assinante.entregas for assinante in assinantes), args.timeout, "as entregas")
+
+            resposta = requests.post(
+                f"{base}/websub/hub",
+                data=urlencode({"hub.mode": "unsubscribe", "hub.topic": f"{base}/rss", "hub.callback": assinantes[0].callback}),
+                headers={"Content-Type": "application/x-www-form-urlencoded"}, timeout=10
+            )
+            esperar(lambda: len(requests.get(f"{base}/websub/stats").json()["assinaturas"]) == 1,
+                    args.timeout, "o cancelamento da assinatura")
+
+            relatorio = {
+                "hub": requests.get(f"{base}/websub/stats").json(),
+                "assinantes": {
+                    assinante.nome: {
+                        "verificacoes": len(assinante.verificacoes),
+                        "entregas": len(assinante.entregas),
+                        "recusadas": assinante.recusadas,
+                        "assinaturas_hmac_validas": all(assinante.assinatura_valida(e) for e in assinante.entregas),
+                        "itens_no_feed": assinante.entregas[0]["corpo"].count(b"<item>"),
+                    }
+                    for assinante in assinantes
+                },
+            }
+            print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+
+            if not all(dados["assinaturas_hmac_validas"] for dados in relatorio["assinantes"].values()):
+                raise AssertionError("Assinatura HMAC inválida em alguma entrega")
+        finally:
+            for assinante in assinantes:
+                assinante.stop()
+            servidor.stop()
+            for stub in stubs.values():
+                stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
 from datetime import datetime
+from urllib.parse import parse_qsl
 
 from app import (
     settings, 
@@ -10,9 +12,14 @@ from app import (
     info_router, 
     noticias_router, 
     cache_router, 
-    rss_router
+    rss_router,
+    metrics_router,
+    websub_router,
+    websub_hub,
+    event_service
 )
 from app.models import ErrorResponse
+from app.core import timing
 
 setup_logging()
 
@@ -32,10 +39,77 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class RequestTimingMiddleware:
+
+    # Middleware ASGI puro: sem instrumentação pedida, a requisição vai direto
+    # para a aplicação, sem a tarefa e o stream intermediários que o
+    # @app.middleware("http") mantém abertos durante cada conexão SSE
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug_timing = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"))).get("debug") == "timing"
+        if not (debug_timing or settings.SERVER_TIMING_ENABLED or settings.SLOW_REQUEST_LOG_THRESHOLD_MS):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        async def enviar(message):
+            if message["type"] != "http.response.start":
+                # No modo debug o corpo original é descartado
+                if not debug_timing:
+                    await send(message)
+                return
+
+            # A medição vai até o início da resposta, como o cabeçalho exige
+            limite_ms = settings.SLOW_REQUEST_LOG_THRESHOLD_MS
+            if limite_ms and raiz.duracao_ms >= limite_ms:
+                from app.core import get_logger
+                logger = get_logger(__name__)
+                logger.warning(
+                    "Requisição lenta %s %s: %.1fms\n%s", request.method, request.url, raiz.duracao_ms, timing.formatar_arvore(raiz)
+                )
+
+            server_timing = timing.server_timing_header(raiz)
+
+            if debug_timing:
+                headers = MutableHeaders(raw=message["headers"])
+                resposta = JSONResponse(
+                    content={
+                        "path": request.url.path,
+                        "status_code": message["status"],
+                        "media_type": headers.get("content-type"),
+                        "total_ms": round(raiz.duracao_ms, 2),
+                        "etapas": [filho.to_dict(raiz.inicio) for filho in raiz.filhos]
+                    },
+                    headers={"Server-Timing": server_timing}
+                )
+                await send({"type": "http.response.start", "status": resposta.status_code, "headers": resposta.raw_headers})
+                await send({"type": "http.response.body", "body": resposta.body})
+                return
+
+            MutableHeaders(scope=message).append("Server-Timing", server_timing)
+            await send(message)
+
+        with timing.trace(request.url.path) as raiz:
+            await self.app(scope, receive, enviar)
+
+
+app.add_middleware(RequestTimingMiddleware)
+
+
 app.include_router(info_router)
 app.include_router(noticias_router)
 app.include_router(cache_router)
 app.include_router(rss_router)
+app.include_router(metrics_router)
+app.include_router(websub_router)
 
 
 @app.on_event("startup")
@@ -50,6 +124,9 @@ async def startup_event():
         logger = get_logger(__name__)
         logger.error(f"Erro ao iniciar keep-alive service: {str(e)}")
         pass
+    
+    await websub_hub.start()
+    await event_service.start()
 
 
 @app.on_event("shutdown")
@@ -63,6 +140,9 @@ async def shutdown_event():
         from app.core import get_logger
         logger = get_logger(__name__)
         logger.error(f"Erro ao parar keep-alive service: {str(e)}")
+    
+    await websub_hub.stop()
+    await event_service.stop()
 
 
 @app.exception_handler(Exception)